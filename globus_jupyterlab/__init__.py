@@ -3,6 +3,7 @@ import logging
 from pathlib import Path
 
 from .handlers import setup_handlers
+from .handlers.base import BaseAPIHandler, globus_config
 from ._version import __version__
 
 log = logging.getLogger()
@@ -32,7 +33,10 @@ def _load_jupyter_server_extension(server_app):
         JupyterLab application instance
     """
     url_path = "globus-jupyterlab"
+    # Resolve all settings once at load, and report misconfiguration at startup
+    globus_config.get_snapshot()
     setup_handlers(server_app.web_app, url_path)
+    BaseAPIHandler.token_refresher.start()
     server_app.log.info(
         f"Registered globus-jupyterlab extension at URL path /{url_path}"
     )
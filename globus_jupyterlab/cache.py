@@ -0,0 +1,99 @@
+import asyncio
+import collections
+import functools
+import threading
+import time
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class TTLCache:
+    """
+    A thread-safe LRU cache where entries expire after a fixed time to live.
+    Once `maxsize` entries are stored, the least recently used entry is dropped
+    to make room for new ones. A ttl of 0 disables caching.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, timer: Callable = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.maxsize > 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if self.timer() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (self.timer() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            return entry[1] if entry is not None else default
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop all entries with keys matching the predicate. Returns the number
+        of entries dropped."""
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SingleFlight:
+    """
+    Share one call between concurrent callers asking for the same key. The first
+    caller starts the call, and later callers await the same result until it
+    finishes. Cancelling one caller does not cancel the shared call.
+    """
+
+    def __init__(self):
+        self._calls = dict()
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(func())
+            self._calls[key] = call
+            call.add_done_callback(functools.partial(self._call_done, key))
+        return await asyncio.shield(call)
+
+    def _call_done(self, key: Hashable, call: asyncio.Future):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Mark errors retrieved, in case every caller was cancelled
+        if not call.cancelled():
+            call.exception()
@@ -0,0 +1,164 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+from globus_jupyterlab.token_storage import write_json_atomically
+
+log = logging.getLogger(__name__)
+
+DATA_ACCESS_SCOPE_PATTERN = re.compile(
+    r"https://auth\.globus\.org/scopes/([0-9a-fA-F-]+)/data_access"
+)
+
+
+class EndpointMetadata(NamedTuple):
+    endpoint_id: str
+    entity_type: Optional[str] = None
+    gcs_version: Optional[str] = None
+    high_assurance: bool = False
+    # GCS v5.4 mapped collections require a data_access scope. Consent isn't visible
+    # in tokens, so it is None until a login, or a call to the collection, shows it.
+    requires_data_access: bool = False
+    data_access_consented: Optional[bool] = None
+    # Learned from errors when the user has no identity in these domains
+    required_domains: Tuple[str, ...] = ()
+    updated_at: float = 0
+
+
+class EndpointMetadataCache:
+    """
+    A persistent cache of what is known about the Globus endpoints and collections
+    the user has browsed. Metadata is filled from ``get_endpoint`` responses, logins,
+    and successful or failed calls to collections. It is used to return login URLs
+    without first calling a collection which is expected to require login. Metadata is saved
+    as JSON at ``path``, and entries older than ``ttl`` seconds are ignored. A ttl of
+    0 disables the cache.
+    """
+
+    file_version = 1
+
+    def __init__(self, path: str, ttl: int):
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+        self._endpoints = None
+        self._lock = threading.RLock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def _load(self) -> dict:
+        if self._endpoints is None:
+            self._endpoints = dict()
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == self.file_version:
+                    self._endpoints = {
+                        endpoint_id: self.deserialize(metadata)
+                        for endpoint_id, metadata in data["endpoints"].items()
+                    }
+            except FileNotFoundError:
+                pass
+            except (ValueError, TypeError, KeyError, AttributeError):
+                log.warning(f"Ignoring invalid endpoint metadata in {self.path}")
+        return self._endpoints
+
+    @staticmethod
+    def deserialize(metadata: dict) -> EndpointMetadata:
+        metadata = dict(metadata)
+        metadata["required_domains"] = tuple(metadata.get("required_domains", ()))
+        return EndpointMetadata(**metadata)
+
+    def _save(self):
+        data = {
+            "version": self.file_version,
+            "endpoints": {
+                endpoint_id: metadata._asdict()
+                for endpoint_id, metadata in self._endpoints.items()
+            },
+        }
+        try:
+            write_json_atomically(self.path, data, prefix=".globus-endpoints-")
+        except OSError:
+            log.warning(f"Unable to save endpoint metadata to {self.path}")
+
+    def get(self, endpoint_id: str) -> Optional[EndpointMetadata]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            metadata = self._load().get(endpoint_id)
+            if metadata is not None and time.time() - metadata.updated_at < self.ttl:
+                return metadata
+
+    def update(self, endpoint_id: str, **fields) -> Optional[EndpointMetadata]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            endpoints = self._load()
+            current = endpoints.get(endpoint_id) or EndpointMetadata(endpoint_id)
+            metadata = current._replace(**fields)
+            # Unchanged metadata is only saved again when it is close to expiring
+            if metadata != current or time.time() - current.updated_at > self.ttl / 2:
+                metadata = metadata._replace(updated_at=time.time())
+                endpoints[endpoint_id] = metadata
+                self._save()
+            return metadata
+
+    def update_from_endpoint_document(
+        self, document: dict
+    ) -> Optional[EndpointMetadata]:
+        if not document.get("id"):
+            return None
+        return self.update(
+            document["id"],
+            entity_type=document.get("entity_type"),
+            gcs_version=document.get("gcs_version"),
+            high_assurance=bool(document.get("high_assurance")),
+            requires_data_access=self.is_data_access_required(document),
+        )
+
+    @staticmethod
+    def is_data_access_required(document: dict) -> bool:
+        """GCS v5.4 and later mapped collections require a data_access scope"""
+        if document.get("entity_type") != "GCSv5_mapped_collection":
+            return False
+        try:
+            version = tuple(int(v) for v in document["gcs_version"].split(".")[:2])
+        except (KeyError, AttributeError, ValueError):
+            # Assume a recent version if it isn't reported
+            return True
+        return version >= (5, 4)
+
+    def is_data_access_consent_needed(self, endpoint_id: str) -> bool:
+        """Whether consent to a collection's data_access scope should be recorded
+        after a successful call. Collections known not to need a data_access scope,
+        or known to have consent, are skipped, so nothing is saved."""
+        if not self.enabled:
+            return False
+        metadata = self.get(endpoint_id)
+        return metadata is None or (
+            metadata.requires_data_access and metadata.data_access_consented is not True
+        )
+
+    def set_data_access_consented(self, endpoint_ids: Iterable[str]):
+        for endpoint_id in endpoint_ids:
+            self.update(endpoint_id, data_access_consented=True)
+
+    def set_consents_from_scopes(self, scopes: str):
+        """Record consent to any data_access scopes requested in a login"""
+        self.set_data_access_consented(DATA_ACCESS_SCOPE_PATTERN.findall(scopes))
+
+    def clear_consents(self):
+        """Forget what is known about the user's consents, such as on logout"""
+        if not self.enabled:
+            return
+        with self._lock:
+            endpoints = self._load()
+            for endpoint_id, metadata in endpoints.items():
+                endpoints[endpoint_id] = metadata._replace(data_access_consented=None)
+            self._save()
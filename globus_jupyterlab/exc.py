@@ -30,3 +30,9 @@ class TokenStorageError(GlobusJupyterlabException):
     """A problem loading user Globus tokens"""
 
     pass
+
+
+class InvalidTransferDocument(InvalidAPIInput):
+    """A transfer document submitted by the user was invalid"""
+
+    pass
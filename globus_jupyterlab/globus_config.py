@@ -2,14 +2,61 @@ import os
 import logging
 import pickle
 import base64
-from typing import List
+import platform
+import threading
+import time
+from typing import List, NamedTuple, Optional, Tuple
 
 import globus_sdk
 from globus_sdk.scopes import TransferScopes, AuthScopes
 
+from globus_jupyterlab import metrics
+
 log = logging.getLogger(__name__)
 
 
+class GlobusConfigSnapshot(NamedTuple):
+    """
+    An immutable copy of the settings resolved by GlobusConfig. Each field holds the
+    value returned by the GlobusConfig getter of the same name. Settings which are
+    only read when the extension is loaded, such as pool and cache sizes, are not
+    included, since rebuilding the snapshot would not change them.
+    """
+
+    refresh_tokens: bool
+    token_refresh_margin: int
+    token_refresh_jitter: int
+    token_revocation_timeout: int
+    named_grant: str
+    scopes: Tuple[str, ...]
+    transfer_scopes: Tuple[str, ...]
+    collection_id: Optional[str]
+    collection_path: str
+    host_posix_basepath: str
+    host_collection_basepath: str
+    check_local_paths: bool
+    transfer_submission_url: Optional[str]
+    transfer_submission_scope: Optional[str]
+    transfer_submission_is_hub_service: bool
+    transfer_submission_chunk_size: int
+    transfer_submission_connect_timeout: int
+    transfer_submission_read_timeout: int
+    transfer_submission_retries: int
+    sdk_max_workers: int
+    local_scan_max_workers: int
+    operation_ls_batch_concurrency: int
+    endpoint_search_debounce: int
+    task_poll_min_interval: int
+    task_poll_max_interval: int
+    tracing: bool
+    trace_path: str
+    hub_token: str
+    redirect_uri: Optional[str]
+    is_hub: bool
+    is_gcp: bool
+    collection_id_owner: Optional[str]
+
+
 class GlobusConfig:
     """
     Track all Globus Related information related to the Globus JupyterLab
@@ -27,6 +74,82 @@ class GlobusConfig:
     transfer_scope = TransferScopes.all
     globus_auth_code_redirect_url = "https://auth.globus.org/v2/web/auth-code"
 
+    def __init__(self):
+        self._snapshot = None
+        self._gcp_config_signature = None
+        self._snapshot_lock = threading.Lock()
+
+    def get_snapshot(self) -> GlobusConfigSnapshot:
+        """
+        Fetch all settings, resolved once and cached. Environment variables are only
+        read when the snapshot is first built or after calling ``reload()``. The
+        snapshot is automatically rebuilt if the Globus Connect Personal config files
+        change, such as when GCP is installed or set up while JupyterLab is running.
+        """
+        start = time.perf_counter()
+        result = "cached"
+        with self._snapshot_lock:
+            gcp_config_signature = self.get_gcp_config_signature()
+            if (
+                self._snapshot is None
+                or gcp_config_signature != self._gcp_config_signature
+            ):
+                self._snapshot = self.build_snapshot()
+                self._gcp_config_signature = gcp_config_signature
+                result = "resolved"
+            snapshot = self._snapshot
+        metrics.CONFIG_RESOLUTION_DURATION.labels(result).observe(
+            time.perf_counter() - start
+        )
+        return snapshot
+
+    def reload(self) -> GlobusConfigSnapshot:
+        """Resolve settings again, and replace the current snapshot. If a setting is
+        invalid, ValueError is raised and the current snapshot is kept."""
+        with self._snapshot_lock:
+            gcp_config_signature = self.get_gcp_config_signature()
+            snapshot = self.build_snapshot()
+            self._snapshot = snapshot
+            self._gcp_config_signature = gcp_config_signature
+        return snapshot
+
+    def build_snapshot(self) -> GlobusConfigSnapshot:
+        log.debug("Resolving Globus JupyterLab config")
+        return GlobusConfigSnapshot(
+            refresh_tokens=self.get_refresh_tokens(),
+            token_refresh_margin=self.get_token_refresh_margin(),
+            token_refresh_jitter=self.get_token_refresh_jitter(),
+            token_revocation_timeout=self.get_token_revocation_timeout(),
+            named_grant=self.get_named_grant(),
+            scopes=tuple(self.get_scopes()),
+            transfer_scopes=tuple(self.get_transfer_scopes()),
+            collection_id=self.get_collection_id(),
+            collection_path=self.get_collection_path(),
+            host_posix_basepath=self.get_host_posix_basepath(),
+            host_collection_basepath=self.get_host_collection_basepath(),
+            check_local_paths=self.get_check_local_paths(),
+            transfer_submission_url=self.get_transfer_submission_url(),
+            transfer_submission_scope=self.get_transfer_submission_scope(),
+            transfer_submission_is_hub_service=self.get_transfer_submission_is_hub_service(),
+            transfer_submission_chunk_size=self.get_transfer_submission_chunk_size(),
+            transfer_submission_connect_timeout=self.get_transfer_submission_connect_timeout(),
+            transfer_submission_read_timeout=self.get_transfer_submission_read_timeout(),
+            transfer_submission_retries=self.get_transfer_submission_retries(),
+            sdk_max_workers=self.get_sdk_max_workers(),
+            local_scan_max_workers=self.get_local_scan_max_workers(),
+            operation_ls_batch_concurrency=self.get_operation_ls_batch_concurrency(),
+            endpoint_search_debounce=self.get_endpoint_search_debounce(),
+            task_poll_min_interval=self.get_task_poll_min_interval(),
+            task_poll_max_interval=self.get_task_poll_max_interval(),
+            tracing=self.get_tracing(),
+            trace_path=self.get_trace_path(),
+            hub_token=self.get_hub_token(),
+            redirect_uri=self.get_redirect_uri(),
+            is_hub=self.is_hub(),
+            is_gcp=self.is_gcp(),
+            collection_id_owner=self.get_collection_id_owner(),
+        )
+
     @property
     def last_login(self) -> str:
         """Fetch the last time the user logged in. Only returns last login during the time JupyterLab has been running.
@@ -49,6 +172,15 @@ class GlobusConfig:
         else:
             return default
 
+    def check_env_int(self, env_value: str, default: int) -> int:
+        value = os.getenv(env_value)
+        if value is None or value == "":
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            raise ValueError(f"{env_value}: Must be set to an integer") from None
+
     def get_refresh_tokens(self) -> bool:
         """
         Should JupyterLab use Refresh tokens? Default is False. When True,
@@ -65,6 +197,49 @@ class GlobusConfig:
         """
         return self.check_env_boolean("GLOBUS_REFRESH_TOKENS", default=False)
 
+    def get_token_refresh_margin(self) -> int:
+        """
+        When using refresh tokens, how many seconds before expiry access tokens are
+        refreshed. Tokens are refreshed in the background, so requests made by the
+        user never wait on Globus Auth to refresh them.
+
+        Configurable via environment variable: GLOBUS_TOKEN_REFRESH_MARGIN
+        Default: 300
+        """
+        margin = self.check_env_int("GLOBUS_TOKEN_REFRESH_MARGIN", 300)
+        if margin < 0:
+            raise ValueError("GLOBUS_TOKEN_REFRESH_MARGIN: Must not be negative")
+        return margin
+
+    def get_token_refresh_jitter(self) -> int:
+        """
+        Up to this many seconds are randomly added to GLOBUS_TOKEN_REFRESH_MARGIN for
+        each refresh, so that many JupyterLab servers started at the same time do
+        not all refresh tokens with Globus Auth at once.
+
+        Configurable via environment variable: GLOBUS_TOKEN_REFRESH_JITTER
+        Default: 60
+        """
+        jitter = self.check_env_int("GLOBUS_TOKEN_REFRESH_JITTER", 60)
+        if jitter < 0:
+            raise ValueError("GLOBUS_TOKEN_REFRESH_JITTER: Must not be negative")
+        return jitter
+
+    def get_token_revocation_timeout(self) -> int:
+        """
+        How many seconds logout waits for Globus Auth to revoke the user's tokens.
+        Tokens are removed from token storage before they are revoked, and are all
+        revoked at the same time. Revocations still running after this timeout are
+        left to finish in the background.
+
+        Configurable via environment variable: GLOBUS_TOKEN_REVOCATION_TIMEOUT
+        Default: 5
+        """
+        timeout = self.check_env_int("GLOBUS_TOKEN_REVOCATION_TIMEOUT", 5)
+        if timeout < 0:
+            raise ValueError("GLOBUS_TOKEN_REVOCATION_TIMEOUT: Must not be negative")
+        return timeout
+
     def get_token_storage_path(self) -> str:
         """
         Modify the default path of token storage for Globus JupyterLab. This location MUST
@@ -191,6 +366,23 @@ class GlobusConfig:
         """
         return os.getenv("GLOBUS_HOST_COLLECTION_BASEPATH", "")
 
+    def get_check_local_paths(self) -> bool:
+        """
+        Check that local files selected for transfer exist, and log a warning for any
+        that do not. Checks are done in the background after a transfer is submitted
+        and never stop a transfer. Checking requires a filesystem lookup per file,
+        which may be slow for very large transfers on network filesystems.
+
+        Configurable via environment variable: GLOBUS_CHECK_LOCAL_PATHS
+        Default: true
+
+        Acceptable env values:
+
+        * 'true' -- check local paths
+        * 'false' -- do not check local paths
+        """
+        return self.check_env_boolean("GLOBUS_CHECK_LOCAL_PATHS", default=True)
+
     def get_transfer_submission_url(self) -> str:
         """
         By default, JupyterLab will start transfers on the user's
@@ -245,6 +437,257 @@ class GlobusConfig:
             "GLOBUS_TRANSFER_SUBMISSION_IS_HUB_SERVICE", False
         )
 
+    def get_transfer_submission_chunk_size(self) -> int:
+        """
+        Split very large transfers into several Globus Transfer tasks of at most this
+        many items each. Tasks are submitted concurrently and share the same label,
+        suffixed with the part number. Set to 0 to always submit a single task.
+
+        Only applies to transfers submitted directly to Globus Transfer, not to
+        transfers submitted with GLOBUS_TRANSFER_SUBMISSION_URL.
+
+        Configurable via environment variable: GLOBUS_TRANSFER_SUBMISSION_CHUNK_SIZE
+        Default: 0
+        """
+        chunk_size = self.check_env_int("GLOBUS_TRANSFER_SUBMISSION_CHUNK_SIZE", 0)
+        if chunk_size < 0:
+            raise ValueError(
+                "GLOBUS_TRANSFER_SUBMISSION_CHUNK_SIZE: Must not be negative"
+            )
+        return chunk_size
+
+    def get_transfer_submission_connect_timeout(self) -> int:
+        """
+        How many seconds to wait when connecting to GLOBUS_TRANSFER_SUBMISSION_URL.
+
+        Configurable via environment variable: GLOBUS_TRANSFER_SUBMISSION_CONNECT_TIMEOUT
+        Default: 5
+        """
+        timeout = self.check_env_int("GLOBUS_TRANSFER_SUBMISSION_CONNECT_TIMEOUT", 5)
+        if timeout < 1:
+            raise ValueError(
+                "GLOBUS_TRANSFER_SUBMISSION_CONNECT_TIMEOUT: Must be at least 1"
+            )
+        return timeout
+
+    def get_transfer_submission_read_timeout(self) -> int:
+        """
+        How many seconds to wait for GLOBUS_TRANSFER_SUBMISSION_URL to respond to a
+        transfer submission.
+
+        Configurable via environment variable: GLOBUS_TRANSFER_SUBMISSION_READ_TIMEOUT
+        Default: 60
+        """
+        timeout = self.check_env_int("GLOBUS_TRANSFER_SUBMISSION_READ_TIMEOUT", 60)
+        if timeout < 1:
+            raise ValueError(
+                "GLOBUS_TRANSFER_SUBMISSION_READ_TIMEOUT: Must be at least 1"
+            )
+        return timeout
+
+    def get_transfer_submission_retries(self) -> int:
+        """
+        How many times a submission to GLOBUS_TRANSFER_SUBMISSION_URL is retried after
+        a connection error, timeout or 5xx response, with an exponential backoff.
+        Each submission sends an Idempotency-Key header which stays the same across
+        retries, so the service can tell a retry from a new submission. Set to 0 to
+        never retry.
+
+        Configurable via environment variable: GLOBUS_TRANSFER_SUBMISSION_RETRIES
+        Default: 3
+        """
+        retries = self.check_env_int("GLOBUS_TRANSFER_SUBMISSION_RETRIES", 3)
+        if retries < 0:
+            raise ValueError("GLOBUS_TRANSFER_SUBMISSION_RETRIES: Must not be negative")
+        return retries
+
+    def get_sdk_max_workers(self) -> int:
+        """
+        The maximum number of calls JupyterLab will make to Globus services at the
+        same time on behalf of the user. Globus calls are run in a background pool of
+        this size, so a slow collection will not stall other requests to the Jupyter
+        Server. Additional calls wait for a free slot in the pool.
+
+        Configurable via environment variable: GLOBUS_SDK_MAX_WORKERS
+        Default: 4
+        """
+        max_workers = self.check_env_int("GLOBUS_SDK_MAX_WORKERS", 4)
+        if max_workers < 1:
+            raise ValueError("GLOBUS_SDK_MAX_WORKERS: Must be at least 1")
+        return max_workers
+
+    def get_local_scan_max_workers(self) -> int:
+        """
+        The maximum number of local directories read at the same time when counting
+        the files and bytes in paths selected for transfer. Directories are read in
+        a background pool of this size, separate from the pool used for Globus
+        calls, so scanning a large tree does not hold up other requests. Checks for
+        missing local paths after a transfer is submitted also use this pool.
+
+        Configurable via environment variable: GLOBUS_LOCAL_SCAN_MAX_WORKERS
+        Default: 4
+        """
+        max_workers = self.check_env_int("GLOBUS_LOCAL_SCAN_MAX_WORKERS", 4)
+        if max_workers < 1:
+            raise ValueError("GLOBUS_LOCAL_SCAN_MAX_WORKERS: Must be at least 1")
+        return max_workers
+
+    def get_operation_ls_cache_ttl(self) -> int:
+        """
+        How long, in seconds, directory listings on Globus Collections are cached.
+        Browsing back to a recently listed directory is then served without waiting
+        on the collection. Listings can always be refreshed by the user, and listings
+        for a transfer destination are refreshed after a transfer is submitted.
+        Set to 0 to disable caching.
+
+        Configurable via environment variable: GLOBUS_OPERATION_LS_CACHE_TTL
+        Default: 30
+        """
+        return self.check_env_int("GLOBUS_OPERATION_LS_CACHE_TTL", 30)
+
+    def get_operation_ls_cache_size(self) -> int:
+        """
+        The maximum number of directory listings kept in the listing cache. When full,
+        the least recently viewed listing is discarded.
+
+        Configurable via environment variable: GLOBUS_OPERATION_LS_CACHE_SIZE
+        Default: 128
+        """
+        return self.check_env_int("GLOBUS_OPERATION_LS_CACHE_SIZE", 128)
+
+    def get_operation_ls_batch_concurrency(self) -> int:
+        """
+        The maximum number of directories listed at the same time for a single
+        batched listing request. Listings are still subject to GLOBUS_SDK_MAX_WORKERS.
+
+        Configurable via environment variable: GLOBUS_OPERATION_LS_BATCH_CONCURRENCY
+        Default: 4
+        """
+        concurrency = self.check_env_int("GLOBUS_OPERATION_LS_BATCH_CONCURRENCY", 4)
+        if concurrency < 1:
+            raise ValueError(
+                "GLOBUS_OPERATION_LS_BATCH_CONCURRENCY: Must be at least 1"
+            )
+        return concurrency
+
+    def get_endpoint_search_cache_ttl(self) -> int:
+        """
+        How long, in seconds, collection search results are cached. Repeating a
+        recent search is then served without waiting on Globus Transfer.
+        Set to 0 to disable caching.
+
+        Configurable via environment variable: GLOBUS_ENDPOINT_SEARCH_CACHE_TTL
+        Default: 60
+        """
+        return self.check_env_int("GLOBUS_ENDPOINT_SEARCH_CACHE_TTL", 60)
+
+    def get_endpoint_search_cache_size(self) -> int:
+        """
+        The maximum number of collection searches kept in the search cache. When
+        full, the least recently used search is discarded.
+
+        Configurable via environment variable: GLOBUS_ENDPOINT_SEARCH_CACHE_SIZE
+        Default: 128
+        """
+        return self.check_env_int("GLOBUS_ENDPOINT_SEARCH_CACHE_SIZE", 128)
+
+    def get_endpoint_search_debounce(self) -> int:
+        """
+        How long, in milliseconds, a collection search made with a ``search_id``
+        waits before searching. If a newer search is made with the same
+        ``search_id`` in the meantime, the older search is dropped. This avoids
+        searching Globus Transfer for every keystroke in a type-ahead search box.
+
+        Configurable via environment variable: GLOBUS_ENDPOINT_SEARCH_DEBOUNCE
+        Default: 250
+        """
+        debounce = self.check_env_int("GLOBUS_ENDPOINT_SEARCH_DEBOUNCE", 250)
+        if debounce < 0:
+            raise ValueError("GLOBUS_ENDPOINT_SEARCH_DEBOUNCE: Must not be negative")
+        return debounce
+
+    def get_endpoint_metadata_path(self) -> str:
+        """
+        Where to save what is known about Globus collections the user has browsed,
+        such as whether they require a data_access scope. This lets JupyterLab
+        prompt the user to login before a call to the collection fails.
+
+        Configurable via environment variable: GLOBUS_ENDPOINT_METADATA_PATH
+        Default: ~/.globus_jupyterlab_endpoints.json
+        """
+        return os.getenv(
+            "GLOBUS_ENDPOINT_METADATA_PATH", "~/.globus_jupyterlab_endpoints.json"
+        )
+
+    def get_endpoint_metadata_ttl(self) -> int:
+        """
+        How long, in seconds, saved collection metadata is trusted. Set to 0 to
+        disable saving collection metadata, in which case JupyterLab only learns
+        a collection requires login after a call to it fails.
+
+        Configurable via environment variable: GLOBUS_ENDPOINT_METADATA_TTL
+        Default: 86400
+        """
+        return self.check_env_int("GLOBUS_ENDPOINT_METADATA_TTL", 86400)
+
+    def get_task_poll_min_interval(self) -> int:
+        """
+        How often, in seconds, the status of newly submitted Transfer tasks is
+        checked. Tasks are checked less often as they age, up to
+        GLOBUS_TASK_POLL_MAX_INTERVAL.
+
+        Configurable via environment variable: GLOBUS_TASK_POLL_MIN_INTERVAL
+        Default: 2
+        """
+        interval = self.check_env_int("GLOBUS_TASK_POLL_MIN_INTERVAL", 2)
+        if interval < 1:
+            raise ValueError("GLOBUS_TASK_POLL_MIN_INTERVAL: Must be at least 1")
+        return interval
+
+    def get_task_poll_max_interval(self) -> int:
+        """
+        The longest time, in seconds, between checks on the status of a running
+        Transfer task.
+
+        Configurable via environment variable: GLOBUS_TASK_POLL_MAX_INTERVAL
+        Default: 60
+        """
+        interval = self.check_env_int("GLOBUS_TASK_POLL_MAX_INTERVAL", 60)
+        if interval < self.get_task_poll_min_interval():
+            raise ValueError(
+                "GLOBUS_TASK_POLL_MAX_INTERVAL: Must be at least "
+                "GLOBUS_TASK_POLL_MIN_INTERVAL"
+            )
+        return interval
+
+    def get_tracing(self) -> bool:
+        """
+        Trace the phases of requests to list, search and transfer, such as checking
+        tokens, calling Globus, and building login URLs. Traces are only written to
+        the local file set by GLOBUS_TRACE_PATH, and are useful for finding where a
+        slow request spent its time. Trace IDs are sent to custom transfer submission
+        services with a W3C ``traceparent`` header.
+
+        Configurable via environment variable: GLOBUS_TRACING
+        Default: false
+
+        Acceptable env values:
+
+        * 'true' -- trace requests
+        * 'false' -- do not trace requests
+        """
+        return self.check_env_boolean("GLOBUS_TRACING", default=False)
+
+    def get_trace_path(self) -> str:
+        """
+        Where traces are written when GLOBUS_TRACING is enabled. Each span is
+        appended to the file as a line of JSON.
+
+        Configurable via environment variable: GLOBUS_TRACE_PATH
+        Default: ~/.globus_jupyterlab_traces.jsonl
+        """
+        return os.getenv("GLOBUS_TRACE_PATH", "~/.globus_jupyterlab_traces.jsonl")
+
     def get_hub_token(self) -> str:
         """
         Fetch the Jupyter API 'hub' token when JuptyerHub starts a single-user-server.
@@ -303,6 +746,28 @@ class GlobusConfig:
         # if the user manually configured one on the local system
         return bool(gcp and gcp == self.get_collection_id())
 
+    def get_gcp_config_files(self) -> List[str]:
+        """Files Globus Connect Personal uses to store its collection id and owner"""
+        if platform.system() == "Windows":
+            data_dir = os.path.join(os.getenv("LOCALAPPDATA", ""), "Globus Connect")
+        else:
+            data_dir = os.path.expanduser("~/.globusonline/lta")
+        return [
+            os.path.join(data_dir, "client-id.txt"),
+            os.path.join(data_dir, "gridmap"),
+        ]
+
+    def get_gcp_config_signature(self) -> tuple:
+        """Cheaply detect changes to the GCP config files, without reading them"""
+        signature = []
+        for filename in self.get_gcp_config_files():
+            try:
+                stat = os.stat(filename)
+                signature.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
     def get_gcp_collection(self) -> str:
         return globus_sdk.LocalGlobusConnectPersonal().endpoint_id
 
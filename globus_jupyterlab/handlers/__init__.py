@@ -6,13 +6,15 @@ from typing import List, Tuple
 from jupyter_server.base.handlers import APIHandler
 from jupyter_server.utils import url_path_join
 from jupyter_server.serverapp import ServerWebApplication
+import tornado.web
 from tornado.web import StaticFileHandler, url
-from globus_jupyterlab.handlers import login, config, api
+from globus_jupyterlab.handlers import login, config, api, metrics
+from globus_jupyterlab.handlers.compression import CompressedContentEncoding
 
 
 log = logging.getLogger(__name__)
 
-HANDLER_MODULES = (login, config, api)
+HANDLER_MODULES = (login, config, api, metrics)
 
 
 def get_handlers(
@@ -37,6 +39,16 @@ def get_handlers(
     return handlers
 
 
+def setup_compression(web_app: tornado.web.Application, base_url: str, url_path: str):
+    """
+    Compress responses from this extension with brotli or gzip. Transforms are set
+    for the whole application, so responses from other Jupyter Server handlers
+    are left alone.
+    """
+    path_prefix = url_path_join(base_url, url_path, "/")
+    web_app.add_transform(CompressedContentEncoding.for_path_prefix(path_prefix))
+
+
 def setup_handlers(web_app: ServerWebApplication, url_path: str):
     """
     Setup main webapp handlers. Automatically adds all handlers
@@ -47,6 +59,7 @@ def setup_handlers(web_app: ServerWebApplication, url_path: str):
 
     handlers = get_handlers(HANDLER_MODULES, base_url, url_path)
     web_app.add_handlers(host_pattern, handlers)
+    setup_compression(web_app, base_url, url_path)
 
     # Prepend the base_url so that it works in a JupyterHub setting
     doc_url = url_path_join(base_url, url_path, "public")
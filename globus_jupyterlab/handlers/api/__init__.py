@@ -1,5 +1,9 @@
 from .transfer import default_handlers as transfer_default_handlers
+from .tasks import default_handlers as tasks_default_handlers
+from .local_scan import default_handlers as local_scan_default_handlers
 
 # The keyword `default_handlers` is used for auto-loading all handlers required
 # by a module in base.py
-default_handlers = transfer_default_handlers
+default_handlers = (
+    transfer_default_handlers + tasks_default_handlers + local_scan_default_handlers
+)
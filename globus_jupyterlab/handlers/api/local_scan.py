@@ -0,0 +1,126 @@
+import json
+import posixpath
+from typing import Dict
+
+import pydantic
+import tornado.iostream
+import tornado.web
+from globus_jupyterlab.exc import TransferSubmission
+from globus_jupyterlab.handlers.base import BaseAPIHandler
+from globus_jupyterlab.local_scan import LocalPathScan
+from globus_jupyterlab.models import LocalScanModel
+from globus_jupyterlab.path_translation import PathTranslator
+
+
+class LocalScan(BaseAPIHandler):
+    """
+    Count the files, directories and bytes under local paths selected for transfer,
+    such as a directory the user right-clicked to transfer recursively. Paths are
+    resolved against GLOBUS_COLLECTION_PATH, and must be reachable through the local
+    collection according to GLOBUS_HOST_POSIX_BASEPATH.
+
+    The response is streamed as newline delimited JSON. The first line holds the
+    "scan_id" and each path translated for the local collection, followed by a
+    "progress" line with running totals every half second, and a final "complete"
+    or "cancelled" line with totals for each path. A scan is cancelled when the
+    client disconnects, or with DELETE /local_scan?scan_id=<scan_id>.
+    """
+
+    progress_interval = 0.5
+    # Running scans, by scan_id
+    scans: Dict[str, LocalPathScan] = {}
+
+    def initialize(self, *args, **kwargs):
+        super().initialize(*args, **kwargs)
+        self.scan = None
+
+    def on_connection_close(self):
+        if self.scan is not None:
+            self.scan.cancel()
+
+    async def write_line(self, data: dict):
+        self.write(self.dumps(data) + "\n")
+        await self.flush()
+
+    async def write_progress(self):
+        await self.write_line({"type": "progress", **self.scan.totals})
+
+    def get_local_paths(self, document: LocalScanModel) -> Dict[str, str]:
+        """Resolve each path JupyterLab sent, and translate it into a path on the
+        local collection. Raises TransferSubmission if a path can't be translated."""
+        config = self.gconfig.get_snapshot()
+        translator = PathTranslator(
+            config.host_posix_basepath, config.host_collection_basepath
+        )
+        paths = {}
+        for path in document.paths:
+            path = posixpath.normpath(posixpath.join(config.collection_path, path))
+            paths[path] = translator.translate(path)
+        return paths
+
+    @tornado.web.authenticated
+    async def post(self):
+        try:
+            document = LocalScanModel(**json.loads(self.request.body))
+            paths = self.get_local_paths(document)
+        except (pydantic.ValidationError, TypeError, ValueError) as e:
+            self.set_status(400)
+            message = f"Invalid local scan document: {e}"
+            return self.finish(self.dumps({"code": "InvalidInput", "message": message}))
+        except TransferSubmission as ts:
+            self.set_status(400)
+            return self.finish(self.dumps({"code": "InvalidInput", "message": str(ts)}))
+
+        config = self.gconfig.get_snapshot()
+        self.scan = LocalPathScan(
+            list(paths), self.local_scan_executor, config.local_scan_max_workers
+        )
+        self.scans[self.scan.scan_id] = self.scan
+        self.set_header("Content-Type", "application/x-ndjson")
+        self.set_header("Cache-Control", "no-cache")
+        try:
+            await self.write_line(
+                {
+                    "type": "start",
+                    "scan_id": self.scan.scan_id,
+                    "paths": [
+                        {"path": path, "collection_path": collection_path}
+                        for path, collection_path in paths.items()
+                    ],
+                }
+            )
+            await self.scan.run(self.write_progress, self.progress_interval)
+            results = []
+            for result in self.scan.results:
+                results.append(
+                    {**result.to_dict(), "collection_path": paths[result.path]}
+                )
+            await self.write_line(
+                {
+                    "type": "cancelled" if self.scan.cancelled.is_set() else "complete",
+                    **self.scan.totals,
+                    "paths": results,
+                }
+            )
+            self.finish()
+        except tornado.iostream.StreamClosedError:
+            self.log.debug(f"Client disconnected from local scan {self.scan.scan_id}")
+        finally:
+            del self.scans[self.scan.scan_id]
+
+    @tornado.web.authenticated
+    def delete(self):
+        scan_id = self.get_query_argument("scan_id")
+        scan = self.scans.get(scan_id)
+        if scan is None:
+            self.set_status(404)
+            message = f"No local scan is running with scan_id {scan_id}"
+            return self.finish(self.dumps({"code": "NotFound", "message": message}))
+        scan.cancel()
+        self.set_status(204)
+        self.finish()
+
+
+default_handlers = [
+    ("/local_scan", LocalScan, {}, "local_scan"),
+]
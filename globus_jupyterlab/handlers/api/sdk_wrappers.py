@@ -1,8 +1,12 @@
+import functools
 import json
+from typing import Awaitable, Callable
 import globus_sdk
 import tornado
+from globus_jupyterlab.cache import SingleFlight
 from globus_jupyterlab.exc import InvalidAPIInput, LoginException
 from globus_jupyterlab.handlers.auth import AutoAuthURLMixin
+from globus_jupyterlab.tracing import TRACEPARENT_HEADER
 
 
 class GlobusSDKWrapper(AutoAuthURLMixin):
@@ -16,27 +20,78 @@ class GlobusSDKWrapper(AutoAuthURLMixin):
     globus_sdk_method = None
     mandatory_args = []
     optional_args = {}
+    # Share one upstream call between identical concurrent requests. Only safe for
+    # calls which do not change anything.
+    coalesce_calls = False
+    sdk_calls = SingleFlight()
 
     def get_globus_sdk_args(self):
         return [], {}
 
-    def transfer_client_call(self):
-        authorizer = self.login_manager.get_authorizer("transfer.api.globus.org")
-        tc = globus_sdk.TransferClient(authorizer=authorizer)
+    def get_transfer_client(self) -> globus_sdk.TransferClient:
+        with self.tracer.span("get_client"):
+            return self.login_manager.get_client(
+                "transfer.api.globus.org", globus_sdk.TransferClient
+            )
+
+    def get_call_key(self, *args, **kwargs) -> tuple:
+        """Identify a call by the user, the SDK method, and its arguments"""
+        return (
+            self.globus_sdk_method,
+            self.login_manager.get_resource_server_fingerprint(
+                "transfer.api.globus.org"
+            ),
+            json.dumps([args, kwargs], sort_keys=True, default=str),
+        )
+
+    async def coalesced_call(self, key: tuple, func: Callable[[], Awaitable]):
+        """Await func, or the same call already made by an identical concurrent
+        request. Errors, including GlobusAPIErrors, are raised to every caller."""
+        return await self.sdk_calls.run(key, func)
+
+    async def call_transfer_client(self, args: list, kwargs: dict):
+        tc = self.get_transfer_client()
         method = getattr(tc, self.globus_sdk_method)
+        response = await self.run_globus_call(
+            "transfer", self.globus_sdk_method, method, *args, **kwargs
+        )
+        return response.data
+
+    async def transfer_client_call(self):
+        """Call the configured `globus_sdk_method` on a TransferClient. The SDK call
+        is blocking, so it is run in the SDK executor instead of on the IOLoop."""
         args, kwargs = self.get_globus_sdk_args()
-        return method(*args, **kwargs).data
+        if not self.coalesce_calls:
+            return await self.call_transfer_client(args, kwargs)
+        return await self.coalesced_call(
+            self.get_call_key(*args, **kwargs),
+            functools.partial(self.call_transfer_client, args, kwargs),
+        )
+
+    async def sdk_wrapper_call(self):
+        with self.tracer.trace(
+            f"{type(self).__name__}.sdk_wrapper_call",
+            traceparent=self.request.headers.get(TRACEPARENT_HEADER),
+            globus_sdk_method=self.globus_sdk_method,
+        ) as span:
+            await self.traced_sdk_wrapper_call()
+            if span is not None:
+                span.set_attribute("status_code", self.get_status())
 
-    def sdk_wrapper_call(self):
+    async def traced_sdk_wrapper_call(self):
         response = dict()
-        if self.login_manager.is_logged_in() is not True:
+        with self.tracer.span("is_logged_in"):
+            logged_in = self.login_manager.is_logged_in()
+        if logged_in is not True:
             self.set_status(401)
-            return self.finish(json.dumps({"error": "The user is not logged in"}))
+            return self.finish(self.dumps({"error": "The user is not logged in"}))
         try:
-            return self.finish(json.dumps(self.transfer_client_call()))
+            with self.tracer.span("transfer_client_call"):
+                result = await self.transfer_client_call()
+            return self.finish(self.dumps(result))
         except globus_sdk.GlobusAPIError as gapie:
             self.set_status(gapie.http_status)
-            response = self.get_exception_info(gapie)
+            response = await self.get_exception_info(gapie)
             self.log.debug(
                 f'Globus Auth Error, Login Required? {response["login_required"]} '
                 f'Requires User intervention? {response["requires_user_intervention"]}',
@@ -49,10 +104,10 @@ class GlobusSDKWrapper(AutoAuthURLMixin):
                     self.log.error("Failed to generate login URL", exc_info=True)
                     response["error"] = le.__class__.__name__
                     response["details"] = str(le)
-            return self.finish(json.dumps(response))
+            return self.finish(self.dumps(response))
         except (tornado.web.MissingArgumentError, InvalidAPIInput) as e:
             self.set_status(400)
-            self.finish(json.dumps({"code": "InvalidInput", "message": str(e)}))
+            self.finish(self.dumps({"code": "InvalidInput", "message": str(e)}))
         except Exception:
             self.set_status(500)
             self.log.error(
@@ -60,7 +115,7 @@ class GlobusSDKWrapper(AutoAuthURLMixin):
                 exc_info=True,
             )
             return self.finish(
-                json.dumps(
+                self.dumps(
                     {
                         "error": "An unexpected error occurred, have your admin check logs for more details."
                     }
@@ -69,6 +124,8 @@ class GlobusSDKWrapper(AutoAuthURLMixin):
 
 
 class GetMethodTransferAPIEndpoint(GlobusSDKWrapper):
+    coalesce_calls = True
+
     def get_globus_sdk_args(self):
         args = [self.get_query_argument(arg) for arg in self.mandatory_args]
         kwargs = {
@@ -77,8 +134,8 @@ class GetMethodTransferAPIEndpoint(GlobusSDKWrapper):
         }
         return args, kwargs
 
-    def get(self):
-        self.sdk_wrapper_call()
+    async def get(self):
+        await self.sdk_wrapper_call()
 
 
 class POSTMethodTransferAPIEndpoint(GlobusSDKWrapper):
@@ -91,5 +148,5 @@ class POSTMethodTransferAPIEndpoint(GlobusSDKWrapper):
             raise InvalidAPIInput(msg) from None
         return args, post_data
 
-    def post(self):
-        self.sdk_wrapper_call()
+    async def post(self):
+        await self.sdk_wrapper_call()
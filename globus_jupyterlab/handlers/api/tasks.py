@@ -0,0 +1,46 @@
+import tornado
+from globus_jupyterlab.handlers.base import BaseAPIHandler
+
+
+class Tasks(BaseAPIHandler):
+    """List Transfer tasks submitted through JupyterLab, newest first, with their
+    last known status. "version" can be passed to /tasks/updates to wait for changes."""
+
+    @tornado.web.authenticated
+    def get(self):
+        data = {
+            "version": self.task_tracker.version,
+            "DATA": self.task_tracker.get_tasks(),
+        }
+        self.finish(self.dumps(data))
+
+
+class TaskUpdates(BaseAPIHandler):
+    """
+    Long-poll for changes to tracked Transfer tasks. Responds as soon as any task
+    changes after the "since" version, with only the tasks which changed. Otherwise,
+    responds with no tasks after "timeout" seconds so the client can poll again.
+    """
+
+    default_timeout = 30
+    max_timeout = 120
+
+    @tornado.web.authenticated
+    async def get(self):
+        try:
+            since = int(self.get_query_argument("since", 0))
+        except ValueError:
+            raise tornado.web.HTTPError(400, "since must be an integer")
+        timeout = self.get_timeout_argument(self.default_timeout, self.max_timeout)
+        await self.task_tracker.wait_for_update(since, timeout)
+        data = {
+            "version": self.task_tracker.version,
+            "DATA": self.task_tracker.get_tasks(since),
+        }
+        self.finish(self.dumps(data))
+
+
+default_handlers = [
+    ("/tasks", Tasks, {}, "tasks"),
+    ("/tasks/updates", TaskUpdates, {}, "task_updates"),
+]
@@ -1,11 +1,33 @@
+import asyncio
+import datetime
+import functools
+import itertools
 import json
-import pathlib
+import math
+import posixpath
+from typing import Iterable, Iterator, List, Optional, Union
 import globus_sdk
 import pydantic
 import requests
-from globus_jupyterlab.exc import TransferSubmission
-from globus_jupyterlab.models import TransferModel
+import tornado.ioloop
+import tornado.locks
+import tornado.util
+from globus_jupyterlab.cache import TTLCache
+from globus_jupyterlab.exc import (
+    InvalidAPIInput,
+    InvalidTransferDocument,
+    TransferSubmission,
+)
+from globus_jupyterlab.models import (
+    ListingFormatEnum,
+    OperationLSBatchModel,
+    OperationLSItemModel,
+)
+from globus_jupyterlab.transfer_document import TransferDocument, TransferItem
 from globus_jupyterlab.handlers.auth import GCSAuthMixin
+from globus_jupyterlab.handlers.base import globus_config
+from globus_jupyterlab.path_translation import PathTranslator, find_missing_paths
+from globus_jupyterlab.submission_client import TransferSubmissionClient
 from globus_jupyterlab.handlers.api.sdk_wrappers import (
     GetMethodTransferAPIEndpoint,
     POSTMethodTransferAPIEndpoint,
@@ -27,116 +49,200 @@ class SubmitTransfer(GCSAuthMixin, POSTMethodTransferAPIEndpoint):
     globus_sdk_method = "submit_transfer"
     mandatory_args = []
     optional_args = {}
+    missing_paths_reported = 10
+    # Shared by all submissions to GLOBUS_TRANSFER_SUBMISSION_URL
+    submission_client = TransferSubmissionClient(globus_config)
+
+    def initialize(self, *args, **kwargs):
+        super().initialize(*args, **kwargs)
+        # Recorded as items are translated, and used after submission
+        self.local_source_paths = []
+        self.destination_dirs = set()
 
-    def translate_base_paths(self, path: str) -> TransferModel:
+    def get_path_translator(self) -> PathTranslator:
+        config = self.gconfig.get_snapshot()
+        return PathTranslator(
+            config.host_posix_basepath, config.host_collection_basepath
+        )
+
+    def translate_base_paths(self, path: str) -> str:
         """
         Take the path that JupyterLab generated and translate it into a "Globus" collection acessible
         path. This is typically needed if the mount path on the collection causes a 'mismatch' in paths
         between how JupyterLab sees files and the Collection sees files.
         """
-        user_transfer_path = pathlib.Path(path)
-        host_collection_basepath = pathlib.Path(
-            self.gconfig.get_host_collection_basepath()
-        )
-        host_posix_basepath = self.gconfig.get_host_posix_basepath()
+        return self.get_path_translator().translate(path)
 
-        if not user_transfer_path.exists():
-            self.log.warning(
-                f"User specified path {user_transfer_path} does not exist!"
-            )
+    def get_translated_path_attr(self, document: TransferDocument) -> Optional[str]:
+        """Fetch which path on each item is on the local collection, and needs
+        translating. Raises ValueError if the local collection isn't in the transfer."""
+        col_id = self.gconfig.get_snapshot().collection_id
+        if document.source_endpoint == col_id:
+            return "source_path"
+        elif document.destination_endpoint == col_id:
+            return "destination_path"
+        elif len(document) == 0:
+            return None
+        raise ValueError(
+            f"Non-local collection used in transfer, expected '{col_id}' in transfer. "
+            f"The transfer document is invalid, it has source_endpoint "
+            f"'{document.source_endpoint}' and destination_endpoint "
+            f"'{document.destination_endpoint}'"
+        )
 
-        if host_posix_basepath:
-            try:
-                user_transfer_path = user_transfer_path.relative_to(host_posix_basepath)
-            except ValueError:
-                raise TransferSubmission(
-                    f"Path {user_transfer_path} is not in the subpath of {host_posix_basepath}, and is inaccessible via the configured Globus Collection. Consider moving {user_transfer_path} into {host_posix_basepath} first."
-                ) from None
-
-        if host_collection_basepath:
-            user_transfer_path = host_collection_basepath / user_transfer_path
-
-        return str(user_transfer_path)
-
-    def translate_transfer_submission(
-        self, transfer_model: TransferModel
-    ) -> TransferModel:
-        col_id = self.gconfig.get_collection_id()
-        for transfer_items in transfer_model.DATA:
-            if transfer_model.source_endpoint == col_id:
-                new_path = self.translate_base_paths(transfer_items.source_path)
-                self.log.debug(
-                    f"Translating source path {transfer_items.source_path} --> {new_path}"
+    def iter_translated_items(
+        self, document: TransferDocument
+    ) -> Iterator[TransferItem]:
+        """
+        Validate and translate items one at a time, so they can be fed straight into
+        submission without building intermediate copies of the whole transfer. Local
+        paths to check and destination directories are recorded as items pass through.
+        """
+        path_attr = self.get_translated_path_attr(document)
+        check_local_paths = (
+            self.gconfig.get_snapshot().check_local_paths and path_attr == "source_path"
+        )
+        translator = self.get_path_translator()
+        for item in document.iter_items():
+            if check_local_paths:
+                self.local_source_paths.append(item.source_path)
+            if path_attr is not None:
+                item = item._replace(
+                    **{path_attr: translator.translate(getattr(item, path_attr))}
                 )
-                transfer_items.source_path = new_path
+            destination_path = self.normalize_listing_path(item.destination_path)
+            self.destination_dirs.add(destination_path)
+            self.destination_dirs.add(posixpath.dirname(destination_path))
+            yield item
 
-            elif transfer_model.destination_endpoint == col_id:
-                new_path = self.translate_base_paths(transfer_items.destination_path)
-                self.log.debug(
-                    f"Translating destination path {transfer_items.destination_path} --> {new_path}"
-                )
-                transfer_items.destination_path = new_path
-            else:
-                raise ValueError(
-                    f"Non-local collection used in transfer, expected '{col_id}' in transfer. The following transfer document is invalid: {transfer_model.json()}"
-                )
+    async def warn_missing_source_paths(self, paths: List[str]):
+        """Log a warning if local files selected for transfer do not exist. This is
+        only a courtesy for debugging, so it runs in the background after submission."""
+        missing = await self.run_local_fs_call(
+            find_missing_paths, paths, limit=self.missing_paths_reported
+        )
+        if missing:
+            self.log.warning(f"User specified paths do not exist: {', '.join(missing)}")
 
-    def transfer_client_call(self):
+    async def transfer_client_call(self):
         """Transfer submission is a bit more complex than the other wrapped calls. For one, it validates
-        a complex POST document through pydantic instead of taking simple args. Second, the call into the
+        a complex POST document instead of taking simple args. Second, the call into the
         Transfer Client requires a couple helper classes to complete, including both globus_sdk.TransferClient
-        and globus_sdk.TransferModel. Third, the globus_sdk may not be used in the case that a separate
+        and globus_sdk.TransferData. Third, the globus_sdk may not be used in the case that a separate
         service is handling the actual transfer, in which case the document needs to be forwarded instead.
 
+        Transfer documents can be very large. Items are validated and translated one at a
+        time, straight into the document which is submitted. Every item is validated before
+        anything is submitted.
+
         Auth errors are the only unchanged mechanism. If the remote endpoint isn't active or requires
         re-auth, the procedure is the same as other operation methods.
         """
         try:
-            post_data = json.loads(self.request.body)
             self.log.debug("Checking transfer document")
-            tm = TransferModel(**post_data)
-            self.translate_transfer_submission(tm)
-            if self.gconfig.get_transfer_submission_url():
-                response = self.submit_custom_transfer(tm)
+            with self.tracer.span("parse_transfer_document"):
+                document = TransferDocument.from_json(self.request.body)
+            if self.gconfig.get_snapshot().transfer_submission_url:
+                with self.tracer.span("submit_custom_transfer", items=len(document)):
+                    response = await self.submit_custom_transfer(document)
             else:
-                response = self.submit_normal_transfer(tm)
+                with self.tracer.span("submit_normal_transfer", items=len(document)):
+                    response = await self.submit_normal_transfer(document)
+            if "error" in response:
+                # The submission service could not be reached, or rejected the
+                # transfer. The error has already been logged.
+                return response
             self.log.info("User transfer submission succeeded.")
+            with self.tracer.span("invalidate_destination_listings"):
+                self.invalidate_destination_listings(document.destination_endpoint)
+            task_ids = [
+                task_id
+                for task_id in response.get("task_ids") or [response.get("task_id")]
+                if task_id is not None
+            ]
+            if task_ids:
+                self.task_tracker.track(task_ids, document.label)
+            if self.local_source_paths:
+                tornado.ioloop.IOLoop.current().add_callback(
+                    self.warn_missing_source_paths, self.local_source_paths
+                )
             return response
-        except pydantic.ValidationError as ve:
+        except InvalidTransferDocument as itd:
             self.set_status(400)
             self.log.debug("Transfer doc failed validation", exc_info=True)
-            return {"error": "Invalid Input", "details": ve.json()}
+            return {"error": "Invalid Input", "details": str(itd)}
         except TransferSubmission as ts:
             self.set_status(400)
             self.log.info("User error for attempted Globus Transfer", exc_info=True)
             return {"error": "Invalid Input", "details": str(ts)}
 
-    def submit_custom_transfer(self, transfer_data: TransferModel):
-        url = self.gconfig.get_transfer_submission_url()
-        scope = self.gconfig.get_transfer_submission_scope()
+    @staticmethod
+    def normalize_listing_path(path: str) -> str:
+        """Drop trailing slashes, so a listing path can be compared with the
+        destination directories. The root directory stays "/"."""
+        return path.rstrip("/") or "/"
+
+    def invalidate_destination_listings(self, destination_endpoint: str):
+        """Drop cached listings of directories the transfer will write into, so the
+        user sees the new files once the transfer completes."""
+
+        def is_destination_listing(key: tuple) -> bool:
+            _, endpoint, path, _ = key
+            if endpoint != destination_endpoint:
+                return False
+            # A listing without a path is the user's default directory, which may
+            # be any of the destination directories.
+            return (
+                path is None
+                or self.normalize_listing_path(path) in self.destination_dirs
+            )
+
+        dropped = OperationLS.listing_cache.invalidate(is_destination_listing)
+        self.log.debug(f"Invalidated {dropped} cached listings for the destination")
+
+    async def submit_custom_transfer(self, document: TransferDocument):
+        config = self.gconfig.get_snapshot()
+        url = config.transfer_submission_url
+        scope = config.transfer_submission_scope
+        with self.tracer.span("translate_items"):
+            transfer = {
+                "source_endpoint": document.source_endpoint,
+                "destination_endpoint": document.destination_endpoint,
+                "DATA": [
+                    item._asdict() for item in self.iter_translated_items(document)
+                ],
+                "label": document.label,
+            }
         try:
             globus_token = self.login_manager.get_token_by_scope(scope)
-            if self.gconfig.get_transfer_submission_is_hub_service() is True:
+            if config.transfer_submission_is_hub_service is True:
                 self.log.debug(
                     "Using hub token to authorize transfer submission request. This is "
                     "due to setting GLOBUS_TRANSFER_SUBMISSION_IS_HUB_SERVICE"
                 )
-                auth_token = self.gconfig.get_hub_token()
+                auth_token = config.hub_token
                 post_data_token = globus_token
             else:
                 auth_token = globus_token
                 post_data_token = None
 
-            headers = {"Authorization": f"Bearer {auth_token}"}
-            document = {
+            payload = {
                 "globus_token": post_data_token,
-                "transfer": transfer_data.dict(),
+                "transfer": transfer,
             }
             self.log.info(
                 f"Submitting transfer request to custom location {url} "
                 "Using Scope {scope}"
             )
-            result = requests.post(url, headers=headers, json=document)
+            result = await self.run_globus_call(
+                "transfer_submission_service",
+                "submit",
+                self.submission_client.submit,
+                url,
+                auth_token,
+                payload,
+                headers=self.tracer.get_trace_headers(),
+            )
             result.raise_for_status()
             self.set_status(result.status_code)
             data = result.json()
@@ -151,24 +257,122 @@ class SubmitTransfer(GCSAuthMixin, POSTMethodTransferAPIEndpoint):
                 exc_info=True,
             )
             return {"error": "Transfer Failed", "details": str(http_error)}
+        except requests.exceptions.RequestException as request_error:
+            self.set_status(503)
+            self.log.error(f"Unable to reach {url}", exc_info=True)
+            return {"error": "Transfer Failed", "details": str(request_error)}
 
-    def submit_normal_transfer(self, transfer_data: TransferModel):
-        authorizer = self.login_manager.get_authorizer("transfer.api.globus.org")
-        tc = globus_sdk.TransferClient(authorizer=authorizer)
+    async def submit_normal_transfer(self, document: TransferDocument):
+        chunk_size = self.gconfig.get_snapshot().transfer_submission_chunk_size
+        if chunk_size and len(document) > chunk_size:
+            return await self.submit_chunked_transfer(document, chunk_size)
+        tc = self.get_transfer_client()
+        with self.tracer.span("build_transfer_data"):
+            td = self.build_transfer_data(
+                tc, document, self.iter_translated_items(document), document.label
+            )
+        response = await self.run_globus_call(
+            "transfer", "submit_transfer", tc.submit_transfer, td
+        )
+        return response.data
 
+    def build_transfer_data(
+        self,
+        tc: globus_sdk.TransferClient,
+        document: TransferDocument,
+        items: Iterable[TransferItem],
+        label: str,
+    ) -> globus_sdk.TransferData:
         td = globus_sdk.TransferData(
             tc,
-            transfer_data.source_endpoint,
-            transfer_data.destination_endpoint,
-            label=transfer_data.label,
+            document.source_endpoint,
+            document.destination_endpoint,
+            label=label,
         )
-        for transfer_item in transfer_data.DATA:
+        for transfer_item in items:
             td.add_item(
                 transfer_item.source_path,
                 transfer_item.destination_path,
                 recursive=transfer_item.recursive,
             )
-        return tc.submit_transfer(td).data
+        return td
+
+    async def submit_chunked_transfer(
+        self, document: TransferDocument, chunk_size: int
+    ) -> dict:
+        """
+        Submit the transfer as several tasks of at most chunk_size items each. Returns
+        the ids of all submitted tasks. "task_id" is the first submitted task for
+        compatibility with single submissions. Chunks which failed for any reason are
+        listed under "failures". If every chunk fails, the first error is raised
+        instead.
+        """
+        tc = self.get_transfer_client()
+        num_chunks = math.ceil(len(document) / chunk_size)
+        label_prefix = document.label or "JupyterLab Transfer"
+        self.log.info(f"Submitting {len(document)} items as {num_chunks} tasks")
+        items = self.iter_translated_items(document)
+        chunks, chunk_sizes = [], []
+        with self.tracer.span("build_transfer_data", chunks=num_chunks):
+            for number in range(1, num_chunks + 1):
+                chunk_items = list(itertools.islice(items, chunk_size))
+                label = f"{label_prefix} part {number} of {num_chunks}"
+                chunks.append(
+                    self.build_transfer_data(tc, document, chunk_items, label)
+                )
+                chunk_sizes.append(len(chunk_items))
+        results = await asyncio.gather(
+            *[
+                self.run_globus_call(
+                    "transfer", "submit_transfer", tc.submit_transfer, td
+                )
+                for td in chunks
+            ],
+            return_exceptions=True,
+        )
+
+        task_ids, failures = [], []
+        for number, (size, result) in enumerate(zip(chunk_sizes, results), start=1):
+            if isinstance(result, globus_sdk.GlobusAPIError):
+                failures.append(
+                    {
+                        "part": number,
+                        "items": size,
+                        "error": result.code,
+                        "details": result.message,
+                    }
+                )
+            elif isinstance(result, Exception):
+                # Other chunks may already be submitted, so their task ids must
+                # still be returned, or a retry would submit them twice
+                self.log.warning(
+                    f"Transfer task part {number} of {num_chunks} failed to submit",
+                    exc_info=result,
+                )
+                failures.append(
+                    {
+                        "part": number,
+                        "items": size,
+                        "error": type(result).__name__,
+                        "details": str(result),
+                    }
+                )
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                task_ids.append(result.data["task_id"])
+
+        if not task_ids:
+            raise next(r for r in results if isinstance(r, BaseException))
+        if failures:
+            self.log.warning(
+                f"{len(failures)} of {num_chunks} transfer tasks failed to submit"
+            )
+        return {
+            "task_id": task_ids[0],
+            "task_ids": task_ids,
+            "failures": failures,
+        }
 
 
 class OperationLS(GCSAuthMixin, GetMethodTransferAPIEndpoint):
@@ -178,6 +382,200 @@ class OperationLS(GCSAuthMixin, GetMethodTransferAPIEndpoint):
     mandatory_args = ["endpoint"]
     optional_args = {"path": None, "show_hidden": 0}
     endpoint_or_collection_parameter = "endpoint"
+    # Successful listings are cached by (user token, endpoint, path, show_hidden).
+    # Pass ?refresh=true to skip the cache and fetch a fresh listing.
+    listing_cache = TTLCache(
+        maxsize=globus_config.get_operation_ls_cache_size(),
+        ttl=globus_config.get_operation_ls_cache_ttl(),
+    )
+    # Pass ?format=compact for listings with only these fields, as column arrays
+    compact_listing_fields = ("name", "type", "size", "last_modified")
+
+    @classmethod
+    def compact_listing(cls, listing: dict) -> dict:
+        """
+        Convert a listing to the compact format. DATA is replaced with a dict of
+        columns, one list per field in ``compact_listing_fields``, with entries in
+        the same order as DATA. Other top level fields are kept. Large listings are
+        much smaller without the field names repeated for every entry.
+        """
+        compact = {k: v for k, v in listing.items() if k != "DATA"}
+        entries = listing.get("DATA", [])
+        compact["DATA_TYPE"] = "file_list_compact"
+        compact["DATA"] = {
+            field: [entry.get(field) for entry in entries]
+            for field in cls.compact_listing_fields
+        }
+        return compact
+
+    def format_listing(self, listing: dict, listing_format: str) -> dict:
+        if listing_format == ListingFormatEnum.compact:
+            return self.compact_listing(listing)
+        return listing
+
+    def get_listing_format(self) -> str:
+        listing_format = self.get_query_argument("format", ListingFormatEnum.full)
+        try:
+            return ListingFormatEnum(listing_format)
+        except ValueError:
+            raise InvalidAPIInput(
+                f"format must be one of: {', '.join(f.value for f in ListingFormatEnum)}"
+            ) from None
+
+    def get_listing_cache_key(
+        self, endpoint: str, path: str, show_hidden: Union[bool, int, str]
+    ) -> tuple:
+        return (
+            self.login_manager.get_resource_server_fingerprint(
+                "transfer.api.globus.org"
+            ),
+            endpoint,
+            path,
+            str(show_hidden).lower() in ("1", "true"),
+        )
+
+    async def list_directory(
+        self,
+        endpoint: str,
+        path: str = None,
+        show_hidden: Union[bool, int, str] = 0,
+        refresh: bool = False,
+    ) -> dict:
+        key = self.get_listing_cache_key(endpoint, path, show_hidden)
+        if refresh is False:
+            listing = self.listing_cache.get(key)
+            if listing is not None:
+                self.log.debug(f"Using cached listing for {endpoint}:{path}")
+                return listing
+        return await self.coalesced_call(
+            (self.globus_sdk_method, *key),
+            functools.partial(self.fetch_listing, key, endpoint, path, show_hidden),
+        )
+
+    async def fetch_listing(
+        self, key: tuple, endpoint: str, path: str, show_hidden: Union[bool, int, str]
+    ) -> dict:
+        tc = self.get_transfer_client()
+        response = await self.run_globus_call(
+            "transfer",
+            "operation_ls",
+            tc.operation_ls,
+            endpoint,
+            path=path,
+            show_hidden=show_hidden,
+        )
+        self.listing_cache.set(key, response.data)
+        if self.endpoint_metadata.is_data_access_consent_needed(endpoint):
+            await self.run_local_fs_call(
+                self.endpoint_metadata.set_data_access_consented, [endpoint]
+            )
+        return response.data
+
+    async def recheck_data_access_consent(
+        self, endpoint: str, path: str = None, show_hidden: Union[bool, int, str] = 0
+    ):
+        """
+        List a collection after a predicted login was returned for it, so the
+        prediction is corrected if it was wrong. Success records consent, and
+        caches the listing for the next request. Errors are saved in the endpoint
+        metadata as usual.
+        """
+        try:
+            await self.list_directory(endpoint, path, show_hidden, refresh=True)
+        except globus_sdk.GlobusAPIError as gapie:
+            self.get_login_exception_handler(gapie, endpoint)
+        except Exception:
+            self.log.debug(f"Unable to recheck consent for {endpoint}", exc_info=True)
+
+    async def transfer_client_call(self):
+        args, kwargs = self.get_globus_sdk_args()
+        with self.tracer.span("get_proactive_login_info"):
+            login_info = await self.get_proactive_login_info(args[0])
+        if login_info is not None:
+            tornado.ioloop.IOLoop.current().add_callback(
+                self.recheck_data_access_consent, *args, **kwargs
+            )
+            self.set_status(401)
+            return login_info
+        listing_format = self.get_listing_format()
+        refresh = self.get_query_argument("refresh", "false").lower() == "true"
+        listing = await self.list_directory(*args, refresh=refresh, **kwargs)
+        return self.format_listing(listing, listing_format)
+
+
+class OperationLSBatch(OperationLS):
+    """
+    An API Endpoint for listing many directories in one request. Takes a POST document
+    of the form {"items": [{"endpoint": ..., "path": ..., "show_hidden": ...}]} and
+    lists each item concurrently. Listings use the compact format if the document
+    sets "format": "compact". Results are returned in the same order as the items,
+    each either with the listing under "result", or with the error info normally
+    returned by /operation_ls under "error".
+    """
+
+    SUPPORTED_METHODS = ("POST",)
+
+    async def list_batch_item(
+        self,
+        item: OperationLSItemModel,
+        batch: OperationLSBatchModel,
+        semaphore: asyncio.Semaphore,
+    ) -> dict:
+        """List one item of the batch. Errors only fail this item, so they are
+        returned in its response instead of raised. Items are listed concurrently,
+        so the item's endpoint is always passed explicitly when building error info."""
+        response = item.dict()
+        login_info = await self.get_proactive_login_info(item.endpoint)
+        if login_info is not None:
+            tornado.ioloop.IOLoop.current().add_callback(
+                self.recheck_data_access_consent,
+                item.endpoint,
+                item.path,
+                item.show_hidden,
+            )
+            response["status"] = 401
+            response["error"] = login_info
+            return response
+        async with semaphore:
+            try:
+                listing = await self.list_directory(
+                    item.endpoint, item.path, item.show_hidden, refresh=batch.refresh
+                )
+                response["result"] = self.format_listing(listing, batch.format)
+                response["status"] = 200
+            except globus_sdk.GlobusAPIError as gapie:
+                error = await self.get_exception_info(gapie, item.endpoint)
+                login = error["login_required"] or error["requires_user_intervention"]
+                response["status"] = 401 if login else gapie.http_status
+                response["error"] = error
+            except Exception as e:
+                self.log.warning(
+                    f"Unable to list {item.path} on {item.endpoint}", exc_info=True
+                )
+                network_error = isinstance(e, globus_sdk.NetworkError)
+                response["status"] = 503 if network_error else 500
+                response["error"] = {
+                    "error": type(e).__name__,
+                    "details": str(e),
+                    "login_required": False,
+                    "requires_user_intervention": False,
+                }
+        return response
+
+    async def transfer_client_call(self):
+        try:
+            batch = OperationLSBatchModel(**json.loads(self.request.body))
+        except (pydantic.ValidationError, TypeError, ValueError) as e:
+            raise InvalidAPIInput(f"Invalid batch listing document: {e}") from None
+        concurrency = self.gconfig.get_snapshot().operation_ls_batch_concurrency
+        semaphore = asyncio.Semaphore(concurrency)
+        results = await asyncio.gather(
+            *[self.list_batch_item(item, batch, semaphore) for item in batch.items]
+        )
+        return {"DATA": results}
+
+    async def post(self):
+        await self.sdk_wrapper_call()
 
 
 class EndpointSearch(GetMethodTransferAPIEndpoint):
@@ -194,6 +592,105 @@ class EndpointSearch(GetMethodTransferAPIEndpoint):
         "limit": 10,
         "offset": 0,
     }
+    # Results are cached by (user token, normalized search arguments)
+    search_cache = TTLCache(
+        maxsize=globus_config.get_endpoint_search_cache_size(),
+        ttl=globus_config.get_endpoint_search_cache_ttl(),
+    )
+    # The latest debounced search for each (user token, search_id). The event is set
+    # when a newer search supersedes it.
+    latest_searches = dict()
+
+    def get_search_cache_key(self, kwargs: dict) -> tuple:
+        fulltext = kwargs["filter_fulltext"]
+        try:
+            limit, offset = int(kwargs["limit"]), int(kwargs["offset"])
+        except ValueError:
+            raise InvalidAPIInput("limit and offset must be integers") from None
+        return (
+            self.login_manager.get_resource_server_fingerprint(
+                "transfer.api.globus.org"
+            ),
+            " ".join(fulltext.lower().split()) if fulltext is not None else None,
+            kwargs["filter_scope"],
+            kwargs["filter_owner_id"],
+            kwargs["filter_host_endpoint"],
+            str(kwargs["filter_non_functional"]).lower() in ("1", "true"),
+            limit,
+            offset,
+        )
+
+    async def search(self, key: tuple, kwargs: dict) -> dict:
+        tc = self.get_transfer_client()
+        response = await self.run_globus_call(
+            "transfer", "endpoint_search", tc.endpoint_search, **kwargs
+        )
+        self.search_cache.set(key, response.data)
+        return response.data
+
+    async def transfer_client_call(self):
+        """
+        Search for collections. Cached results are returned immediately. Otherwise,
+        searches passing a ``search_id`` are debounced, see ``debounced_search()``.
+        """
+        _, kwargs = self.get_globus_sdk_args()
+        key = self.get_search_cache_key(kwargs)
+        results = self.search_cache.get(key)
+        if results is not None:
+            return results
+        search_id = self.get_query_argument("search_id", None)
+        if search_id is not None:
+            return await self.debounced_search(search_id, key, kwargs)
+        return await self.coalesced_call(
+            (self.globus_sdk_method, *key),
+            functools.partial(self.search, key, kwargs),
+        )
+
+    async def debounced_search(self, search_id: str, key: tuple, kwargs: dict):
+        """
+        Wait GLOBUS_ENDPOINT_SEARCH_DEBOUNCE milliseconds before searching, and drop
+        the search with a 409 as soon as a newer search is made with the same
+        search_id, such as for the next keystroke in a type-ahead search. A dropped
+        search which already reached Transfer still finishes in the background and
+        caches its results.
+        """
+        session = (key[0], search_id)
+        if session in self.latest_searches:
+            self.latest_searches[session].set()
+        superseded = tornado.locks.Event()
+        self.latest_searches[session] = superseded
+        try:
+            debounce = self.gconfig.get_snapshot().endpoint_search_debounce
+            if debounce:
+                try:
+                    await superseded.wait(
+                        timeout=datetime.timedelta(milliseconds=debounce)
+                    )
+                except tornado.util.TimeoutError:
+                    pass
+            if not superseded.is_set():
+                search = asyncio.ensure_future(
+                    self.coalesced_call(
+                        (self.globus_sdk_method, *key),
+                        functools.partial(self.search, key, kwargs),
+                    )
+                )
+                waiter = asyncio.ensure_future(superseded.wait())
+                await asyncio.wait(
+                    [search, waiter], return_when=asyncio.FIRST_COMPLETED
+                )
+                waiter.cancel()
+                if search.done():
+                    return search.result()
+                search.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self.set_status(409)
+            return {
+                "code": "SearchSuperseded",
+                "message": f"A newer search was made for search_id {search_id}",
+            }
+        finally:
+            if self.latest_searches.get(session) is superseded:
+                del self.latest_searches[session]
 
 
 class EndpointDetail(GCSAuthMixin, GetMethodTransferAPIEndpoint):
@@ -202,10 +699,19 @@ class EndpointDetail(GCSAuthMixin, GetMethodTransferAPIEndpoint):
     optional_args = {}
     endpoint_or_collection_parameter = "endpoint"
 
+    async def transfer_client_call(self):
+        """Fetch the endpoint, and save its metadata for building login URLs"""
+        endpoint = await super().transfer_client_call()
+        await self.run_local_fs_call(
+            self.endpoint_metadata.update_from_endpoint_document, endpoint
+        )
+        return endpoint
+
 
 default_handlers = [
     ("/submit_transfer", SubmitTransfer, dict(), "submit_transfer"),
     ("/operation_ls", OperationLS, dict(), "operation_ls"),
+    ("/operation_ls_batch", OperationLSBatch, dict(), "operation_ls_batch"),
     ("/endpoint_search", EndpointSearch, dict(), "endpoint_search"),
     ("/endpoint_detail", EndpointDetail, dict(), "endpoint_detail"),
     ("/endpoint_autoactivate", EndpointAutoactivate, dict(), "endpoint_autoactivate"),
@@ -1,10 +1,12 @@
 from logging import exception
 import urllib
 import globus_sdk
-from typing import List
+from typing import List, Optional
+import tornado.web
 from globus_sdk.scopes import TransferScopes
 from globus_jupyterlab.exc import DataAccessScopesRequired
 from globus_jupyterlab.handlers.base import BaseAPIHandler
+from globus_jupyterlab import metrics
 from globus_jupyterlab.handlers import exception_handlers
 
 
@@ -14,15 +16,27 @@ class AutoAuthURLMixin(BaseAPIHandler):
         exception_handlers.LoginRequired,
     ]
 
-    def get_exception_info(self, exception: globus_sdk.GlobusAPIError) -> bool:
+    async def get_exception_info(
+        self, exception: globus_sdk.GlobusAPIError, endpoint: Optional[str] = None
+    ) -> dict:
+        """
+        Build the error info returned to the client for a failed Globus call,
+        including a login URL if logging in again would fix it. ``endpoint`` is the
+        collection which was called, if it is not the handler's request argument.
+        """
         info = {
             "error": exception.code,
             "details": exception.message,
         }
-        exc_handler = self.get_login_exception_handler(exception)
+        with self.tracer.span("get_login_exception_handler") as span:
+            exc_handler = self.get_login_exception_handler(exception, endpoint)
+            if span is not None:
+                span.set_attribute("exception_handler", type(exc_handler).__name__)
         if exc_handler is not None:
             info.update(exc_handler.metadata)
-            info["login_url"] = self.get_globus_login_url(exc_handler)
+            await self.load_required_identities(exc_handler)
+            with self.tracer.span("get_globus_login_url"):
+                info["login_url"] = self.get_globus_login_url(exc_handler, endpoint)
         else:
             info.update(
                 {
@@ -48,35 +62,41 @@ class AutoAuthURLMixin(BaseAPIHandler):
         return self.get_argument(col)
 
     def get_login_exception_handler(
-        self, exception: globus_sdk.GlobusAPIError
+        self, exception: globus_sdk.GlobusAPIError, endpoint: Optional[str] = None
     ) -> exception_handlers.AuthExceptionHandler:
-        for cls in self.login_checks:
-            instance = cls(exception)
-            check_value = instance.check()
-            self.log.debug(f"Checking {cls.__name__}: {check_value}")
-            if check_value is True:
-                return instance
+        classifier = exception_handlers.get_classifier(tuple(self.login_checks))
+        instance = classifier.classify(exception)
+        self.log.debug(f"Classified {exception.code} as {type(instance).__name__}")
+        exception_handler = (
+            "unclassified" if instance is None else type(instance).__name__
+        )
+        metrics.GLOBUS_API_ERRORS.labels(
+            type(self).__name__, exception_handler, exception.http_status
+        ).inc()
+        return instance
 
     def get_requested_scopes(
-        self, exception_handler: exception_handlers.AuthExceptionHandler
+        self,
+        exception_handler: exception_handlers.AuthExceptionHandler,
+        endpoint: Optional[str] = None,
     ) -> list:
         try:
             if exception_handler is None:
                 return self.gconfig.get_transfer_scopes
             return exception_handler.get_extended_scopes(
-                self.gconfig.get_transfer_scopes()
+                list(self.gconfig.get_snapshot().transfer_scopes)
             )
         except DataAccessScopesRequired:
             new_scopes = []
             dependent_scope = globus_sdk.scopes.GCSCollectionScopeBuilder(
-                self.get_endpoint_or_collection()
+                endpoint or self.get_endpoint_or_collection()
             )
             transfer_with_data_access = self.login_manager.apply_dependent_scopes(
                 self.gconfig.transfer_scope, [dependent_scope.data_access]
             )
             new_scopes.append(transfer_with_data_access)
 
-            custom_t_scope = self.gconfig.get_transfer_submission_scope()
+            custom_t_scope = self.gconfig.get_snapshot().transfer_submission_scope
             if custom_t_scope:
                 custom_w_dep = self.login_manager.apply_dependent_scopes(
                     custom_t_scope, [transfer_with_data_access]
@@ -85,24 +105,31 @@ class AutoAuthURLMixin(BaseAPIHandler):
 
             return new_scopes
 
+    async def load_required_identities(
+        self, exception_handler: exception_handlers.AuthExceptionHandler
+    ):
+        """Fetch the user's identity set in the SDK executor, if the login URL for
+        an error needs it and it isn't cached. Login URLs are then built on the
+        IOLoop without calling Globus Auth."""
+        if exception_handler.get_required_session_domains():
+            if not self.identity_cache.is_current():
+                with self.tracer.span("load_required_identities"):
+                    await self.run_in_executor(self.identity_cache.get_domain_index)
+
     def get_required_identities(self, domains: List[str]) -> List[str]:
-        authorizer = self.login_manager.get_authorizer("auth.globus.org")
-        auth_client = globus_sdk.AuthClient(
-            client_id=self.login_manager.client_id, authorizer=authorizer
-        )
-        response = auth_client.oauth2_userinfo()
-        return [
-            ident["sub"]
-            for ident in response.data["identity_set"]
-            if any([domain in ident["username"] for domain in domains])
-        ]
+        # Loaded by load_required_identities, so this never calls Globus Auth
+        return self.identity_cache.get_identities_for_domains(domains, fetch=False)
 
     def get_globus_login_url(
-        self, exception_handler: exception_handlers.AuthExceptionHandler
+        self,
+        exception_handler: exception_handlers.AuthExceptionHandler,
+        endpoint: Optional[str] = None,
     ) -> str:
 
         params = dict(
-            requested_scopes=" ".join(self.get_requested_scopes(exception_handler)),
+            requested_scopes=" ".join(
+                self.get_requested_scopes(exception_handler, endpoint)
+            ),
             prompt="login",
         )
         domains = exception_handler.get_required_session_domains()
@@ -149,9 +176,66 @@ class GCSAuthMixin(AutoAuthURLMixin):
         exception_handlers.GCSUnexpectedGridFTPError,
     ]
 
+    def get_login_exception_handler(
+        self, exception: globus_sdk.GlobusAPIError, endpoint: Optional[str] = None
+    ) -> exception_handlers.AuthExceptionHandler:
+        exc_handler = super().get_login_exception_handler(exception, endpoint)
+        self.save_endpoint_metadata(exc_handler, endpoint)
+        return exc_handler
+
+    def save_endpoint_metadata(
+        self,
+        exception_handler: exception_handlers.AuthExceptionHandler,
+        endpoint: Optional[str] = None,
+    ):
+        """Save what an error showed about a collection, so the next login URL for it
+        can be built before calling it."""
+        if isinstance(exception_handler, exception_handlers.GCSv54DataAccessConsent):
+            fields = dict(requires_data_access=True, data_access_consented=False)
+        elif isinstance(exception_handler, exception_handlers.GCSv54HighAssurance):
+            domains = exception_handler.get_required_session_domains()
+            fields = dict(high_assurance=True, required_domains=tuple(domains))
+        else:
+            return
+        if endpoint is None:
+            try:
+                endpoint = self.get_endpoint_or_collection()
+            except (tornado.web.MissingArgumentError, NotImplementedError):
+                return
+        self.endpoint_metadata.update(endpoint, **fields)
+
+    async def get_proactive_login_info(self, endpoint: str) -> Optional[dict]:
+        """
+        Check saved metadata for a collection before calling it. If the call is
+        expected to fail for lack of a data_access scope, return the same error info
+        the failed call would have, including a login URL. Otherwise, return None.
+
+        The prediction may be out of date, such as when the user consented in another
+        session, so callers should still call the collection in the background to
+        record whether consent was given.
+        """
+        metadata = self.endpoint_metadata.get(endpoint)
+        if metadata is None:
+            return None
+        exc_handler = exception_handlers.PredictedDataAccessConsent(metadata)
+        if not exc_handler.check():
+            return None
+        self.log.debug(f"Collection {endpoint} requires a data_access scope")
+        info = {
+            "error": "ConsentRequired",
+            "details": f"Collection {endpoint} requires consent for data access",
+        }
+        info.update(exc_handler.metadata)
+        await self.load_required_identities(exc_handler)
+        info["login_url"] = self.get_globus_login_url(exc_handler, endpoint)
+        return info
+
     def get_globus_login_url(
-        self, exception_handler: exception_handlers.AuthExceptionHandler
+        self,
+        exception_handler: exception_handlers.AuthExceptionHandler,
+        endpoint: Optional[str] = None,
     ) -> str:
         if exception_handler and exception_handler.requires_user_intervention:
-            return f"https://app.globus.org/file-manager?origin_id={self.get_endpoint_or_collection()}"
-        return super().get_globus_login_url(exception_handler)
+            endpoint = endpoint or self.get_endpoint_or_collection()
+            return f"https://app.globus.org/file-manager?origin_id={endpoint}"
+        return super().get_globus_login_url(exception_handler, endpoint)
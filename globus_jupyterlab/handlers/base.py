@@ -1,7 +1,21 @@
+import functools
+import json
 import pathlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable
+
+import tornado.ioloop
+import tornado.web
 from jupyter_server.base.handlers import APIHandler
+from globus_jupyterlab import metrics
+from globus_jupyterlab.endpoint_metadata import EndpointMetadataCache
 from globus_jupyterlab.globus_config import GlobusConfig
+from globus_jupyterlab.handlers.compression import decompress_body
+from globus_jupyterlab.identity_cache import IdentitySetCache
 from globus_jupyterlab.login_manager import LoginManager
+from globus_jupyterlab.task_tracker import TaskTracker
+from globus_jupyterlab.token_refresh import TokenRefresher
+from globus_jupyterlab.tracing import Tracer
 
 globus_config = GlobusConfig()
 
@@ -12,6 +26,85 @@ class BaseAPIHandler(APIHandler):
         globus_config.get_client_id(),
         pathlib.Path(globus_config.get_token_storage_path()),
     )
+    # Globus SDK calls are blocking. They are run in this pool so that a slow
+    # Globus service doesn't stall the IOLoop, and so the number of calls made
+    # on behalf of the user at any one time stays bounded.
+    sdk_executor = ThreadPoolExecutor(
+        max_workers=globus_config.get_sdk_max_workers(),
+        thread_name_prefix="globus-jupyterlab-sdk",
+    )
+    # Local filesystem work, such as scanning directories selected for transfer.
+    # Kept apart from Globus calls, so a large tree on a slow volume doesn't hold
+    # them up.
+    local_scan_executor = ThreadPoolExecutor(
+        max_workers=globus_config.get_local_scan_max_workers(),
+        thread_name_prefix="globus-jupyterlab-local-scan",
+    )
+    # Started when the server extension is loaded
+    token_refresher = TokenRefresher(login_manager, globus_config, sdk_executor)
+    # What is known about collections the user has browsed, used for login URLs
+    endpoint_metadata = EndpointMetadataCache(
+        globus_config.get_endpoint_metadata_path(),
+        globus_config.get_endpoint_metadata_ttl(),
+    )
+    # The user's identities, used for login URLs which require a fresh session
+    identity_cache = IdentitySetCache(login_manager)
+    # Started when the first task is submitted
+    task_tracker = TaskTracker(login_manager, globus_config, sdk_executor)
+    # Records nothing unless GLOBUS_TRACING is enabled
+    tracer = Tracer(globus_config)
+
+    def prepare(self):
+        result = super().prepare()
+        encoding = self.request.headers.get("Content-Encoding")
+        if encoding and encoding.strip().lower() != "identity":
+            self.request.body = decompress_body(self.request.body, encoding)
+            del self.request.headers["Content-Encoding"]
+        return result
+
+    def on_finish(self):
+        metrics.REQUEST_DURATION.labels(
+            type(self).__name__, self.request.method, self.get_status()
+        ).observe(self.request.request_time())
+        super().on_finish()
+
+    def dumps(self, data) -> str:
+        """Serialize a JSON response, recording how long it takes"""
+        with self.tracer.span("dumps"):
+            with metrics.JSON_SERIALIZATION_DURATION.labels(type(self).__name__).time():
+                return json.dumps(data)
+
+    def get_timeout_argument(self, default: float, maximum: float) -> float:
+        """Fetch the "timeout" query argument for long-polling requests, in seconds"""
+        try:
+            timeout = float(self.get_query_argument("timeout", default))
+        except ValueError:
+            raise tornado.web.HTTPError(400, "timeout must be a number")
+        return min(max(timeout, 0), maximum)
+
+    async def run_globus_call(
+        self, service: str, method: str, func: Callable, *args, **kwargs
+    ):
+        """Run a blocking call to a Globus service in the SDK executor, recording
+        how long it takes"""
+        with self.tracer.span(f"{service}.{method}"):
+            return await self.run_in_executor(
+                metrics.timed_globus_call(service, method, func), *args, **kwargs
+            )
+
+    def run_in_executor(self, func: Callable, *args, **kwargs) -> Awaitable:
+        """Run a blocking call in the SDK executor, and return an awaitable for
+        the result. Exceptions raised by the call are re-raised when awaited."""
+        return tornado.ioloop.IOLoop.current().run_in_executor(
+            self.sdk_executor, functools.partial(func, *args, **kwargs)
+        )
+
+    def run_local_fs_call(self, func: Callable, *args, **kwargs) -> Awaitable:
+        """Run blocking local filesystem work in the local scan executor, and return
+        an awaitable for the result"""
+        return tornado.ioloop.IOLoop.current().run_in_executor(
+            self.local_scan_executor, functools.partial(func, *args, **kwargs)
+        )
 
 
 class RedirectWebHandler(BaseAPIHandler):
@@ -0,0 +1,167 @@
+import functools
+import zlib
+from typing import Callable, Optional, Tuple
+
+import tornado.httputil
+import tornado.web
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Tornado's own default for the largest request body it will read
+MAX_DECOMPRESSED_BODY_SIZE = 100 * 1024 * 1024
+
+
+def get_accepted_encodings(accept_encoding: str) -> set:
+    """Parse an Accept-Encoding header, skipping any encoding with q=0"""
+    accepted = set()
+    for value in accept_encoding.split(","):
+        encoding, _, params = value.partition(";")
+        encoding = encoding.strip().lower()
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, param_value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(param_value)
+                except ValueError:
+                    quality = 0.0
+        if encoding and quality > 0:
+            accepted.add(encoding)
+    return accepted
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick brotli if the client accepts it and the brotli package is installed,
+    otherwise gzip, otherwise None."""
+    accepted = get_accepted_encodings(accept_encoding)
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+class CompressedContentEncoding(tornado.web.OutputTransform):
+    """
+    Compress responses with brotli or gzip, whichever the client prefers to accept.
+    Works like tornado.web.GZipContentEncoding, which Jupyter Server only enables
+    for every handler with its compress_response setting. Brotli is only used if
+    the optional brotli package is installed. Responses already encoded, such as
+    by GZipContentEncoding, are left alone.
+
+    Transforms apply to every handler in the application, so only responses to
+    requests under ``path_prefix`` are compressed. See ``for_path_prefix()``.
+    """
+
+    CONTENT_TYPES = tornado.web.GZipContentEncoding.CONTENT_TYPES
+    MIN_LENGTH = tornado.web.GZipContentEncoding.MIN_LENGTH
+    GZIP_LEVEL = tornado.web.GZipContentEncoding.GZIP_LEVEL
+    # Listings are generated for each request, so favor speed over size
+    BROTLI_QUALITY = 4
+
+    def __init__(
+        self, request: tornado.httputil.HTTPServerRequest, path_prefix: str = "/"
+    ):
+        self.enabled = request.path.startswith(path_prefix)
+        self.encoding = None
+        if self.enabled:
+            self.encoding = negotiate_encoding(
+                request.headers.get("Accept-Encoding", "")
+            )
+        self._compressor = None
+
+    @classmethod
+    def for_path_prefix(
+        cls, path_prefix: str
+    ) -> Callable[[tornado.httputil.HTTPServerRequest], "CompressedContentEncoding"]:
+        """Build a transform for Application.add_transform(), which only compresses
+        responses to requests under path_prefix"""
+        return functools.partial(cls, path_prefix=path_prefix)
+
+    def _compressible_type(self, ctype: str) -> bool:
+        return ctype.startswith("text/") or ctype in self.CONTENT_TYPES
+
+    def transform_first_chunk(
+        self,
+        status_code: int,
+        headers: tornado.httputil.HTTPHeaders,
+        chunk: bytes,
+        finishing: bool,
+    ) -> Tuple[int, tornado.httputil.HTTPHeaders, bytes]:
+        if not self.enabled:
+            return status_code, headers, chunk
+        vary = headers.get("Vary")
+        if not vary:
+            headers["Vary"] = "Accept-Encoding"
+        elif "accept-encoding" not in vary.lower():
+            headers["Vary"] = f"{vary}, Accept-Encoding"
+        if self.encoding:
+            ctype = headers.get("Content-Type", "").split(";")[0]
+            if (
+                not self._compressible_type(ctype)
+                or (finishing and len(chunk) < self.MIN_LENGTH)
+                or "Content-Encoding" in headers
+            ):
+                self.encoding = None
+        if self.encoding:
+            headers["Content-Encoding"] = self.encoding
+            if self.encoding == "br":
+                self._compressor = brotli.Compressor(quality=self.BROTLI_QUALITY)
+            else:
+                self._compressor = zlib.compressobj(
+                    self.GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+                )
+            chunk = self.transform_chunk(chunk, finishing)
+            if "Content-Length" in headers:
+                if finishing:
+                    headers["Content-Length"] = str(len(chunk))
+                else:
+                    del headers["Content-Length"]
+        return status_code, headers, chunk
+
+    def transform_chunk(self, chunk: bytes, finishing: bool) -> bytes:
+        if self._compressor is None:
+            return chunk
+        if self.encoding == "br":
+            data = self._compressor.process(chunk)
+            return data + (
+                self._compressor.finish() if finishing else self._compressor.flush()
+            )
+        data = self._compressor.compress(chunk)
+        return data + self._compressor.flush(
+            zlib.Z_FINISH if finishing else zlib.Z_SYNC_FLUSH
+        )
+
+
+def decompress_body(
+    body: bytes, encoding: str, max_size: int = MAX_DECOMPRESSED_BODY_SIZE
+) -> bytes:
+    """
+    Decompress a gzip or deflate encoded request body, which browsers can produce
+    with CompressionStream. Raises tornado.web.HTTPError with a 415 for other
+    encodings, a 400 for invalid data, or a 413 if the decompressed body would be
+    larger than max_size.
+    """
+    encoding = encoding.strip().lower()
+    if encoding == "gzip":
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    elif encoding == "deflate":
+        decompressor = zlib.decompressobj()
+    else:
+        raise tornado.web.HTTPError(
+            415, f"Unsupported request Content-Encoding: {encoding}"
+        )
+    try:
+        data = decompressor.decompress(body, max_size)
+    except zlib.error as ze:
+        raise tornado.web.HTTPError(400, f"Invalid {encoding} request body: {ze}")
+    if decompressor.unconsumed_tail:
+        raise tornado.web.HTTPError(
+            413, f"Decompressed request body is larger than {max_size} bytes"
+        )
+    if not decompressor.eof:
+        raise tornado.web.HTTPError(400, f"Truncated {encoding} request body")
+    return data
@@ -1,4 +1,3 @@
-import json
 import tornado
 from globus_jupyterlab.handlers.base import BaseAPIHandler
 
@@ -11,28 +10,48 @@ class Config(BaseAPIHandler):
 
     @tornado.web.authenticated
     def get(self, *args, **kwargs):
-
+        config = self.gconfig.get_snapshot()
         copy_required = (
-            self.gconfig.get_redirect_uri()
-            == self.gconfig.globus_auth_code_redirect_url
+            config.redirect_uri == self.gconfig.globus_auth_code_redirect_url
         )
         data = {
             # TODO: Make these configurable
-            "collection_id": self.gconfig.get_collection_id(),
-            "collection_base_path": self.gconfig.get_collection_path(),
-            "host_posix_basepath": self.gconfig.get_host_posix_basepath(),
-            "host_collection_basepath": self.gconfig.get_host_collection_basepath(),
-            "is_gcp": self.gconfig.is_gcp(),
-            "is_hub": self.gconfig.is_hub(),
+            "collection_id": config.collection_id,
+            "collection_base_path": config.collection_path,
+            "host_posix_basepath": config.host_posix_basepath,
+            "host_collection_basepath": config.host_collection_basepath,
+            "is_gcp": config.is_gcp,
+            "is_hub": config.is_hub,
             "is_manual_copy_code_required": copy_required,
             "is_logged_in": self.login_manager.is_logged_in(),
-            "transfer_submission_url": self.gconfig.get_transfer_submission_url(),
-            "transfer_submission_scope": self.gconfig.get_transfer_submission_scope(),
-            "transfer_submission_is_hub_service": self.gconfig.get_transfer_submission_is_hub_service(),
+            "transfer_submission_url": config.transfer_submission_url,
+            "transfer_submission_scope": config.transfer_submission_scope,
+            "transfer_submission_is_hub_service": config.transfer_submission_is_hub_service,
             "last_login": self.gconfig.last_login,
-            "collection_id_owner": self.gconfig.get_collection_id_owner(),
+            "next_token_refresh": self.token_refresher.get_next_refresh(),
+            "collection_id_owner": config.collection_id_owner,
         }
-        self.finish(json.dumps(data))
+        self.finish(self.dumps(data))
+
+
+class ConfigReload(BaseAPIHandler):
+    """Resolve settings again, which are otherwise resolved once and cached. If a
+    setting is invalid, the current settings are kept. See the Config Reference for
+    which settings a reload can change."""
+
+    @tornado.web.authenticated
+    def post(self, *args, **kwargs):
+        try:
+            self.gconfig.reload()
+        except ValueError as ve:
+            self.set_status(400)
+            self.log.error("Failed to reload config", exc_info=True)
+            return self.finish(self.dumps({"result": "failure", "details": str(ve)}))
+        self.log.info("Globus JupyterLab config reloaded")
+        self.finish(self.dumps({"result": "success"}))
 
 
-default_handlers = [("/config", Config, {}, "config")]
+default_handlers = [
+    ("/config", Config, {}, "config"),
+    ("/config/reload", ConfigReload, {}, "config_reload"),
+]
@@ -1,10 +1,51 @@
 import abc
+import functools
 import json
+import logging
 import re
-from typing import List
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Type
 import globus_sdk
+from globus_jupyterlab.endpoint_metadata import EndpointMetadata
 from globus_jupyterlab.exc import DataAccessScopesRequired, LoginException
 
+log = logging.getLogger(__name__)
+
+
+GRIDFTP_JSON_RESULT = re.compile(r"530-GridFTP-JSON-Result: (.+)\\r\\n530 End")
+
+
+class ParsedAuthError(NamedTuple):
+    """The parts of a GlobusAPIError needed to classify it, parsed only once"""
+
+    http_status: int
+    code: Optional[str]
+    gridftp_response: Optional[dict]
+    gridftp_data_type: Optional[str]
+
+    @classmethod
+    def from_exception(cls, exception: globus_sdk.GlobusAPIError) -> "ParsedAuthError":
+        gridftp_response = parse_gridftp_json_response(exception.message)
+        data_type = None
+        if isinstance(gridftp_response, dict):
+            detail = gridftp_response.get("detail")
+            if isinstance(detail, dict):
+                data_type = detail.get("DATA_TYPE")
+        return cls(exception.http_status, exception.code, gridftp_response, data_type)
+
+
+def parse_gridftp_json_response(message: str) -> Optional[dict]:
+    match = GRIDFTP_JSON_RESULT.search(message or "")
+    if match:
+        try:
+            return json.loads(match.group(1))
+        except json.decoder.JSONDecodeError:
+            # We got an error back from GridFTP, but it didn't match the expected format. This should
+            # never happen and means the GridFTP has changed, and this package should be updated.
+            log.error(
+                "Found GridFTP error but failed to parse it. This is an error and needs to be fixed."
+            )
+    return None
+
 
 class AuthExceptionHandler(abc.ABC):
 
@@ -12,14 +53,42 @@ class AuthExceptionHandler(abc.ABC):
     requires_transfer_scopes = True
     requires_user_intervention = False
 
-    def __init__(self, exception: globus_sdk.GlobusAPIError):
+    # Errors this handler matches, used to build the AuthErrorClassifier decision
+    # table. None matches anything.
+    match_http_status = None
+    match_code = None
+    match_gridftp_data_type = None
+    match_any_gridftp_response = False
+
+    def __init__(
+        self,
+        exception: globus_sdk.GlobusAPIError,
+        error: Optional[ParsedAuthError] = None,
+    ):
         self.exception = exception
+        if error is None and exception is not None:
+            error = ParsedAuthError.from_exception(exception)
+        self.error = error
         self.available_session_identities = None
         self.requires_transfer_scopes = None
 
-    @abc.abstractmethod
+    @classmethod
+    def matches(cls, error: ParsedAuthError) -> bool:
+        return (
+            (
+                cls.match_http_status is None
+                or error.http_status == cls.match_http_status
+            )
+            and (cls.match_code is None or error.code == cls.match_code)
+            and (
+                cls.match_gridftp_data_type is None
+                or error.gridftp_data_type == cls.match_gridftp_data_type
+            )
+            and (not cls.match_any_gridftp_response or bool(error.gridftp_response))
+        )
+
     def check(self) -> bool:
-        pass
+        return self.matches(self.error)
 
     @property
     def metadata(self) -> dict:
@@ -48,9 +117,9 @@ class AuthExceptionHandler(abc.ABC):
 
 
 class GCSAuthExceptionHandler(AuthExceptionHandler):
-    def __init__(self, exception: globus_sdk.GlobusAPIError):
-        super().__init__(exception)
-        self.gridftp_response = self.parse_gridftp_json_response(self.exception.message)
+    @property
+    def gridftp_response(self) -> Optional[dict]:
+        return self.error.gridftp_response
 
     @property
     def metadata(self) -> dict:
@@ -58,42 +127,20 @@ class GCSAuthExceptionHandler(AuthExceptionHandler):
         m["parsed_gridftp_response"] = self.gridftp_response
         return m
 
-    def parse_gridftp_json_response(self, response) -> dict:
-        try:
-            match = re.search(r"530-GridFTP-JSON-Result: (.+)\\r\\n530 End", response)
-            if match:
-                return json.loads(match.groups()[0])
-        except json.decoder.JSONDecodeError:
-            # We got an error back from GridFTP, but it didn't match the expected format. This should
-            # never happen and means the GridFTP has changed, and this package should be updated.
-            self.log.error(
-                "Found GridFTP error but failed to parse it. This is an error and needs to be fixed."
-            )
-
 
 class LoginRequired(AuthExceptionHandler):
-    def check(self):
-        return self.exception.http_status == 401
+    match_http_status = 401
 
 
 class GCSv4Endpoint(GCSAuthExceptionHandler):
     requires_user_intervention = True
-
-    def check(self) -> bool:
-        return (
-            self.exception.http_status == 400
-            and self.exception.code == "ClientError.ActivationRequired"
-        )
+    match_http_status = 400
+    match_code = "ClientError.ActivationRequired"
 
 
 class GCSv54HighAssurance(GCSAuthExceptionHandler):
-    def check(self) -> bool:
-        return (
-            self.exception.http_status == 502
-            and self.gridftp_response
-            and self.gridftp_response.get("detail", {}).get("DATA_TYPE")
-            == "not_from_allowed_domain#1.0.0"
-        )
+    match_http_status = 502
+    match_gridftp_data_type = "not_from_allowed_domain#1.0.0"
 
     def get_required_session_domains(self):
         domains = self.gridftp_response["detail"]["allowed_domains"]
@@ -102,33 +149,96 @@ class GCSv54HighAssurance(GCSAuthExceptionHandler):
 
 class GCSv54S3Credentials(GCSAuthExceptionHandler):
     requires_user_intervention = True
-
-    def check(self) -> bool:
-        return (
-            self.exception.http_status == 502
-            and self.gridftp_response
-            and self.gridftp_response.get("detail", {}).get("DATA_TYPE")
-            == "invalid_credential#1.0.0"
-        )
+    match_http_status = 502
+    match_gridftp_data_type = "invalid_credential#1.0.0"
 
 
 class GCSUnexpectedGridFTPError(GCSAuthExceptionHandler):
     requires_user_intervention = True
+    match_http_status = 502
+    match_any_gridftp_response = True
 
-    def check(self) -> bool:
 
-        return bool(self.exception.http_status == 502 and self.gridftp_response)
+class GCSv54DataAccessConsent(GCSAuthExceptionHandler):
+    """
+    Collection is a GCS v5.4 mapped collection and requires a data_access scope
+    """
 
+    match_http_status = 403
+    match_code = "ConsentRequired"
+
+    def get_extended_scopes(self, transfer_scopes):
+        raise DataAccessScopesRequired(f"data_access scope required!")
+
+
+class AuthErrorClassifier:
+    """
+    Pick the first handler in ``login_checks`` which matches an error. The checks
+    are compiled once into a decision table keyed by HTTP status, so classifying an
+    error only looks at handlers which could match its status, and only the
+    matching handler is instantiated.
+    """
+
+    def __init__(self, login_checks: Sequence[Type[AuthExceptionHandler]]):
+        self.login_checks = tuple(login_checks)
+        statuses = {
+            cls.match_http_status
+            for cls in self.login_checks
+            if cls.match_http_status is not None
+        }
+        # Handlers which match any status stay in order with the others
+        self.table = {
+            status: tuple(
+                cls
+                for cls in self.login_checks
+                if cls.match_http_status in (status, None)
+            )
+            for status in statuses
+        }
+        self.default = tuple(
+            cls for cls in self.login_checks if cls.match_http_status is None
+        )
+
+    def classify(
+        self, exception: globus_sdk.GlobusAPIError
+    ) -> Optional[AuthExceptionHandler]:
+        candidates = self.table.get(exception.http_status, self.default)
+        if not candidates:
+            return None
+        error = ParsedAuthError.from_exception(exception)
+        for cls in candidates:
+            if cls.matches(error):
+                return cls(exception, error)
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def get_classifier(
+    login_checks: Tuple[Type[AuthExceptionHandler], ...]
+) -> AuthErrorClassifier:
+    return AuthErrorClassifier(login_checks)
+
+
+class PredictedDataAccessConsent(AuthExceptionHandler):
+    """
+    Not an exception handler as such. Checks saved collection metadata before a call
+    to a GCS v5.4 mapped collection, so a user who hasn't been seen to consent to its
+    data_access scope can be asked to login without the call failing first. Required
+    domains learned from earlier high-assurance errors are included in the login URL.
+    """
+
+    def __init__(self, endpoint_metadata: EndpointMetadata):
+        super().__init__(exception=None)
+        self.endpoint_metadata = endpoint_metadata
 
-class GCSv54DataAccessConsent(GCSAuthExceptionHandler):
     def check(self) -> bool:
-        """
-        Collection is a GCS v5.4 mapped collection and requires a data_access scope
-        """
         return (
-            self.exception.http_status == 403
-            and self.exception.code == "ConsentRequired"
+            self.endpoint_metadata.requires_data_access
+            and self.endpoint_metadata.data_access_consented is not True
         )
 
     def get_extended_scopes(self, transfer_scopes):
         raise DataAccessScopesRequired(f"data_access scope required!")
+
+    def get_required_session_domains(self):
+        return list(self.endpoint_metadata.required_domains) or None
@@ -1,11 +1,12 @@
+import asyncio
 import tornado
+import tornado.locks
 from tornado.concurrent import Future
 import globus_sdk
 import urllib
 import base64
 import datetime
 import os
-import json
 
 from globus_jupyterlab.handlers.base import BaseAPIHandler, RedirectWebHandler
 from globus_jupyterlab.models import AuthResponseModel
@@ -23,7 +24,7 @@ class PKCEFlowManager(BaseAPIHandler):
         return base64.urlsafe_b64encode(os.urandom(32)).decode("utf-8").rstrip("=")
 
     def get_redirect_uri(self):
-        redirect_uri = self.gconfig.get_redirect_uri()
+        redirect_uri = self.gconfig.get_snapshot().redirect_uri
         if not redirect_uri:
             self.log.info("No redirect URI configured, determining automatically...")
             redirect_uri = urllib.parse.urlunparse(
@@ -40,7 +41,9 @@ class PKCEFlowManager(BaseAPIHandler):
         return redirect_uri
 
     def get_client(self) -> globus_sdk.NativeAppAuthClient:
-        return globus_sdk.NativeAppAuthClient(self.gconfig.get_client_id())
+        # The client is shared between requests. This is safe because each OAuth2 flow
+        # is started and used within a single synchronous handler call.
+        return self.login_manager.get_native_client()
 
     def get_stored_verifier(self) -> str:
         return self.get_secure_cookie("verifier").decode("utf-8")
@@ -48,6 +51,13 @@ class PKCEFlowManager(BaseAPIHandler):
     def store_verifier(self, verifier: str) -> None:
         self.set_secure_cookie("verifier", verifier, expires_days=None)
 
+    def get_stored_requested_scopes(self) -> str:
+        scopes = self.get_secure_cookie("requested_scopes")
+        return scopes.decode("utf-8") if scopes else ""
+
+    def store_requested_scopes(self, scopes: str) -> None:
+        self.set_secure_cookie("requested_scopes", scopes, expires_days=None)
+
     def complete_auth_flow(self, code: str):
         client = self.get_client()
         client.oauth2_start_flow(
@@ -58,10 +68,18 @@ class PKCEFlowManager(BaseAPIHandler):
             token_response = client.oauth2_exchange_code_for_tokens(code)
 
             # Store the last login time and token response. The last_login time
-            # is reported by the config handler and used for polling when the
-            # user has completed auth.
+            # is reported by the config and login_status handlers, and is used
+            # to tell when the user has completed auth.
             self.gconfig.last_login = datetime.datetime.now().isoformat()
             self.login_manager.store(token_response)
+            # Consent was given to any data_access scopes requested for collections
+            self.endpoint_metadata.set_consents_from_scopes(
+                self.get_stored_requested_scopes()
+            )
+            # Fetched now so later login URLs don't need to call Globus Auth
+            self.identity_cache.clear()
+            self.run_in_executor(self.identity_cache.refresh_on_login)
+            LoginStatus.login_completed.notify_all()
             return AuthResponseModel(
                 status_code=token_response.http_status, result="success"
             )
@@ -80,13 +98,13 @@ class GetDependentSubmissionScope(BaseAPIHandler):
         gcs_scope = globus_sdk.scopes.GCSCollectionScopeBuilder(
             self.get_query_argument("collection")
         )
-        submission_scope = self.gconfig.get_transfer_submission_scope()
+        submission_scope = self.gconfig.get_snapshot().transfer_submission_scope
         response = {
             "base_submission_service_scope": submission_scope,
             "gcs_scope": gcs_scope.data_access,
             "full_scope": f"{submission_scope}[{gcs_scope.data_access}]",
         }
-        self.finish(json.dumps(response))
+        self.finish(self.dumps(response))
 
 
 class Login(PKCEFlowManager):
@@ -129,19 +147,22 @@ class Login(PKCEFlowManager):
         Redirect to Globus Auth for the first 'authorization' hop.
         """
         # Start the flow by gathering general oauth2 parameters.
+        config = self.gconfig.get_snapshot()
         verifier = self.generate_verifier()
+        requested_scopes = self.get_query_argument(
+            "requested_scopes", " ".join(config.scopes)
+        )
         client = self.get_client()
         client.oauth2_start_flow(
             redirect_uri=self.get_redirect_uri(),
             verifier=verifier,
-            requested_scopes=self.get_query_argument(
-                "requested_scopes", self.gconfig.get_scopes()
-            ),
-            refresh_tokens=self.gconfig.get_refresh_tokens(),
-            prefill_named_grant=self.gconfig.get_named_grant(),
+            requested_scopes=requested_scopes,
+            refresh_tokens=config.refresh_tokens,
+            prefill_named_grant=config.named_grant,
         )
         # Store the verifier, this is needed to complete the flow in the auth callback.
         self.store_verifier(verifier)
+        self.store_requested_scopes(requested_scopes)
 
         # Set any custom Globus authorization parameters. Currently these are all session values
         authorize_params = {
@@ -191,25 +212,70 @@ class AuthCallback(RedirectWebHandler, PKCEFlowManager):
         )
 
 
+class LoginStatus(BaseAPIHandler):
+    """
+    Long-poll for a login to complete, instead of polling /config.
+
+    Responds as soon as the last login time differs from the "since" query param,
+    which is the last_login value the client already knows. Omitting "since" waits
+    for the next login after the request is made, so clients polling again should
+    send the last_login from the previous response. Otherwise, responds with
+    changed=false after "timeout" seconds so the client can poll again. Waiting
+    requests are woken by complete_auth_flow, and hold no resources while they wait.
+    """
+
+    login_completed = tornado.locks.Condition()
+    default_timeout = 30
+    max_timeout = 120
+
+    @tornado.web.authenticated
+    async def get(self):
+        since = self.get_query_argument("since", self.gconfig.last_login)
+        timeout = self.get_timeout_argument(self.default_timeout, self.max_timeout)
+        if self.gconfig.last_login == since and timeout:
+            await self.login_completed.wait(timeout=datetime.timedelta(seconds=timeout))
+        data = {
+            "changed": self.gconfig.last_login != since,
+            "last_login": self.gconfig.last_login,
+            "is_logged_in": self.login_manager.is_logged_in(),
+        }
+        self.finish(self.dumps(data))
+
+
 class Logout(BaseAPIHandler):
     @tornado.web.authenticated
-    def get(self):
+    async def get(self):
         """
-        Revoke all local Gloubs tokens
+        Revoke all local Gloubs tokens. Revocations run in the login manager's own
+        pool, so waiting for them doesn't hold up other Globus SDK calls.
         """
-        success = self.login_manager.logout()
+        revocations = await self.run_in_executor(self.login_manager.start_logout)
+        if revocations:
+            timeout = self.gconfig.get_snapshot().token_revocation_timeout
+            _, not_done = await asyncio.wait(
+                [asyncio.wrap_future(revocation) for revocation in revocations],
+                timeout=timeout,
+            )
+            self.login_manager.log_unfinished_revocations(
+                len(not_done), len(revocations), timeout
+            )
+        success = bool(revocations)
+        self.task_tracker.clear()
+        self.identity_cache.clear()
+        self.endpoint_metadata.clear_consents()
         data = {
             "result": "success" if success else "failure",
             "details": "You have been logged out."
             if success
             else "You are not logged in!",
         }
-        self.finish(json.dumps(data))
+        self.finish(self.dumps(data))
 
 
 default_handlers = [
     ("/login", Login, dict(), "login"),
     ("/logout", Logout, dict(), "logout"),
+    ("/login_status", LoginStatus, dict(), "login_status"),
     ("/oauth_callback", AuthCallback, dict(), "redirect_uri"),
     ("/oauth_callback_manual", AuthCallbackManual, dict(), "redirect_uri_manual"),
     (
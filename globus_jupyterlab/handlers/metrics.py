@@ -0,0 +1,24 @@
+import tornado
+from jupyter_server.base.handlers import APIHandler
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from globus_jupyterlab import metrics
+from globus_jupyterlab.handlers.base import BaseAPIHandler
+
+
+class Metrics(BaseAPIHandler):
+    """API Endpoint for Prometheus metrics about globus-jupyterlab requests, calls to
+    Globus services, token operations, settings and JSON serialization. These are
+    kept separate from the metrics Jupyter Server serves at its own /metrics."""
+
+    @tornado.web.authenticated
+    def get(self):
+        self.set_header("Content-Type", CONTENT_TYPE_LATEST)
+        self.finish(generate_latest(metrics.REGISTRY))
+
+    def finish(self, *args, **kwargs):
+        # APIHandler would replace the Prometheus text format Content-Type with JSON
+        return super(APIHandler, self).finish(*args, **kwargs)
+
+
+default_handlers = [("/metrics", Metrics, {}, "metrics")]
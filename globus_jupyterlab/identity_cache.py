@@ -0,0 +1,126 @@
+import collections
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import globus_sdk
+
+from globus_jupyterlab import metrics
+from globus_jupyterlab.login_manager import LoginManager
+
+log = logging.getLogger(__name__)
+
+
+class IdentitySetCache:
+    """
+    Cache the user's Globus identity set, so login URLs which require an identity
+    from a given domain can be built without calling Globus Auth. The identity set
+    is fetched with ``oauth2_userinfo`` when the user logs in, and is tied to the
+    login's Auth tokens. The refresh token is used if there is one, so refreshing
+    the access token does not invalidate the cache. Identities are indexed by the
+    domain of their username when fetched.
+
+    If tokens change without going through login, such as when the server starts
+    with stored tokens, handlers fetch the identity set in the SDK executor the
+    first time a login URL needs it.
+    """
+
+    resource_server = "auth.globus.org"
+
+    def __init__(self, login_manager: LoginManager):
+        self.login_manager = login_manager
+        self._lock = threading.Lock()
+        self._fingerprint = None
+        self._domain_index = dict()
+
+    @staticmethod
+    def get_identity_domain(username: str) -> Optional[str]:
+        _, at, domain = username.rpartition("@")
+        return domain.lower() if at else None
+
+    @classmethod
+    def build_domain_index(cls, identity_set: Iterable[dict]) -> Dict[str, List[str]]:
+        index = collections.defaultdict(list)
+        for identity in identity_set:
+            domain = cls.get_identity_domain(identity.get("username", ""))
+            if domain:
+                index[domain].append(identity["sub"])
+        return dict(index)
+
+    def get_auth_fingerprint(self) -> str:
+        """Raises LookupError if the user has no Auth tokens"""
+        tokens = self.login_manager.storage.get_token_data(self.resource_server)
+        if not tokens:
+            raise LookupError(f"No tokens for {self.resource_server}")
+        return self.login_manager.get_token_fingerprint(
+            tokens.get("refresh_token") or tokens["access_token"]
+        )
+
+    def fetch_identity_set(self) -> List[dict]:
+        """Call Globus Auth for the current identity set. This is blocking."""
+        auth_client = self.login_manager.get_client(
+            self.resource_server,
+            globus_sdk.AuthClient,
+            client_id=self.login_manager.client_id,
+        )
+        userinfo = metrics.timed_globus_call(
+            "auth", "oauth2_userinfo", auth_client.oauth2_userinfo
+        )
+        return userinfo().data["identity_set"]
+
+    def refresh(self) -> Tuple[str, Dict[str, List[str]]]:
+        """Fetch and index the identity set for the current Auth tokens"""
+        fingerprint = self.get_auth_fingerprint()
+        domain_index = self.build_domain_index(self.fetch_identity_set())
+        with self._lock:
+            self._fingerprint, self._domain_index = fingerprint, domain_index
+        return fingerprint, domain_index
+
+    def refresh_on_login(self):
+        """Refresh after a login. Errors are logged, the identity set is instead
+        fetched on first use."""
+        try:
+            self.refresh()
+        except (globus_sdk.GlobusError, LookupError):
+            log.warning("Unable to fetch the Globus identity set", exc_info=True)
+        except Exception:
+            log.error("Unexpected error fetching the identity set", exc_info=True)
+
+    def clear(self):
+        with self._lock:
+            self._fingerprint, self._domain_index = None, dict()
+
+    def is_current(self) -> bool:
+        """True if the cached identity set belongs to the current Auth tokens. This
+        never calls Globus Auth."""
+        try:
+            fingerprint = self.get_auth_fingerprint()
+        except LookupError:
+            return False
+        with self._lock:
+            return fingerprint == self._fingerprint
+
+    def get_domain_index(self, fetch: bool = True) -> Dict[str, List[str]]:
+        """Fetch the indexed identity set for the current Auth tokens. If it isn't
+        cached, it is fetched from Globus Auth, which is blocking. With
+        ``fetch=False``, an empty index is returned instead."""
+        fingerprint = self.get_auth_fingerprint()
+        with self._lock:
+            if fingerprint == self._fingerprint:
+                return self._domain_index
+        if not fetch:
+            log.debug("The identity set is not cached for the current tokens")
+            return dict()
+        return self.refresh()[1]
+
+    def get_identities_for_domains(
+        self, domains: Iterable[str], fetch: bool = True
+    ) -> List[str]:
+        """Fetch the user's identity IDs from any of the given domains"""
+        domain_index = self.get_domain_index(fetch=fetch)
+        identities = []
+        for domain in domains:
+            for identity_id in domain_index.get(domain.lower(), ()):
+                if identity_id not in identities:
+                    identities.append(identity_id)
+        return identities
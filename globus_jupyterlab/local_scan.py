@@ -0,0 +1,191 @@
+import asyncio
+import collections
+import functools
+import os
+import stat
+import threading
+import time
+import uuid
+from concurrent.futures import Executor
+from typing import Awaitable, Callable, List, NamedTuple, Optional
+
+# How many entries are read from a directory between checks for cancellation
+CANCEL_CHECK_INTERVAL = 1000
+
+
+class DirectoryScan(NamedTuple):
+    """What was found reading a single directory, or a single selected file"""
+
+    files: int = 0
+    directories: int = 0
+    bytes: int = 0
+    symlinks: int = 0
+    errors: int = 0
+    subdirectories: tuple = ()
+
+
+def scan_directory(path: str, cancelled: threading.Event) -> DirectoryScan:
+    """
+    Read one directory with os.scandir, without descending into subdirectories.
+    Symlinks are counted, but never followed, since recursive Globus transfers skip
+    them by default. Entries which can't be read are counted as errors. Stops early
+    if the scan is cancelled.
+    """
+    files = size = symlinks = errors = 0
+    subdirectories = []
+    try:
+        with os.scandir(path) as entries:
+            for count, entry in enumerate(entries):
+                if count % CANCEL_CHECK_INTERVAL == 0 and cancelled.is_set():
+                    break
+                try:
+                    if entry.is_symlink():
+                        symlinks += 1
+                    elif entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.path)
+                    else:
+                        size += entry.stat(follow_symlinks=False).st_size
+                        files += 1
+                except OSError:
+                    errors += 1
+    except OSError:
+        errors += 1
+    return DirectoryScan(
+        files=files,
+        directories=1,
+        bytes=size,
+        symlinks=symlinks,
+        errors=errors,
+        subdirectories=tuple(subdirectories),
+    )
+
+
+def scan_selected_path(
+    path: str, cancelled: threading.Event
+) -> Optional[DirectoryScan]:
+    """Scan a path selected by the user, which may be a file or a directory.
+    Returns None if the path does not exist."""
+    try:
+        path_stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    except OSError:
+        return DirectoryScan(errors=1)
+    if stat.S_ISDIR(path_stat.st_mode):
+        return scan_directory(path, cancelled)
+    return DirectoryScan(files=1, bytes=path_stat.st_size)
+
+
+class PathTotals:
+    """Running totals for everything found under one selected path"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.exists = True
+        self.files = 0
+        self.directories = 0
+        self.bytes = 0
+        self.symlinks = 0
+        self.errors = 0
+
+    def add(self, result: DirectoryScan):
+        self.files += result.files
+        self.directories += result.directories
+        self.bytes += result.bytes
+        self.symlinks += result.symlinks
+        self.errors += result.errors
+
+    def to_dict(self) -> dict:
+        return {
+            "path": self.path,
+            "exists": self.exists,
+            "files": self.files,
+            "directories": self.directories,
+            "bytes": self.bytes,
+            "symlinks": self.symlinks,
+            "errors": self.errors,
+        }
+
+
+class LocalPathScan:
+    """
+    Count the files, directories and bytes under local paths selected for transfer.
+    Each directory is read as a separate job in the executor, and up to
+    ``concurrency`` directories are read at once, so a large tree is scanned in
+    parallel without blocking the IOLoop. Totals are only updated on the IOLoop.
+
+    A scan can be stopped at any time with ``cancel()``. Directories not yet started
+    are dropped, and directories being read stop early.
+    """
+
+    def __init__(self, paths: List[str], executor: Executor, concurrency: int):
+        self.scan_id = str(uuid.uuid4())
+        self.executor = executor
+        self.concurrency = concurrency
+        self.results = [PathTotals(path) for path in paths]
+        self.cancelled = threading.Event()
+        self._pending = {}
+
+    @property
+    def totals(self) -> dict:
+        """Totals for every selected path combined"""
+        return {
+            field: sum(getattr(result, field) for result in self.results)
+            for field in ("files", "directories", "bytes", "symlinks", "errors")
+        }
+
+    def cancel(self):
+        """Stop the scan. Must be called from the IOLoop."""
+        self.cancelled.set()
+        for future in self._pending:
+            future.cancel()
+
+    def _submit(self, index: int, func: Callable, path: str):
+        future = asyncio.get_event_loop().run_in_executor(
+            self.executor, functools.partial(func, path, self.cancelled)
+        )
+        self._pending[future] = index
+
+    def _collect(self, future: asyncio.Future, queue: collections.deque):
+        index = self._pending.pop(future)
+        if future.cancelled():
+            return
+        result = future.result()
+        if result is None:
+            self.results[index].exists = False
+            return
+        self.results[index].add(result)
+        queue.extend(
+            (index, scan_directory, directory) for directory in result.subdirectories
+        )
+
+    async def run(
+        self,
+        on_progress: Optional[Callable[[], Awaitable]] = None,
+        progress_interval: float = 0.5,
+    ):
+        """Scan every selected path, awaiting ``on_progress`` every
+        ``progress_interval`` seconds until the scan completes or is cancelled."""
+        queue = collections.deque(
+            (index, scan_selected_path, result.path)
+            for index, result in enumerate(self.results)
+        )
+        next_progress = time.monotonic() + progress_interval
+        try:
+            while (self._pending or queue) and not self.cancelled.is_set():
+                while queue and len(self._pending) < self.concurrency:
+                    self._submit(*queue.popleft())
+                done, _ = await asyncio.wait(
+                    list(self._pending),
+                    timeout=max(next_progress - time.monotonic(), 0),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for future in done:
+                    self._collect(future, queue)
+                if time.monotonic() >= next_progress:
+                    if on_progress is not None:
+                        await on_progress()
+                    next_progress = time.monotonic() + progress_interval
+        finally:
+            if self._pending:
+                self.cancel()
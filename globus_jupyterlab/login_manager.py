@@ -1,18 +1,30 @@
+import collections
+import concurrent.futures
+import hashlib
 import pathlib
-from typing import Union, List
+import threading
+from typing import Callable, Union, List, Optional, Type
 import time
 import logging
 import globus_sdk
-import globus_sdk.tokenstorage
 import globus_sdk.scopes
 import globus_jupyterlab.exc
+from globus_jupyterlab import metrics
+from globus_jupyterlab.token_storage import CachedJSONFileAdapter
 
 log = logging.getLogger(__name__)
 
 
 class LoginManager:
 
-    storage_class = globus_sdk.tokenstorage.SimpleJSONFileAdapter
+    storage_class = CachedJSONFileAdapter
+    # Tokens are revoked on logout with at most this many calls to Globus Auth
+    # at the same time
+    revocation_max_workers = 4
+    revocation_executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=revocation_max_workers,
+        thread_name_prefix="globus-jupyterlab-revoke",
+    )
 
     def __init__(self, client_id: str, storage_path: pathlib.Path):
         self.client_id = client_id
@@ -20,6 +32,16 @@ class LoginManager:
         self.storage_path = storage_path.expanduser()
         self.check_storage_path(self.storage_path)
         self.storage = self.storage_class(str(self.storage_path))
+
+        # Globus clients are cached and re-used between requests, so that each
+        # client's requests session can keep its connections to Globus alive.
+        self.client_cache_hits = 0
+        self.client_cache_misses = 0
+        self._clients = dict()
+        self._clients_lock = threading.RLock()
+        # Updated from the revocation pool threads
+        self.revocation_outcomes = collections.Counter()
+        self._revocation_outcomes_lock = threading.Lock()
         self.churn_tokens()
 
     def check_storage_path(self, path: pathlib.Path):
@@ -30,9 +52,19 @@ class LoginManager:
 
     def store(self, token_response: globus_sdk.OAuthTokenResponse):
         self.storage.store(token_response)
+        self.clear_client_cache()
+
+    def on_refresh(self, token_response: globus_sdk.OAuthTokenResponse):
+        """Called by RefreshTokenAuthorizers when tokens are refreshed. Stores the new
+        tokens, and drops any clients using the old tokens."""
+        self.storage.on_refresh(token_response)
+        for resource_server in token_response.by_resource_server:
+            self.clear_client_cache(resource_server)
 
     def is_logged_in(self) -> bool:
-        self.churn_tokens()
+        """Check for stored tokens. This never contacts Globus Auth, refresh tokens
+        are instead refreshed in the background by the TokenRefresher."""
+        self.purge_expired_tokens()
         return bool(self.storage.get_by_resource_server())
 
     def clear_tokens(self):
@@ -42,6 +74,7 @@ class LoginManager:
             self.storage_path.unlink()
         except FileNotFoundError:
             pass
+        self.clear_client_cache()
 
     def is_valid_token(self, token_data) -> bool:
         expires_at = token_data.get("expires_at_seconds", 0)
@@ -49,6 +82,7 @@ class LoginManager:
             return True
         return False
 
+    @metrics.TOKEN_OPERATION_DURATION.labels("churn").time()
     def churn_tokens(self):
         """Check for expired tokens and remove them from token storage. If tokens
         have a refresh token, refresh it."""
@@ -70,38 +104,222 @@ class LoginManager:
                     self.clear_tokens()
                     return
 
+    @metrics.TOKEN_OPERATION_DURATION.labels("purge_expired").time()
+    def purge_expired_tokens(self):
+        """Remove expired tokens which cannot be refreshed from token storage."""
+        for token_data in self.storage.get_by_resource_server().values():
+            if not token_data.get("refresh_token") and not self.is_valid_token(
+                token_data
+            ):
+                log.info("Tokens have expired, you will need to login again")
+                self.clear_tokens()
+                return
+
+    def get_next_token_expiry(self) -> Optional[int]:
+        """Fetch the earliest time any refreshable access token expires, or None
+        if there are no refresh tokens."""
+        expiry_times = [
+            token_data.get("expires_at_seconds", 0)
+            for token_data in self.storage.get_by_resource_server().values()
+            if token_data.get("refresh_token")
+        ]
+        return min(expiry_times) if expiry_times else None
+
+    @metrics.TOKEN_OPERATION_DURATION.labels("refresh").time()
+    def refresh_tokens(self, expiring_within: float = 0) -> int:
+        """
+        Refresh access tokens which expire within the given number of seconds.
+        New tokens are stored through ``on_refresh``. If Globus Auth rejects a
+        refresh token, all tokens are purged. Returns the number of resource
+        servers refreshed.
+        """
+        refresh_before = time.time() + expiring_within
+        refreshed = 0
+        for (
+            resource_server,
+            token_data,
+        ) in self.storage.get_by_resource_server().items():
+            if not token_data.get("refresh_token"):
+                continue
+            if token_data.get("expires_at_seconds", 0) > refresh_before:
+                continue
+            log.debug(f"Refreshing tokens for {resource_server}")
+            # Without an access token, the authorizer always fetches a new one
+            authorizer = globus_sdk.RefreshTokenAuthorizer(
+                token_data["refresh_token"],
+                self.get_native_client(),
+                on_refresh=self.on_refresh,
+            )
+            try:
+                authorizer.ensure_valid_token()
+            except globus_sdk.AuthAPIError:
+                log.error("Tokens could not be refreshed, purging token store")
+                self.clear_tokens()
+                return refreshed
+            refreshed += 1
+        return refreshed
+
     def get_authorizer(
         self, resource_server: str
     ) -> Union[globus_sdk.AccessTokenAuthorizer, globus_sdk.RefreshTokenAuthorizer]:
         tokens = self.storage.get_token_data(resource_server)
+        return self.build_authorizer(tokens)
+
+    def build_authorizer(
+        self, tokens: dict
+    ) -> Union[globus_sdk.AccessTokenAuthorizer, globus_sdk.RefreshTokenAuthorizer]:
         if tokens.get("refresh_token"):
             return globus_sdk.RefreshTokenAuthorizer(
                 tokens["refresh_token"],
-                globus_sdk.NativeAppAuthClient(self.client_id),
+                self.get_native_client(),
                 access_token=tokens["access_token"],
                 expires_at=tokens["expires_at_seconds"],
-                on_refresh=self.storage.on_refresh,
+                on_refresh=self.on_refresh,
             )
         else:
             return globus_sdk.AccessTokenAuthorizer(tokens["access_token"])
 
+    @staticmethod
+    def get_token_fingerprint(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get_resource_server_fingerprint(self, resource_server: str) -> str:
+        """Fingerprint the current access token for a resource server. Useful for
+        keying cached data so it is only ever served to the user who fetched it."""
+        tokens = self.storage.get_token_data(resource_server)
+        return self.get_token_fingerprint(tokens["access_token"])
+
+    def get_native_client(self) -> globus_sdk.NativeAppAuthClient:
+        """Fetch the cached Native App client used for login, refresh and revocation."""
+        key = (globus_sdk.NativeAppAuthClient, None, None, ())
+        return self._get_cached_client(
+            key, lambda: globus_sdk.NativeAppAuthClient(self.client_id)
+        )
+
+    def get_client(
+        self,
+        resource_server: str,
+        client_class: Type[globus_sdk.BaseClient],
+        **client_kwargs,
+    ) -> globus_sdk.BaseClient:
+        """
+        Fetch a client for a resource server, authorized with the user's current
+        tokens. Clients are keyed by the resource server and a fingerprint of the
+        access token, and are re-used until tokens change. Re-using a client re-uses
+        its requests session, which keeps connections to Globus services alive
+        between calls.
+        """
+        tokens = self.storage.get_token_data(resource_server)
+        key = (
+            client_class,
+            resource_server,
+            self.get_token_fingerprint(tokens["access_token"]),
+            tuple(sorted(client_kwargs.items())),
+        )
+        return self._get_cached_client(
+            key,
+            lambda: client_class(
+                authorizer=self.build_authorizer(tokens), **client_kwargs
+            ),
+        )
+
+    def _get_cached_client(self, key: tuple, build_client: Callable):
+        with self._clients_lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self.client_cache_hits += 1
+                return client
+            self.client_cache_misses += 1
+            # Drop any client of the same kind which was built with older tokens
+            for stale_key in [
+                k
+                for k in self._clients
+                if (k[0], k[1], k[3]) == (key[0], key[1], key[3])
+            ]:
+                del self._clients[stale_key]
+            client = build_client()
+            self._clients[key] = client
+            return client
+
+    def clear_client_cache(self, resource_server: str = None):
+        """Drop cached clients for a resource server, or all cached clients
+        if no resource server is given."""
+        with self._clients_lock:
+            if resource_server is None:
+                self._clients.clear()
+                return
+            for key in [k for k in self._clients if k[1] == resource_server]:
+                del self._clients[key]
+
     def get_token_by_scope(self, scope: str) -> str:
         for data in self.storage.get_by_resource_server().values():
             if data.get("scope") == scope:
                 return data["access_token"]
 
-    def logout(self) -> bool:
-        """Revoke user tokens and clear them from storage. Returns true if tokens were revoked"""
-        tokens_revoked = False
-        client = globus_sdk.NativeAppAuthClient(self.client_id)
-        for resource_server, data in self.storage.get_by_resource_server().items():
-            log.debug(f"Revoking tokens for {resource_server}")
-            tokens_revoked = True
-            client.oauth2_revoke_token(data["access_token"])
-            if data.get("refresh_token"):
-                client.oauth2_revoke_token(data["refresh_token"])
+    def start_logout(self) -> List[concurrent.futures.Future]:
+        """
+        Clear user tokens from storage, then start revoking them. Tokens are revoked
+        at the same time in a small pool. Returns a future for each revocation, so
+        the caller can choose how long to wait. The outcome for each token is logged
+        and counted in ``revocation_outcomes``.
+        """
+        tokens = [
+            (resource_server, token_type, data[token_type])
+            for resource_server, data in self.storage.get_by_resource_server().items()
+            for token_type in ("access_token", "refresh_token")
+            if data.get(token_type)
+        ]
+        client = self.get_native_client()
         self.clear_tokens()
-        return tokens_revoked
+        return [
+            self.revocation_executor.submit(self.revoke_token, client, *token)
+            for token in tokens
+        ]
+
+    def logout(self, timeout: Optional[float] = None) -> bool:
+        """
+        Clear user tokens and revoke them, waiting up to ``timeout`` seconds for the
+        revocations. Any revocations still running are left to finish in the
+        background. Returns true if there were tokens to revoke.
+        """
+        futures = self.start_logout()
+        _, not_done = concurrent.futures.wait(futures, timeout=timeout)
+        self.log_unfinished_revocations(len(not_done), len(futures), timeout)
+        return bool(futures)
+
+    @staticmethod
+    def log_unfinished_revocations(
+        unfinished: int, total: int, timeout: Optional[float]
+    ):
+        if unfinished:
+            log.warning(
+                f"{unfinished} of {total} token revocations did not finish "
+                f"within {timeout} seconds, continuing in the background"
+            )
+
+    def count_revocation(self, outcome: str):
+        with self._revocation_outcomes_lock:
+            self.revocation_outcomes[outcome] += 1
+
+    @metrics.TOKEN_OPERATION_DURATION.labels("revoke").time()
+    def revoke_token(
+        self,
+        client: globus_sdk.NativeAppAuthClient,
+        resource_server: str,
+        token_type: str,
+        token: str,
+    ) -> bool:
+        log.debug(f"Revoking {token_type} for {resource_server}")
+        try:
+            client.oauth2_revoke_token(token)
+        except Exception:
+            log.warning(
+                f"Unable to revoke {token_type} for {resource_server}", exc_info=True
+            )
+            self.count_revocation("failed")
+            return False
+        self.count_revocation("revoked")
+        return True
 
     @staticmethod
     def apply_dependent_scopes(base_scope: str, dependent_scopes: List[str]):
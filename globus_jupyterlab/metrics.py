@@ -0,0 +1,71 @@
+"""
+Prometheus metrics for the Globus JupyterLab server extension, served by the
+/metrics handler. Metrics are kept in their own registry, separate from the
+metrics Jupyter Server itself serves.
+"""
+import functools
+import time
+from typing import Callable
+
+from prometheus_client import CollectorRegistry, Counter, Histogram
+
+REGISTRY = CollectorRegistry(auto_describe=True)
+
+# For work done within a request, which should take milliseconds
+FAST_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1)
+
+REQUEST_DURATION = Histogram(
+    "globus_jupyterlab_request_duration_seconds",
+    "Time to handle requests to each globus-jupyterlab handler",
+    ["handler", "method", "status_code"],
+    registry=REGISTRY,
+)
+GLOBUS_CALL_DURATION = Histogram(
+    "globus_jupyterlab_globus_call_duration_seconds",
+    "Time spent waiting on calls to Globus services",
+    ["service", "method"],
+    registry=REGISTRY,
+)
+GLOBUS_API_ERRORS = Counter(
+    "globus_jupyterlab_globus_api_errors",
+    "Errors from Globus services, by the AuthExceptionHandler which matched them, "
+    'or "unclassified"',
+    ["handler", "exception_handler", "http_status"],
+    registry=REGISTRY,
+)
+TOKEN_OPERATION_DURATION = Histogram(
+    "globus_jupyterlab_token_operation_duration_seconds",
+    "Time spent checking, refreshing and revoking tokens",
+    ["operation"],
+    registry=REGISTRY,
+)
+CONFIG_RESOLUTION_DURATION = Histogram(
+    "globus_jupyterlab_config_resolution_duration_seconds",
+    "Time to fetch settings, either from the cached snapshot or resolved again",
+    ["result"],
+    buckets=FAST_BUCKETS,
+    registry=REGISTRY,
+)
+JSON_SERIALIZATION_DURATION = Histogram(
+    "globus_jupyterlab_json_serialization_duration_seconds",
+    "Time to serialize JSON responses",
+    ["handler"],
+    buckets=FAST_BUCKETS,
+    registry=REGISTRY,
+)
+
+
+def timed_globus_call(service: str, method: str, func: Callable) -> Callable:
+    """Wrap a blocking call to a Globus service, so its duration is recorded where
+    it runs, without any time it spends waiting for a free executor thread."""
+    histogram = GLOBUS_CALL_DURATION.labels(service, method)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - start)
+
+    return wrapper
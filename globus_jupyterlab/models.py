@@ -16,6 +16,27 @@ class TransferModel(BaseModel):
     label: Optional[str]
 
 
+class OperationLSItemModel(BaseModel):
+    endpoint: str
+    path: Optional[str] = None
+    show_hidden: bool = False
+
+
+class ListingFormatEnum(str, Enum):
+    full = "full"
+    compact = "compact"
+
+
+class OperationLSBatchModel(BaseModel):
+    items: List[OperationLSItemModel]
+    refresh: bool = False
+    format: ListingFormatEnum = ListingFormatEnum.full
+
+
+class LocalScanModel(BaseModel):
+    paths: List[str]
+
+
 class StatusEnum(str, Enum):
     success = "success"
     failure = "failure"
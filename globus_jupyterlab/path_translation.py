@@ -0,0 +1,104 @@
+import logging
+import os
+import pathlib
+from typing import Iterable, List, Optional
+
+from globus_jupyterlab.exc import TransferSubmission
+
+log = logging.getLogger(__name__)
+
+
+def is_normalized_posix_path(path: str) -> bool:
+    """True if pathlib would not change the path when parsing it, such as by removing
+    duplicate slashes, '.' components or trailing slashes."""
+    return not (
+        path in ("", ".")
+        or "//" in path
+        or "/./" in path
+        or path.startswith("./")
+        or path.endswith(("/", "/."))
+    )
+
+
+class PathTranslator:
+    """
+    Translate paths JupyterLab sees (POSIX) into paths on the host Globus Collection,
+    according to GLOBUS_HOST_POSIX_BASEPATH and GLOBUS_HOST_COLLECTION_BASEPATH. Base
+    paths are resolved once when the translator is created, so one translator can be
+    re-used for every item in a transfer submission. Translation never touches the
+    filesystem.
+    """
+
+    def __init__(self, host_posix_basepath: str, host_collection_basepath: str):
+        self.host_posix_basepath = host_posix_basepath
+        self.host_collection_basepath = host_collection_basepath
+        self._posix_basepath = (
+            pathlib.PurePath(host_posix_basepath) if host_posix_basepath else None
+        )
+        self._collection_basepath = (
+            pathlib.PurePath(host_collection_basepath)
+            if host_collection_basepath
+            else None
+        )
+        # Most paths are already normalized, and can be translated with plain string
+        # operations which give the same result as pathlib, but much faster.
+        # Unusual base paths always use pathlib.
+        self._posix_prefix = self._get_fast_path_prefix(self._posix_basepath)
+        self._collection_prefix = self._get_fast_path_prefix(self._collection_basepath)
+        self._use_fast_path = (
+            os.sep == "/" and self._posix_prefix != "" and self._collection_prefix != ""
+        )
+
+    @staticmethod
+    def _get_fast_path_prefix(basepath: Optional[pathlib.PurePath]) -> Optional[str]:
+        if basepath is None:
+            return None
+        basepath = str(basepath)
+        return "" if basepath in ("/", ".") else f"{basepath}/"
+
+    def translate(self, path: str) -> str:
+        if self._use_fast_path and is_normalized_posix_path(path):
+            return self._translate_normalized(path)
+        return self._translate_pathlib(path)
+
+    def _translate_normalized(self, path: str) -> str:
+        if self._posix_prefix is not None:
+            if not path.startswith(self._posix_prefix):
+                return self._translate_pathlib(path)
+            path = path[len(self._posix_prefix) :]
+        if self._collection_prefix is not None and not path.startswith("/"):
+            path = self._collection_prefix + path
+        return path
+
+    def _translate_pathlib(self, path: str) -> str:
+        user_transfer_path = pathlib.PurePath(path)
+
+        if self._posix_basepath is not None:
+            try:
+                user_transfer_path = user_transfer_path.relative_to(
+                    self._posix_basepath
+                )
+            except ValueError:
+                raise TransferSubmission(
+                    f"Path {user_transfer_path} is not in the subpath of {self.host_posix_basepath}, and is inaccessible via the configured Globus Collection. Consider moving {user_transfer_path} into {self.host_posix_basepath} first."
+                ) from None
+
+        if self._collection_basepath is not None:
+            user_transfer_path = self._collection_basepath / user_transfer_path
+
+        return str(user_transfer_path)
+
+
+def find_missing_paths(paths: Iterable[str], limit: int = None) -> List[str]:
+    """
+    Check local paths exist, and return any which do not. Stops after finding
+    `limit` missing paths. This stats every path, which can be slow on network
+    filesystems, so it should be run off the IOLoop.
+    """
+    missing = []
+    for path in paths:
+        if not os.path.exists(path):
+            missing.append(path)
+            if limit is not None and len(missing) >= limit:
+                break
+    return missing
@@ -0,0 +1,102 @@
+import logging
+import threading
+import uuid
+from typing import Optional
+
+import requests
+import requests.adapters
+from urllib3.util.retry import Retry
+
+from globus_jupyterlab.globus_config import GlobusConfig
+
+log = logging.getLogger(__name__)
+
+
+class TransferSubmissionClient:
+    """
+    Submit transfers to a custom service set with GLOBUS_TRANSFER_SUBMISSION_URL.
+
+    Submissions share one requests session, so connections to the service are kept
+    alive between submissions. Each submission is sent with an Idempotency-Key
+    header. Submissions which fail to connect, time out, or get a 5xx response are
+    retried with the same key, so a service which honors the key can't submit the
+    same transfer twice. Retries back off exponentially from ``backoff_factor``
+    seconds, or wait as long as a Retry-After header says to.
+
+    Submitting is blocking, and should be run in an executor.
+    """
+
+    retry_statuses = (500, 502, 503, 504)
+    backoff_factor = 0.5
+
+    def __init__(self, gconfig: GlobusConfig):
+        self.gconfig = gconfig
+        self._lock = threading.Lock()
+        self._session = None
+        self._session_settings = None
+
+    def build_session(self, retries: int, pool_maxsize: int) -> requests.Session:
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            status_forcelist=self.retry_statuses,
+            allowed_methods=frozenset(["POST"]),
+            backoff_factor=self.backoff_factor,
+            # The final 5xx response is returned, and raised by the caller
+            raise_on_status=False,
+        )
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_maxsize, max_retries=retry
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def get_session(self) -> requests.Session:
+        """Fetch the shared session, built again if settings have been reloaded"""
+        config = self.gconfig.get_snapshot()
+        settings = (config.transfer_submission_retries, config.sdk_max_workers)
+        with self._lock:
+            if self._session is None or self._session_settings != settings:
+                if self._session is not None:
+                    self._session.close()
+                self._session = self.build_session(*settings)
+                self._session_settings = settings
+            return self._session
+
+    def submit(
+        self,
+        url: str,
+        auth_token: str,
+        payload: dict,
+        idempotency_key: Optional[str] = None,
+        headers: Optional[dict] = None,
+    ) -> requests.Response:
+        """POST a submission, retrying if needed. Extra headers, such as a trace
+        header, are sent as well. Raises requests' ConnectionError or Timeout if the
+        service could not be reached after all retries."""
+        config = self.gconfig.get_snapshot()
+        headers = {
+            **(headers or {}),
+            "Authorization": f"Bearer {auth_token}",
+            "Idempotency-Key": idempotency_key or str(uuid.uuid4()),
+        }
+        log.debug(f"Submitting with Idempotency-Key {headers['Idempotency-Key']}")
+        return self.get_session().post(
+            url,
+            headers=headers,
+            json=payload,
+            timeout=(
+                config.transfer_submission_connect_timeout,
+                config.transfer_submission_read_timeout,
+            ),
+        )
+
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+            self._session = None
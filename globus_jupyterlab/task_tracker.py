@@ -0,0 +1,220 @@
+import collections
+import datetime
+import logging
+import time
+from concurrent.futures import Executor
+from typing import Iterable, List, Optional
+
+import globus_sdk
+import tornado.gen
+import tornado.ioloop
+import tornado.locks
+
+from globus_jupyterlab import metrics
+from globus_jupyterlab.globus_config import GlobusConfig
+from globus_jupyterlab.login_manager import LoginManager
+
+log = logging.getLogger(__name__)
+
+
+class TaskTracker:
+    """
+    Track the status of Transfer tasks submitted through JupyterLab.
+
+    A single poller on the IOLoop looks up every task due for a check with one
+    ``task_list`` call filtered by task ID, instead of one ``get_task`` call per task.
+    New tasks are checked every GLOBUS_TASK_POLL_MIN_INTERVAL seconds. The interval
+    grows as a task ages, up to GLOBUS_TASK_POLL_MAX_INTERVAL seconds, since long
+    running tasks rarely change status quickly. Tasks are no longer checked once they
+    succeed or fail.
+
+    Each change to a task bumps ``version``, and wakes anyone waiting in
+    ``wait_for_update()``. The Jupyter server runs for a single user, so tasks are
+    tracked until the user logs out.
+    """
+
+    resource_server = "transfer.api.globus.org"
+    terminal_statuses = ("SUCCEEDED", "FAILED")
+    # Fields copied from Transfer task documents
+    task_fields = (
+        "status",
+        "nice_status",
+        "label",
+        "source_endpoint_id",
+        "destination_endpoint_id",
+        "request_time",
+        "completion_time",
+        "files",
+        "files_transferred",
+        "bytes_transferred",
+        "faults",
+    )
+    # Most tasks looked up with a single task_list call
+    batch_size = 100
+    # Most tasks tracked. The oldest finished tasks are dropped first.
+    max_tasks = 100
+
+    def __init__(
+        self, login_manager: LoginManager, gconfig: GlobusConfig, executor: Executor
+    ):
+        self.login_manager = login_manager
+        self.gconfig = gconfig
+        self.executor = executor
+        self.version = 0
+        self._tasks = collections.OrderedDict()
+        self._updated = tornado.locks.Condition()
+        self._wake_poller = tornado.locks.Event()
+        self._running = False
+
+    def start(self):
+        if not self._running:
+            self._running = True
+            tornado.ioloop.IOLoop.current().spawn_callback(self.poll)
+
+    def stop(self):
+        self._running = False
+        self._wake_poller.set()
+
+    def track(self, task_ids: Iterable[str], label: Optional[str] = None):
+        """Start tracking newly submitted tasks"""
+        now = time.time()
+        for task_id in task_ids:
+            if task_id is None or task_id in self._tasks:
+                continue
+            self._tasks[task_id] = {
+                "task_id": task_id,
+                "status": "ACTIVE",
+                "label": label,
+                "submitted_at": now,
+                "next_check": now + self.get_poll_interval(0),
+                "version": self.version + 1,
+            }
+        self._drop_old_tasks()
+        self._notify()
+        self.start()
+        self._wake_poller.set()
+
+    def clear(self):
+        self._tasks.clear()
+        self._notify()
+
+    def get_tasks(self, since: int = 0) -> List[dict]:
+        """Fetch tracked tasks updated after version ``since``, newest first"""
+        return [
+            self.serialize(task)
+            for task in reversed(self._tasks.values())
+            if task["version"] > since
+        ]
+
+    @staticmethod
+    def serialize(task: dict) -> dict:
+        return {k: v for k, v in task.items() if k != "next_check"}
+
+    async def wait_for_update(self, since: int, timeout: float) -> bool:
+        """Wait for any task to be updated after version ``since``. Returns False if
+        nothing changed before the timeout."""
+        if self.version == since:
+            await self._updated.wait(timeout=datetime.timedelta(seconds=timeout))
+        return self.version != since
+
+    def get_poll_interval(self, age: float) -> float:
+        config = self.gconfig.get_snapshot()
+        return min(
+            max(age / 10, config.task_poll_min_interval), config.task_poll_max_interval
+        )
+
+    def get_due_tasks(self, now: float) -> List[str]:
+        return [
+            task_id
+            for task_id, task in self._tasks.items()
+            if task["status"] not in self.terminal_statuses
+            and task["next_check"] <= now
+        ]
+
+    def get_next_check(self) -> Optional[float]:
+        checks = [
+            task["next_check"]
+            for task in self._tasks.values()
+            if task["status"] not in self.terminal_statuses
+        ]
+        return min(checks) if checks else None
+
+    async def poll(self):
+        """Check due tasks until stopped. Sleeps until the next task is due, or until
+        new tasks are tracked."""
+        while self._running:
+            self._wake_poller.clear()
+            now = time.time()
+            due = self.get_due_tasks(now)
+            for start in range(0, len(due), self.batch_size):
+                await self.check_tasks(due[start : start + self.batch_size])
+            next_check = self.get_next_check()
+            try:
+                if next_check is None:
+                    await self._wake_poller.wait()
+                elif next_check > time.time():
+                    await self._wake_poller.wait(
+                        timeout=datetime.timedelta(seconds=next_check - time.time())
+                    )
+            except tornado.gen.TimeoutError:
+                pass
+
+    async def check_tasks(self, task_ids: List[str]):
+        try:
+            task_docs = await tornado.ioloop.IOLoop.current().run_in_executor(
+                self.executor, self.fetch_tasks, task_ids
+            )
+        except (globus_sdk.GlobusError, LookupError):
+            # Also raised if the user is not logged in with Transfer. Try later.
+            log.warning("Unable to check Transfer task status", exc_info=True)
+            task_docs = []
+        except Exception:
+            log.error("Unexpected error checking Transfer task status", exc_info=True)
+            task_docs = []
+
+        now = time.time()
+        task_docs = {doc["task_id"]: doc for doc in task_docs}
+        changed = False
+        for task_id in task_ids:
+            task = self._tasks.get(task_id)
+            if task is None:
+                # Dropped while the lookup was running
+                continue
+            task["next_check"] = now + self.get_poll_interval(
+                now - task["submitted_at"]
+            )
+            doc = task_docs.get(task_id)
+            if doc is None:
+                continue
+            update = {k: doc[k] for k in self.task_fields if k in doc}
+            if any(task.get(k) != v for k, v in update.items()):
+                task.update(update)
+                task["version"] = self.version + 1
+                changed = True
+        if changed:
+            self._notify()
+
+    def fetch_tasks(self, task_ids: List[str]) -> List[dict]:
+        """Look up tasks with a single Transfer call. This is blocking."""
+        tc = self.login_manager.get_client(
+            self.resource_server, globus_sdk.TransferClient
+        )
+        task_list = metrics.timed_globus_call("transfer", "task_list", tc.task_list)
+        response = task_list(
+            filter=f"task_id:{','.join(task_ids)}", limit=len(task_ids)
+        )
+        return response.data["DATA"]
+
+    def _drop_old_tasks(self):
+        while len(self._tasks) > self.max_tasks:
+            finished = [
+                task_id
+                for task_id, task in self._tasks.items()
+                if task["status"] in self.terminal_statuses
+            ]
+            task_id = finished[0] if finished else next(iter(self._tasks))
+            del self._tasks[task_id]
+
+    def _notify(self):
+        self.version += 1
+        self._updated.notify_all()
@@ -0,0 +1,135 @@
+import json
+import threading
+
+import pytest
+import tornado.gen
+import tornado.simple_httpclient
+from globus_jupyterlab import local_scan
+from globus_jupyterlab.handlers.api.local_scan import LocalScan
+from globus_jupyterlab.local_scan import DirectoryScan
+
+
+@pytest.fixture
+def local_tree(tmp_path, monkeypatch):
+    (tmp_path / "data" / "nested").mkdir(parents=True)
+    (tmp_path / "data" / "one.txt").write_bytes(b"1")
+    (tmp_path / "data" / "nested" / "two.txt").write_bytes(b"22")
+    monkeypatch.setenv("GLOBUS_COLLECTION_PATH", str(tmp_path))
+    return tmp_path
+
+
+def parse_lines(body: bytes) -> list:
+    return [json.loads(line) for line in body.decode().splitlines()]
+
+
+@pytest.mark.gen_test
+def test_local_scan(http_client, base_url, local_tree, monkeypatch):
+    monkeypatch.setenv("GLOBUS_HOST_POSIX_BASEPATH", str(local_tree))
+    monkeypatch.setenv("GLOBUS_HOST_COLLECTION_BASEPATH", "/collection")
+    body = json.dumps({"paths": ["data", str(local_tree / "missing.txt")]})
+    response = yield http_client.fetch(
+        base_url + "/local_scan", method="POST", body=body
+    )
+    assert response.headers["Content-Type"] == "application/x-ndjson"
+    lines = parse_lines(response.body)
+    assert lines[0]["type"] == "start"
+    assert lines[0]["paths"] == [
+        {"path": str(local_tree / "data"), "collection_path": "/collection/data"},
+        {
+            "path": str(local_tree / "missing.txt"),
+            "collection_path": "/collection/missing.txt",
+        },
+    ]
+    complete = lines[-1]
+    assert complete["type"] == "complete"
+    assert (complete["files"], complete["directories"], complete["bytes"]) == (
+        2,
+        2,
+        3,
+    )
+    assert [(p["collection_path"], p["exists"]) for p in complete["paths"]] == [
+        ("/collection/data", True),
+        ("/collection/missing.txt", False),
+    ]
+    assert LocalScan.scans == {}
+
+
+@pytest.mark.gen_test
+def test_local_scan_outside_posix_basepath(
+    http_client, base_url, local_tree, monkeypatch
+):
+    monkeypatch.setenv("GLOBUS_HOST_POSIX_BASEPATH", str(local_tree / "data"))
+    body = json.dumps({"paths": ["data/../.."]})
+    response = yield http_client.fetch(
+        base_url + "/local_scan", method="POST", body=body, raise_error=False
+    )
+    assert response.code == 400
+    assert json.loads(response.body)["code"] == "InvalidInput"
+
+
+@pytest.mark.gen_test
+@pytest.mark.parametrize("body", ["not json", '{"paths": "data"}', "{}"])
+def test_local_scan_invalid_input(http_client, base_url, local_tree, body):
+    response = yield http_client.fetch(
+        base_url + "/local_scan", method="POST", body=body, raise_error=False
+    )
+    assert response.code == 400
+    assert json.loads(response.body)["code"] == "InvalidInput"
+
+
+@pytest.mark.gen_test(timeout=10)
+def test_local_scan_cancel(http_client, base_url, local_tree, monkeypatch):
+    def wait_for_cancel(path: str, cancelled: threading.Event):
+        cancelled.wait(5)
+        return DirectoryScan()
+
+    monkeypatch.setattr(local_scan, "scan_selected_path", wait_for_cancel)
+    chunks = []
+    scanning = http_client.fetch(
+        base_url + "/local_scan",
+        method="POST",
+        body=json.dumps({"paths": ["data"]}),
+        streaming_callback=chunks.append,
+    )
+    while not chunks:
+        yield tornado.gen.sleep(0.01)
+    scan_id = json.loads(chunks[0])["scan_id"]
+    response = yield http_client.fetch(
+        f"{base_url}/local_scan?scan_id={scan_id}", method="DELETE"
+    )
+    assert response.code == 204
+    yield scanning
+    assert parse_lines(b"".join(chunks))[-1]["type"] == "cancelled"
+    assert LocalScan.scans == {}
+
+
+@pytest.mark.gen_test(timeout=10)
+def test_local_scan_cancelled_on_disconnect(
+    http_client, base_url, local_tree, monkeypatch
+):
+    events = []
+
+    def wait_for_cancel(path: str, cancelled: threading.Event):
+        events.append(cancelled)
+        cancelled.wait(5)
+        return DirectoryScan()
+
+    monkeypatch.setattr(local_scan, "scan_selected_path", wait_for_cancel)
+    with pytest.raises(tornado.simple_httpclient.HTTPTimeoutError):
+        yield http_client.fetch(
+            base_url + "/local_scan",
+            method="POST",
+            body=json.dumps({"paths": ["data"]}),
+            request_timeout=0.2,
+        )
+    while LocalScan.scans:
+        yield tornado.gen.sleep(0.01)
+    assert events[0].is_set()
+
+
+@pytest.mark.gen_test
+def test_local_scan_cancel_unknown(http_client, base_url):
+    response = yield http_client.fetch(
+        f"{base_url}/local_scan?scan_id=unknown", method="DELETE", raise_error=False
+    )
+    assert response.code == 404
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+import tornado.gen
+from globus_jupyterlab.handlers.base import BaseAPIHandler
+
+
+@pytest.fixture
+def task_tracker(app, monkeypatch):
+    tracker = BaseAPIHandler.task_tracker
+    # Status checks are covered by the task tracker tests
+    monkeypatch.setattr(tracker, "start", lambda: None)
+    return tracker
+
+
+@pytest.mark.gen_test
+def test_submitted_transfers_are_tracked(
+    http_client,
+    base_url,
+    transfer_client,
+    transfer_data,
+    task_tracker,
+    monkeypatch,
+    logged_in,
+):
+    monkeypatch.setenv("GLOBUS_COLLECTION_ID", "mysource")
+    transfer_client.submit_transfer.return_value.data = {"task_id": "my_task_id"}
+    body = json.dumps(
+        {
+            "source_endpoint": "mysource",
+            "destination_endpoint": "mydest",
+            "DATA": [],
+            "label": "my transfer",
+        }
+    )
+    yield http_client.fetch(base_url + "/submit_transfer", method="POST", body=body)
+
+    response = yield http_client.fetch(base_url + "/tasks")
+    data = json.loads(response.body)
+    assert data["version"] == task_tracker.version
+    assert [(t["task_id"], t["label"]) for t in data["DATA"]] == [
+        ("my_task_id", "my transfer")
+    ]
+
+
+@pytest.mark.gen_test
+def test_task_updates_timeout(http_client, base_url, task_tracker):
+    task_tracker.track(["task1"])
+    version = task_tracker.version
+    response = yield http_client.fetch(
+        f"{base_url}/tasks/updates?since={version}&timeout=0.05"
+    )
+    assert json.loads(response.body) == {"version": version, "DATA": []}
+
+
+@pytest.mark.gen_test(timeout=10)
+def test_task_updates_wakes_on_change(http_client, base_url, task_tracker):
+    version = task_tracker.version
+    waiting = http_client.fetch(f"{base_url}/tasks/updates?since={version}")
+    yield tornado.gen.sleep(0.05)
+    assert not waiting.done()
+    task_tracker.track(["task1"])
+    data = json.loads((yield waiting).body)
+    assert [t["task_id"] for t in data["DATA"]] == ["task1"]
+
+
+@pytest.mark.gen_test
+def test_task_updates_invalid_since(http_client, base_url, task_tracker):
+    response = yield http_client.fetch(
+        f"{base_url}/tasks/updates?since=foo", raise_error=False
+    )
+    assert response.code == 400
+
+
+@pytest.mark.gen_test
+def test_logout_clears_tasks(http_client, base_url, task_tracker, native_client):
+    task_tracker.track(["task1"])
+    yield http_client.fetch(base_url + "/logout")
+    assert task_tracker.get_tasks() == []
@@ -0,0 +1,89 @@
+import asyncio
+import copy
+import threading
+from unittest.mock import Mock
+
+import pytest
+import requests
+import tornado.httpserver
+import tornado.ioloop
+import tornado.netutil
+import tornado.web
+
+from globus_jupyterlab.endpoint_metadata import EndpointMetadataCache
+from globus_jupyterlab.handlers import HANDLER_MODULES, get_handlers, setup_compression
+from globus_jupyterlab.handlers.api.transfer import OperationLS
+from globus_jupyterlab.handlers.base import BaseAPIHandler
+from globus_jupyterlab.task_tracker import TaskTracker
+from globus_jupyterlab.tests.integration.stub_globus_service import serve_in_thread
+from globus_jupyterlab.tests.mocks import MOCK_TOKENS
+from globus_jupyterlab.token_storage import CachedJSONFileAdapter
+
+
+@pytest.fixture
+def stub_transfer(monkeypatch):
+    """Run the stub Globus service, and point the Globus SDK at it"""
+    with serve_in_thread() as stub:
+        for name, value in stub.get_environment().items():
+            monkeypatch.setenv(name, value)
+        yield stub
+
+
+@pytest.fixture
+def extension_server(monkeypatch, tmp_path, stub_transfer):
+    """
+    Serve the extension's handlers from a thread, logged in with mock tokens, and
+    return its URL. Calls to Transfer go to the stub Globus service, through
+    real Globus SDK clients.
+    """
+    storage = CachedJSONFileAdapter(str(tmp_path / "tokens.json"))
+    storage.store(Mock(by_resource_server=copy.deepcopy(MOCK_TOKENS)))
+    login_manager = BaseAPIHandler.login_manager
+    monkeypatch.setattr(login_manager, "storage", storage)
+    monkeypatch.setenv("GLOBUS_COLLECTION_ID", "local_collection")
+    monkeypatch.setenv("GLOBUS_CHECK_LOCAL_PATHS", "false")
+    BaseAPIHandler.gconfig.reload()
+    login_manager.clear_client_cache()
+    OperationLS.listing_cache.clear()
+    monkeypatch.setattr(
+        BaseAPIHandler,
+        "endpoint_metadata",
+        EndpointMetadataCache(str(tmp_path / "endpoints.json"), ttl=86400),
+    )
+    monkeypatch.setattr(
+        BaseAPIHandler,
+        "task_tracker",
+        TaskTracker(login_manager, BaseAPIHandler.gconfig, BaseAPIHandler.sdk_executor),
+    )
+
+    sockets = tornado.netutil.bind_sockets(0, "127.0.0.1")
+    port = sockets[0].getsockname()[1]
+    started = threading.Event()
+    loop = asyncio.new_event_loop()
+
+    def serve():
+        asyncio.set_event_loop(loop)
+        app = tornado.web.Application(get_handlers(HANDLER_MODULES, "/", ""))
+        setup_compression(app, "/", "")
+        server = tornado.httpserver.HTTPServer(app)
+        server.add_sockets(sockets)
+        loop.call_soon(started.set)
+        loop.run_forever()
+        server.stop()
+        BaseAPIHandler.task_tracker.stop()
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    started.wait()
+    yield f"http://127.0.0.1:{port}"
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    login_manager.clear_client_cache()
+
+
+@pytest.fixture
+def session():
+    with requests.Session() as session:
+        yield session
@@ -0,0 +1,53 @@
+"""
+Cost of classifying errors from Globus services into login handlers, over the
+recorded error payloads in tests/mocks.py. Compare the compiled classifier, which
+parses each error once, with checking each handler in turn and parsing the error
+for every handler, as each handler instance used to:
+
+    pytest globus_jupyterlab/tests/benchmarks --benchmark-enable -k classify_error
+"""
+import pytest
+
+from globus_jupyterlab.handlers import exception_handlers
+from globus_jupyterlab.handlers.auth import GCSAuthMixin
+from globus_jupyterlab.tests.mocks import (
+    MockGlobusAPIError,
+    GRIDFTP_HA_NOT_FROM_ALLOWED_DOMAIN,
+    GRIDFTP_S3_CREDENTIALS_REQUIRED_MESSAGE,
+    GRIDFTP_UNEXPECTED_MESSAGE,
+)
+
+LOGIN_FAILED = "ExternalError.DirListingFailed.LoginFailed"
+ERROR_CORPUS = [
+    MockGlobusAPIError("No token", 401),
+    MockGlobusAPIError("Activate", 400, "ClientError.ActivationRequired"),
+    MockGlobusAPIError("Consent!", 403, "ConsentRequired"),
+    MockGlobusAPIError(GRIDFTP_HA_NOT_FROM_ALLOWED_DOMAIN, 502, LOGIN_FAILED),
+    MockGlobusAPIError(GRIDFTP_S3_CREDENTIALS_REQUIRED_MESSAGE, 502, LOGIN_FAILED),
+    MockGlobusAPIError(GRIDFTP_UNEXPECTED_MESSAGE, 502, LOGIN_FAILED),
+    MockGlobusAPIError("Not found", 404, "ClientError.NotFound"),
+]
+
+
+def classify_per_handler(login_checks, exception):
+    """Baseline, parsing the error again for every handler checked"""
+    for cls in login_checks:
+        instance = cls(exception)
+        if instance.check():
+            return instance
+
+
+@pytest.mark.benchmark(group="exception_handlers")
+def test_classify_error_corpus(benchmark):
+    classifier = exception_handlers.get_classifier(tuple(GCSAuthMixin.login_checks))
+    handlers = benchmark(lambda: [classifier.classify(e) for e in ERROR_CORPUS])
+    assert handlers[-1] is None
+
+
+@pytest.mark.benchmark(group="exception_handlers")
+def test_classify_error_corpus_per_handler(benchmark):
+    login_checks = GCSAuthMixin.login_checks
+    handlers = benchmark(
+        lambda: [classify_per_handler(login_checks, e) for e in ERROR_CORPUS]
+    )
+    assert handlers[-1] is None
@@ -0,0 +1,67 @@
+"""
+End to end cost of the extension's busiest API requests. Requests are made over HTTP
+to the extension's handlers, which call the local stub Globus service through real
+Globus SDK clients:
+
+    pytest globus_jupyterlab/tests/benchmarks --benchmark-enable -k handlers
+
+Save results with --benchmark-autosave, and compare against earlier saved runs with
+--benchmark-compare. See the "Benchmarks" section in the README.
+"""
+import json
+
+import pytest
+
+LISTING_SIZES = [10, 1000, 10000, 100000]
+TRANSFER_SIZES = [1, 1000, 10000, 100000]
+
+
+def build_transfer(items: int) -> bytes:
+    return json.dumps(
+        {
+            "source_endpoint": "local_collection",
+            "destination_endpoint": "remote_collection",
+            "DATA": [
+                {
+                    "source_path": f"/home/jovyan/file{i}.txt",
+                    "destination_path": f"/~/file{i}.txt",
+                    "recursive": False,
+                }
+                for i in range(items)
+            ],
+            "label": "Benchmark Transfer",
+        }
+    ).encode()
+
+
+@pytest.mark.benchmark(group="handlers_config")
+def test_config_get(benchmark, extension_server, session):
+    def get_config():
+        return session.get(f"{extension_server}/config")
+
+    response = benchmark(get_config)
+    assert response.status_code == 200
+    assert response.json()["is_logged_in"] is True
+
+
+@pytest.mark.benchmark(group="handlers_operation_ls")
+@pytest.mark.parametrize("listing_format", ["full", "compact"])
+@pytest.mark.parametrize("size", LISTING_SIZES)
+def test_operation_ls(benchmark, extension_server, session, size, listing_format):
+    url = (
+        f"{extension_server}/operation_ls?endpoint=remote_collection"
+        f"&path=/~/{size}/&format={listing_format}&refresh=true"
+    )
+    response = benchmark(session.get, url)
+    assert response.status_code == 200
+    data = response.json()["DATA"]
+    assert len(data if listing_format == "full" else data["name"]) == size
+
+
+@pytest.mark.benchmark(group="handlers_submit_transfer")
+@pytest.mark.parametrize("items", TRANSFER_SIZES)
+def test_submit_transfer(benchmark, extension_server, session, items):
+    body = build_transfer(items)
+    response = benchmark(session.post, f"{extension_server}/submit_transfer", body)
+    assert response.status_code == 200
+    assert response.json()["task_id"]
@@ -0,0 +1,84 @@
+"""
+Cost of translating the paths of a very large transfer submission:
+
+    pytest globus_jupyterlab/tests/benchmarks --benchmark-enable -k path_translation
+"""
+import json
+
+import pytest
+from globus_jupyterlab.models import TransferModel
+from globus_jupyterlab.path_translation import PathTranslator, find_missing_paths
+from globus_jupyterlab.transfer_document import TransferDocument
+
+NUM_ITEMS = 100000
+
+
+@pytest.fixture
+def local_paths():
+    return [
+        f"/home/jovyan/data/run{num // 1000}/file{num}.h5" for num in range(NUM_ITEMS)
+    ]
+
+
+@pytest.mark.benchmark(group="path_translation")
+def test_translate_100k_paths(benchmark, local_paths):
+    translator = PathTranslator("/home/jovyan", "/shared")
+    translated = benchmark(lambda: [translator.translate(p) for p in local_paths])
+    assert translated[-1] == f"/shared/data/run99/file{NUM_ITEMS - 1}.h5"
+
+
+@pytest.mark.benchmark(group="path_translation")
+def test_translate_100k_paths_pathlib(benchmark, local_paths):
+    """Baseline, translating every path through pathlib"""
+    translator = PathTranslator("/home/jovyan", "/shared")
+    benchmark(lambda: [translator._translate_pathlib(p) for p in local_paths])
+
+
+@pytest.fixture
+def submission_body(local_paths):
+    return json.dumps(
+        {
+            "source_endpoint": "host_collection",
+            "destination_endpoint": "user_collection",
+            "DATA": [
+                {"source_path": p, "destination_path": p, "recursive": False}
+                for p in local_paths
+            ],
+        }
+    )
+
+
+@pytest.mark.benchmark(group="path_translation")
+def test_translate_100k_item_submission(benchmark, submission_body):
+    """Validate and translate a full transfer document, as SubmitTransfer does"""
+    translator = PathTranslator("/home/jovyan", "/shared")
+
+    def translate_submission():
+        document = TransferDocument.from_json(submission_body)
+        return [
+            item._replace(source_path=translator.translate(item.source_path))
+            for item in document.iter_items()
+        ]
+
+    assert benchmark(translate_submission)[0].source_path.startswith("/shared")
+
+
+@pytest.mark.benchmark(group="path_translation")
+def test_translate_100k_item_submission_pydantic(benchmark, submission_body):
+    """Baseline, validating the whole document with pydantic before translating"""
+    translator = PathTranslator("/home/jovyan", "/shared")
+
+    def translate_submission():
+        tm = TransferModel(**json.loads(submission_body))
+        for item in tm.DATA:
+            item.source_path = translator.translate(item.source_path)
+        return tm
+
+    assert benchmark(translate_submission).DATA[0].source_path.startswith("/shared")
+
+
+@pytest.mark.benchmark(group="path_translation")
+def test_check_100k_missing_paths(benchmark, local_paths):
+    """The optional existence check, which is run off the IOLoop"""
+    missing = benchmark(find_missing_paths, local_paths)
+    assert len(missing) == NUM_ITEMS
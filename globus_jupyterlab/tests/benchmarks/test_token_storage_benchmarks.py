@@ -0,0 +1,45 @@
+"""
+Per-request cost of token lookups. `LoginManager.is_logged_in()` is called on every
+API request and every /config poll. Compare the SDK JSON file adapter, which re-reads
+the token file for every lookup, with the in-memory CachedJSONFileAdapter, and see
+how the cost grows with the number of resource servers the user has tokens for:
+
+    pytest globus_jupyterlab/tests/benchmarks --benchmark-enable -k token_storage
+"""
+import copy
+from unittest.mock import Mock
+import pytest
+from globus_sdk.tokenstorage import SimpleJSONFileAdapter
+from globus_jupyterlab.login_manager import LoginManager
+from globus_jupyterlab.token_storage import CachedJSONFileAdapter
+from globus_jupyterlab.tests.mocks import MOCK_TOKENS
+
+
+@pytest.mark.benchmark(group="token_storage")
+@pytest.mark.parametrize(
+    "storage_class", [SimpleJSONFileAdapter, CachedJSONFileAdapter]
+)
+def test_is_logged_in(benchmark, storage_class, tmp_path, monkeypatch):
+    token_file = tmp_path / "tokens.json"
+    storage_class(str(token_file)).store(
+        Mock(by_resource_server=copy.deepcopy(MOCK_TOKENS))
+    )
+    monkeypatch.setattr(LoginManager, "storage_class", storage_class)
+    login_manager = LoginManager("client_id", token_file)
+    assert benchmark(login_manager.is_logged_in) is True
+
+
+@pytest.mark.benchmark(group="token_storage_resource_servers")
+@pytest.mark.parametrize("resource_servers", [1, 10, 100, 1000])
+def test_is_logged_in_resource_servers(benchmark, resource_servers, tmp_path):
+    token_file = tmp_path / "tokens.json"
+    tokens = {
+        f"resource_server_{i}": dict(
+            MOCK_TOKENS["transfer.api.globus.org"],
+            resource_server=f"resource_server_{i}",
+        )
+        for i in range(resource_servers)
+    }
+    CachedJSONFileAdapter(str(token_file)).store(Mock(by_resource_server=tokens))
+    login_manager = LoginManager("client_id", token_file)
+    assert benchmark(login_manager.is_logged_in) is True
@@ -9,8 +9,9 @@ import base64
 import pickle
 import tornado.web
 
-from globus_jupyterlab.handlers import get_handlers, HANDLER_MODULES
+from globus_jupyterlab.handlers import get_handlers, setup_compression, HANDLER_MODULES
 from globus_jupyterlab.handlers.base import BaseAPIHandler
+from globus_jupyterlab.handlers.api.transfer import EndpointSearch, OperationLS
 from globus_jupyterlab.tests.mocks import (
     MockGlobusAPIError,
     MOCK_TOKENS,
@@ -18,16 +19,45 @@ from globus_jupyterlab.tests.mocks import (
     SDKResponse,
     two_days_from_now_seconds,
 )
+from globus_jupyterlab.endpoint_metadata import EndpointMetadataCache
+from globus_jupyterlab.identity_cache import IdentitySetCache
 from globus_jupyterlab.login_manager import LoginManager
+from globus_jupyterlab.task_tracker import TaskTracker
 from globus_jupyterlab.globus_config import GlobusConfig
 
 
 @pytest.fixture
-def app(token_storage, monkeypatch):
+def app(token_storage, monkeypatch, tmp_path):
     monkeypatch.setattr(
         BaseAPIHandler.login_manager, "storage", token_storage("filename")
     )
+    # Settings are resolved lazily on the first request, after tests set the env
+    BaseAPIHandler.gconfig._snapshot = None
+    OperationLS.listing_cache.clear()
+    EndpointSearch.search_cache.clear()
+    monkeypatch.setattr(BaseAPIHandler.token_refresher, "_jitter", None)
+    monkeypatch.setattr(
+        BaseAPIHandler,
+        "endpoint_metadata",
+        EndpointMetadataCache(str(tmp_path / "endpoints.json"), ttl=86400),
+    )
+    monkeypatch.setattr(
+        BaseAPIHandler,
+        "identity_cache",
+        IdentitySetCache(BaseAPIHandler.login_manager),
+    )
+    # Tasks are tracked on the IOLoop, which is new for each test
+    monkeypatch.setattr(
+        BaseAPIHandler,
+        "task_tracker",
+        TaskTracker(
+            BaseAPIHandler.login_manager,
+            BaseAPIHandler.gconfig,
+            BaseAPIHandler.sdk_executor,
+        ),
+    )
     application = tornado.web.Application(get_handlers(HANDLER_MODULES, "/", ""))
+    setup_compression(application, "/", "")
     return application
 
 
@@ -72,7 +102,7 @@ def logged_in_custom_transfer_service(monkeypatch, logged_in) -> SimpleJSONFileA
 
 @pytest.fixture
 def post_request(monkeypatch):
-    "Mock the requests.post function, return the mock"
+    "Mock posting with a requests session, return the mock"
 
     class MockedPostResponse:
         data = {}
@@ -88,7 +118,7 @@ def post_request(monkeypatch):
             return self.data
 
     post = Mock(return_value=MockedPostResponse())
-    monkeypatch.setattr(requests, "post", post)
+    monkeypatch.setattr(requests.Session, "post", post)
     return post
 
 
@@ -0,0 +1,410 @@
+"""
+Run concurrent simulated users against a real Jupyter server with the Globus
+JupyterLab extension loaded, and report latency for each kind of request.
+
+By default, the driver starts the stub Globus service and a Jupyter server which is
+already logged in with tokens the stub accepts, so no Globus account is needed:
+
+python -m globus_jupyterlab.tests.integration.load_driver --users 20 --duration 30
+
+Latency and errors can be injected into the stub, for example:
+
+python -m globus_jupyterlab.tests.integration.load_driver --users 20 \
+    --latency 0.1 --latency-jitter 0.1 --consent-required-rate 0.02
+
+To drive a server which is already running, pass its URL and token. That server is
+responsible for pointing the Globus SDK at a stub, or at Globus:
+
+python -m globus_jupyterlab.tests.integration.load_driver \
+    --server-url http://127.0.0.1:8888 --token my-jupyter-token
+"""
+import argparse
+import asyncio
+import collections
+import contextlib
+import json
+import logging
+import os
+import pathlib
+import random
+import secrets
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import tornado.httpclient
+
+from globus_jupyterlab.tests.integration.stub_globus_service import (
+    CONSENT_REQUIRED_COLLECTION,
+    GRIDFTP_ERROR_COLLECTION,
+    StubOptions,
+    serve_in_thread,
+)
+
+LOCAL_COLLECTION = "local-collection"
+REMOTE_COLLECTION = "remote-collection"
+SERVER_START_TIMEOUT = 60
+
+
+class Action(NamedTuple):
+    name: str
+    weight: int
+    build_request: Callable[["SimulatedUser"], Tuple[str, str, Optional[bytes]]]
+
+
+class Result(NamedTuple):
+    action: str
+    status: int
+    duration: float
+
+
+def build_transfer(items: int) -> bytes:
+    return json.dumps(
+        {
+            "source_endpoint": LOCAL_COLLECTION,
+            "destination_endpoint": REMOTE_COLLECTION,
+            "DATA": [
+                {
+                    "source_path": f"/home/jovyan/file{i}.txt",
+                    "destination_path": f"/~/file{i}.txt",
+                    "recursive": False,
+                }
+                for i in range(items)
+            ],
+            "label": "Load test transfer",
+        }
+    ).encode("utf-8")
+
+
+class SimulatedUser:
+    """
+    A user browsing collections and submitting transfers from JupyterLab. Each
+    user repeatedly picks an action, weighted like the requests the frontend makes,
+    and waits ``think_time`` seconds on average between actions.
+    """
+
+    def __init__(self, client, base_url: str, headers: dict, args: argparse.Namespace):
+        self.client = client
+        self.base_url = base_url
+        self.headers = headers
+        self.args = args
+        self.random = random.Random()
+
+    @property
+    def actions(self) -> List[Action]:
+        args = self.args
+        ls = "/operation_ls?endpoint={}&path={}&refresh=true"
+        return [
+            Action("config", 10, lambda u: ("GET", "/config", None)),
+            Action("tasks", 10, lambda u: ("GET", "/tasks", None)),
+            Action(
+                "operation_ls",
+                20,
+                lambda u: ("GET", ls.format(REMOTE_COLLECTION, "/~/"), None),
+            ),
+            Action(
+                "operation_ls_large",
+                2,
+                lambda u: (
+                    "GET",
+                    ls.format(REMOTE_COLLECTION, f"/~/{args.large_listing_size}/")
+                    + "&format=compact",
+                    None,
+                ),
+            ),
+            Action(
+                "operation_ls_consent_required",
+                1,
+                lambda u: ("GET", ls.format(CONSENT_REQUIRED_COLLECTION, "/~/"), None),
+            ),
+            Action(
+                "operation_ls_gridftp_error",
+                1,
+                lambda u: ("GET", ls.format(GRIDFTP_ERROR_COLLECTION, "/~/"), None),
+            ),
+            Action(
+                "endpoint_search",
+                5,
+                lambda u: (
+                    "GET",
+                    f"/endpoint_search?filter_fulltext=stub{u.random.randrange(10)}",
+                    None,
+                ),
+            ),
+            Action(
+                "endpoint_detail",
+                5,
+                lambda u: (
+                    "GET",
+                    f"/endpoint_detail?endpoint={REMOTE_COLLECTION}",
+                    None,
+                ),
+            ),
+            Action(
+                "submit_transfer",
+                2,
+                lambda u: (
+                    "POST",
+                    "/submit_transfer",
+                    build_transfer(args.transfer_items),
+                ),
+            ),
+        ]
+
+    async def request(self, action: Action) -> Result:
+        method, path, body = action.build_request(self)
+        start = time.perf_counter()
+        try:
+            response = await self.client.fetch(
+                f"{self.base_url}{path}",
+                method=method,
+                body=body,
+                headers=self.headers,
+                request_timeout=self.args.request_timeout,
+                raise_error=False,
+            )
+            status = response.code
+        except (OSError, tornado.httpclient.HTTPClientError):
+            status = 599
+        return Result(action.name, status, time.perf_counter() - start)
+
+    async def run(self, deadline: float) -> List[Result]:
+        actions = self.actions
+        weights = [action.weight for action in actions]
+        results = []
+        while time.monotonic() < deadline:
+            action = self.random.choices(actions, weights)[0]
+            results.append(await self.request(action))
+            if self.args.think_time:
+                await asyncio.sleep(self.random.expovariate(1 / self.args.think_time))
+        return results
+
+
+async def run_users(
+    base_url: str, headers: dict, args: argparse.Namespace
+) -> Tuple[List[Result], float]:
+    """Run ``args.users`` users against the extension at ``base_url`` for
+    ``args.duration`` seconds. Returns every result, and how long the run took."""
+    client = tornado.httpclient.AsyncHTTPClient(
+        force_instance=True, max_clients=args.users
+    )
+    users = [SimulatedUser(client, base_url, headers, args) for _ in range(args.users)]
+    start = time.monotonic()
+    try:
+        runs = await asyncio.gather(
+            *[user.run(start + args.duration) for user in users]
+        )
+    finally:
+        client.close()
+    return [result for run in runs for result in run], time.monotonic() - start
+
+
+def percentile(durations: List[float], percent: float) -> float:
+    ordered = sorted(durations)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(results: List[Result], elapsed: float) -> Dict[str, dict]:
+    by_action = collections.defaultdict(list)
+    for result in results:
+        by_action[result.action].append(result)
+    by_action["total"] = results
+    summary = dict()
+    for action, action_results in sorted(by_action.items()):
+        durations = [result.duration for result in action_results]
+        summary[action] = {
+            "requests": len(action_results),
+            "requests_per_second": len(action_results) / elapsed,
+            "statuses": dict(
+                collections.Counter(str(result.status) for result in action_results)
+            ),
+            "p50_ms": percentile(durations, 50) * 1000,
+            "p95_ms": percentile(durations, 95) * 1000,
+            "p99_ms": percentile(durations, 99) * 1000,
+            "max_ms": max(durations) * 1000,
+        }
+    return summary
+
+
+def format_summary(summary: Dict[str, dict]) -> str:
+    header = (
+        f"{'request':<32}{'count':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}"
+        f"{'p99 ms':>9}{'max ms':>9}  statuses"
+    )
+    lines = [header, "-" * len(header)]
+    for action, stats in summary.items():
+        statuses = ", ".join(f"{k}: {v}" for k, v in sorted(stats["statuses"].items()))
+        lines.append(
+            f"{action:<32}{stats['requests']:>8}{stats['requests_per_second']:>9.1f}"
+            f"{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}"
+            f"{stats['max_ms']:>9.1f}  {statuses}"
+        )
+    return "\n".join(lines)
+
+
+def write_stub_tokens(path: pathlib.Path):
+    """Save tokens for the stub, so the Jupyter server starts logged in"""
+    from globus_jupyterlab.token_storage import CachedJSONFileAdapter
+
+    expires_at = int(time.time()) + 60 * 60 * 24
+    tokens = {
+        resource_server: {
+            "access_token": f"stub-{resource_server}-token",
+            "expires_at_seconds": expires_at,
+            "refresh_token": None,
+            "resource_server": resource_server,
+            "scope": scope,
+            "token_type": "Bearer",
+        }
+        for resource_server, scope in [
+            (
+                "transfer.api.globus.org",
+                "urn:globus:auth:scope:transfer.api.globus.org:all",
+            ),
+            ("auth.globus.org", "openid profile email"),
+        ]
+    }
+    storage = CachedJSONFileAdapter(str(path))
+    storage.store(types.SimpleNamespace(by_resource_server=tokens))
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_server(url: str, headers: dict, process: subprocess.Popen):
+    client = tornado.httpclient.AsyncHTTPClient(force_instance=True)
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    try:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError("Jupyter server exited before it was ready")
+            try:
+                response = await client.fetch(
+                    f"{url}/config", headers=headers, raise_error=False
+                )
+                if response.code == 200:
+                    return
+            except OSError:
+                pass
+            await asyncio.sleep(0.2)
+    finally:
+        client.close()
+    raise RuntimeError(f"Jupyter server was not ready after {SERVER_START_TIMEOUT}s")
+
+
+@contextlib.contextmanager
+def jupyter_server(
+    environment: dict, token: str
+) -> Iterator[Tuple[str, subprocess.Popen]]:
+    """Start a Jupyter server with the extension loaded, logged in with tokens for
+    the stub. Yields the extension's URL and the server process."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = pathlib.Path(tmp)
+        write_stub_tokens(tmp_path / "tokens.json")
+        package_root = str(pathlib.Path(__file__).resolve().parents[3])
+        env = dict(
+            os.environ,
+            **environment,
+            GLOBUS_TOKEN_STORAGE_PATH=str(tmp_path / "tokens.json"),
+            GLOBUS_ENDPOINT_METADATA_PATH=str(tmp_path / "endpoints.json"),
+            GLOBUS_COLLECTION_ID=LOCAL_COLLECTION,
+            GLOBUS_CHECK_LOCAL_PATHS="false",
+            PYTHONPATH=os.pathsep.join(
+                filter(None, [package_root, os.environ.get("PYTHONPATH")])
+            ),
+        )
+        port = get_free_port()
+        command = [
+            sys.executable,
+            "-m",
+            "jupyter_server",
+            "--no-browser",
+            f"--port={port}",
+            "--ip=127.0.0.1",
+            f"--ServerApp.token={token}",
+            f"--ServerApp.root_dir={tmp}",
+            "--ServerApp.jpserver_extensions={'globus_jupyterlab': True}",
+            "--ServerApp.log_level=ERROR",
+            # For running in containers, such as with the Dockerfile
+            "--ServerApp.allow_root=True",
+        ]
+        process = subprocess.Popen(command, env=env, cwd=tmp)
+        try:
+            yield f"http://127.0.0.1:{port}/globus-jupyterlab", process
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run")
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        default=0.5,
+        help="Average seconds each user waits between requests",
+    )
+    parser.add_argument("--request-timeout", type=float, default=60)
+    parser.add_argument("--large-listing-size", type=int, default=10000)
+    parser.add_argument("--transfer-items", type=int, default=100)
+    parser.add_argument("--output", help="Also write the summary to this JSON file")
+    parser.add_argument(
+        "--server-url", help="Drive a running Jupyter server instead of starting one"
+    )
+    parser.add_argument("--token", help="The Jupyter server's token")
+    stub = parser.add_argument_group("stub Globus service")
+    for field, default in StubOptions._field_defaults.items():
+        stub.add_argument(
+            f"--{field.replace('_', '-')}",
+            type=type(default) if default is not None else int,
+            default=default,
+        )
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, dict]:
+    if args.server_url:
+        headers = {"Authorization": f"token {args.token}"} if args.token else {}
+        base_url = f"{args.server_url.rstrip('/')}/globus-jupyterlab"
+        results, elapsed = await run_users(base_url, headers, args)
+        return summarize(results, elapsed)
+
+    options = StubOptions(
+        **{field: getattr(args, field) for field in StubOptions._fields}
+    )
+    token = secrets.token_hex(16)
+    headers = {"Authorization": f"token {token}"}
+    with serve_in_thread(options) as stub:
+        with jupyter_server(stub.get_environment(), token) as (base_url, process):
+            await wait_for_server(base_url, headers, process)
+            results, elapsed = await run_users(base_url, headers, args)
+    return summarize(results, elapsed)
+
+
+def main(argv: Optional[List[str]] = None):
+    # The tests package logs everything at DEBUG
+    logging.getLogger().setLevel(logging.WARNING)
+    args = parse_args(argv)
+    summary = asyncio.run(run(args))
+    print(format_summary(summary))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
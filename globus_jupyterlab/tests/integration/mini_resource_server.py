@@ -29,6 +29,7 @@ flask run
 Now, when JupyterLab submits a transfer, it will go through this service.
 """
 
+import collections
 import os
 import json
 import logging
@@ -70,6 +71,11 @@ logging.config.dictConfig(
 )
 log = logging.getLogger(__name__)
 app = flask.Flask(__name__)
+# JupyterLab retries failed submissions with the same Idempotency-Key header. Note
+# submitted keys so that a retry returns the first response instead of submitting
+# the transfer twice. A real service should keep these somewhere persistent.
+submitted_transfers = collections.OrderedDict()
+MAX_SUBMITTED_TRANSFERS = 1000
 
 
 @app.errorhandler(401)
@@ -132,6 +138,11 @@ def transfer():
     using a separate service to submit transfers. Typically we would do some critical
     piece of work before a user's transfer should take place, such as setting ACLs.
     """
+    idempotency_key = flask.request.headers.get("Idempotency-Key")
+    if idempotency_key in submitted_transfers:
+        log.info(f"Transfer already submitted for Idempotency-Key {idempotency_key}")
+        return submitted_transfers[idempotency_key]
+
     # Server can now proceed with server-related activity:
     client = get_app_client()
     # Note! Dependent tokens here should be cached between calls!
@@ -164,4 +175,8 @@ def transfer():
         return {"error": gapie.message}, gapie.http_status
     task_url = f'https://app.globus.org/activity/{response.data["task_id"]}/overview'
     logging.info(f"Transfer task submitted successfully: {task_url}")
+    if idempotency_key:
+        submitted_transfers[idempotency_key] = response.data
+        while len(submitted_transfers) > MAX_SUBMITTED_TRANSFERS:
+            submitted_transfers.popitem(last=False)
     return response.data
@@ -0,0 +1,468 @@
+"""
+A local stand-in for Globus Transfer and Globus Auth, for load testing the real
+HTTP path from JupyterLab through the Globus SDK. Nothing is actually transferred,
+and every token is accepted.
+
+Transfer calls are served under /transfer/ and Auth calls under /auth/. Point the
+Globus SDK at the stub by setting these in the terminal where JupyterLab is run:
+
+export GLOBUS_SDK_SERVICE_URL_TRANSFER=http://127.0.0.1:8700/transfer/
+export GLOBUS_SDK_SERVICE_URL_AUTH=http://127.0.0.1:8700/auth/
+
+Run the stub with, for example, 50ms of latency and 5% of listings failing:
+
+python -m globus_jupyterlab.tests.integration.stub_globus_service --port 8700 \
+    --latency 0.05 --consent-required-rate 0.05
+
+Listings have ``--listing-size`` entries, unless the last directory in the listed
+path is a number, in which case the listing has that many entries. Listing the
+collection "consent-required" always fails with a 403 ConsentRequired error, and
+listing the collection "gridftp-error" always fails with a 502 GridFTP error, like
+a high assurance collection which the user has no identity allowed on.
+"""
+import argparse
+import asyncio
+import contextlib
+import datetime
+import json
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+import tornado.httpserver
+import tornado.netutil
+import tornado.web
+
+log = logging.getLogger(__name__)
+
+CONSENT_REQUIRED_COLLECTION = "consent-required"
+GRIDFTP_ERROR_COLLECTION = "gridftp-error"
+LOGIN_FAILED = "ExternalError.DirListingFailed.LoginFailed"
+
+# Matches the GridFTP errors Transfer returns for GCS v5.4 collections. The "\r\n"
+# are literal, as they are in Transfer's error messages.
+GRIDFTP_MESSAGE = (
+    r"Error validating login to endpoint 'Stub Collection ({collection})', "
+    "Error (login)\nEndpoint: Stub Collection ({collection})\nServer: "
+    "127.0.0.1:443\nMessage: Login Failed\n---\nDetails: 530-Login incorrect. : "
+    r"GlobusError: v=1 c=LOGIN_DENIED\r\n530-GridFTP-Message: {message}\r\n"
+    r"530-GridFTP-JSON-Result: {result}\r\n530 End.\r\n"
+)
+
+
+class StubOptions(NamedTuple):
+    # Seconds to wait before responding to each request, plus up to latency_jitter
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    # Fraction of listings which fail with each error
+    consent_required_rate: float = 0.0
+    gridftp_error_rate: float = 0.0
+    # Entries in listings which don't ask for a size
+    listing_size: int = 100
+    # Seconds until a submitted task succeeds
+    task_duration: float = 5.0
+    seed: Optional[int] = None
+
+
+class StubState:
+    """Everything the stub has been asked to do, for checking after a run"""
+
+    def __init__(self, options: StubOptions):
+        self.options = options
+        self.random = random.Random(options.seed)
+        self.requests = 0
+        self.errors = 0
+        self.tasks = dict()
+        self.revoked_tokens = set()
+        self._listings = dict()
+
+    def get_listing(self, size: int) -> bytes:
+        """Build a listing of ``size`` files. Listings are built once per size, so
+        large listings don't slow down the stub."""
+        if size not in self._listings:
+            self._listings[size] = json.dumps(build_listing(size)).encode("utf-8")
+        return self._listings[size]
+
+    def get_task(self, task_id: str) -> dict:
+        task = dict(self.tasks[task_id])
+        request_time = task.pop("submitted_at")
+        if time.time() - request_time >= self.options.task_duration:
+            task.update(
+                status="SUCCEEDED",
+                nice_status=None,
+                completion_time=format_time(request_time + self.options.task_duration),
+                files_transferred=task["files"],
+            )
+        return task
+
+
+def format_time(timestamp: float) -> str:
+    return (
+        datetime.datetime.fromtimestamp(timestamp, tz=datetime.timezone.utc)
+        .replace(microsecond=0)
+        .isoformat()
+    )
+
+
+def build_listing(size: int, path: str = "/~/") -> dict:
+    return {
+        "DATA_TYPE": "file_list",
+        "endpoint": "stub",
+        "path": path,
+        "has_next_page": False,
+        "DATA": [
+            {
+                "DATA_TYPE": "file",
+                "group": "stub",
+                "last_modified": "2022-06-01 12:00:00+00:00",
+                "link_target": None,
+                "name": f"file{i}.txt",
+                "permissions": "0644",
+                "size": i,
+                "type": "file",
+                "user": "stub",
+            }
+            for i in range(size)
+        ],
+    }
+
+
+def build_endpoint(endpoint_id: str, display_name: Optional[str] = None) -> dict:
+    return {
+        "DATA_TYPE": "endpoint",
+        "id": endpoint_id,
+        "display_name": display_name or f"Stub Collection {endpoint_id}",
+        "entity_type": "GCSv5_mapped_collection",
+        "gcs_version": "5.4.60",
+        "high_assurance": endpoint_id == GRIDFTP_ERROR_COLLECTION,
+        "owner_string": "stub@globusid.org",
+    }
+
+
+def build_gridftp_message(collection: str) -> str:
+    message = "None of your identities are from domains allowed by resource policies"
+    result = {
+        "DATA_TYPE": "result#1.0.0",
+        "code": "permission_denied",
+        "detail": {
+            "DATA_TYPE": "not_from_allowed_domain#1.0.0",
+            "allowed_domains": ["globus.org"],
+        },
+        "has_next_page": False,
+        "http_response_code": 403,
+        "message": message,
+    }
+    return GRIDFTP_MESSAGE.format(
+        collection=collection, message=message, result=json.dumps(result)
+    )
+
+
+class StubHandler(tornado.web.RequestHandler):
+    def initialize(self, state: StubState):
+        self.state = state
+
+    async def prepare(self):
+        self.state.requests += 1
+        options = self.state.options
+        delay = options.latency + self.state.random.uniform(0, options.latency_jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def write_json(self, data, status: int = 200):
+        self.set_status(status)
+        self.set_header("Content-Type", "application/json")
+        self.finish(data if isinstance(data, bytes) else json.dumps(data))
+
+    def write_error_document(self, status: int, code: str, message: str, **fields):
+        self.state.errors += 1
+        self.write_json(
+            {
+                "code": code,
+                "message": message,
+                "request_id": uuid.uuid4().hex[:9],
+                "resource": self.request.path,
+                **fields,
+            },
+            status=status,
+        )
+
+    def get_body_json(self) -> dict:
+        try:
+            return json.loads(self.request.body)
+        except ValueError:
+            raise tornado.web.HTTPError(400, "Body must be JSON")
+
+
+class OperationLS(StubHandler):
+    def get(self, collection: str):
+        options = self.state.options
+        roll = self.state.random.random()
+        if collection == CONSENT_REQUIRED_COLLECTION or (
+            roll < options.consent_required_rate
+        ):
+            scope = f"https://auth.globus.org/scopes/{collection}/data_access"
+            return self.write_error_document(
+                403,
+                "ConsentRequired",
+                "Missing required data_access consent",
+                required_scopes=[
+                    f"urn:globus:auth:scope:transfer.api.globus.org:all[*{scope}]"
+                ],
+            )
+        if collection == GRIDFTP_ERROR_COLLECTION or (
+            roll < options.consent_required_rate + options.gridftp_error_rate
+        ):
+            return self.write_error_document(
+                502, LOGIN_FAILED, build_gridftp_message(collection)
+            )
+        path = self.get_query_argument("path", "/~/")
+        size = path.rstrip("/").rsplit("/", 1)[-1]
+        self.write_json(
+            self.state.get_listing(
+                int(size) if size.isdigit() else options.listing_size
+            )
+        )
+
+
+class EndpointSearch(StubHandler):
+    def get(self):
+        text = self.get_query_argument("filter_fulltext", "")
+        limit = min(int(self.get_query_argument("limit", 25)), 100)
+        offset = int(self.get_query_argument("offset", 0))
+        endpoints = [
+            build_endpoint(
+                str(uuid.uuid5(uuid.NAMESPACE_URL, f"{text}{i}")),
+                f"{text} Stub Collection {i}".strip(),
+            )
+            for i in range(offset, min(offset + limit, 100))
+        ]
+        self.write_json(
+            {
+                "DATA_TYPE": "endpoint_list",
+                "DATA": endpoints,
+                "has_next_page": offset + limit < 100,
+                "limit": limit,
+                "offset": offset,
+            }
+        )
+
+
+class Endpoint(StubHandler):
+    def get(self, endpoint_id: str):
+        self.write_json(build_endpoint(endpoint_id))
+
+
+class SubmissionID(StubHandler):
+    def get(self):
+        self.write_json({"DATA_TYPE": "submission_id", "value": str(uuid.uuid4())})
+
+
+class SubmitTransfer(StubHandler):
+    def post(self):
+        document = self.get_body_json()
+        task_id = str(uuid.uuid4())
+        now = time.time()
+        self.state.tasks[task_id] = {
+            "DATA_TYPE": "task",
+            "task_id": task_id,
+            "type": "TRANSFER",
+            "status": "ACTIVE",
+            "nice_status": "Queued",
+            "label": document.get("label"),
+            "source_endpoint_id": document.get("source_endpoint"),
+            "destination_endpoint_id": document.get("destination_endpoint"),
+            "request_time": format_time(now),
+            "completion_time": None,
+            "files": len(document.get("DATA", [])),
+            "files_transferred": 0,
+            "bytes_transferred": 0,
+            "faults": 0,
+            "submitted_at": now,
+        }
+        self.write_json(
+            {
+                "DATA_TYPE": "transfer_result",
+                "code": "Accepted",
+                "message": "The transfer has been accepted and a task has been created "
+                "and queued for execution",
+                "request_id": uuid.uuid4().hex[:9],
+                "submission_id": document.get("submission_id"),
+                "task_id": task_id,
+            },
+            status=202,
+        )
+
+
+class TaskList(StubHandler):
+    def get(self):
+        task_filter = self.get_query_argument("filter", "")
+        match = re.match(r"task_id:([\w,-]+)", task_filter)
+        task_ids = match.group(1).split(",") if match else list(self.state.tasks)
+        limit = int(self.get_query_argument("limit", 10))
+        tasks = [
+            self.state.get_task(task_id)
+            for task_id in task_ids
+            if task_id in self.state.tasks
+        ][:limit]
+        self.write_json(
+            {
+                "DATA_TYPE": "task_list",
+                "DATA": tasks,
+                "length": len(tasks),
+                "limit": limit,
+                "offset": 0,
+                "total": len(tasks),
+            }
+        )
+
+
+class TokenIntrospect(StubHandler):
+    def post(self):
+        token = self.get_body_argument("token")
+        now = int(time.time())
+        self.write_json(
+            {
+                "active": token not in self.state.revoked_tokens,
+                "scope": "urn:globus:auth:scope:transfer.api.globus.org:all",
+                "client_id": str(uuid.uuid5(uuid.NAMESPACE_URL, "stub-client")),
+                "sub": str(uuid.uuid5(uuid.NAMESPACE_URL, "stub-user")),
+                "username": "stub@globusid.org",
+                "name": "Stub User",
+                "email": None,
+                "aud": ["transfer.api.globus.org"],
+                "iss": "https://auth.globus.org",
+                "exp": now + 3600,
+                "iat": now,
+                "nbf": now,
+            }
+        )
+
+
+class TokenRevoke(StubHandler):
+    def post(self):
+        self.state.revoked_tokens.add(self.get_body_argument("token"))
+        self.write_json({"active": False})
+
+
+class UserInfo(StubHandler):
+    def get(self):
+        sub = str(uuid.uuid5(uuid.NAMESPACE_URL, "stub-user"))
+        identity = {"sub": sub, "username": "stub@globusid.org", "name": "Stub User"}
+        self.write_json({**identity, "identity_set": [identity]})
+
+
+def make_app(state: StubState, log_requests: bool = True) -> tornado.web.Application:
+    transfer = r"/transfer/v0\.10"
+    auth = r"/auth/v2/oauth2"
+    handlers = [
+        (rf"{transfer}/operation/endpoint/([^/]+)/ls", OperationLS),
+        (rf"{transfer}/endpoint_search", EndpointSearch),
+        (rf"{transfer}/endpoint/([^/]+)", Endpoint),
+        (rf"{transfer}/submission_id", SubmissionID),
+        (rf"{transfer}/transfer", SubmitTransfer),
+        (rf"{transfer}/task_list", TaskList),
+        (rf"{auth}/token/introspect", TokenIntrospect),
+        (rf"{auth}/token/revoke", TokenRevoke),
+        (rf"{auth}/userinfo", UserInfo),
+    ]
+    settings = dict() if log_requests else dict(log_function=lambda handler: None)
+    return tornado.web.Application(
+        [(url, handler, dict(state=state)) for url, handler in handlers], **settings
+    )
+
+
+class StubGlobusService:
+    """The stub, served from a background thread with its own event loop"""
+
+    def __init__(self, options: StubOptions = StubOptions(), port: int = 0):
+        self.state = StubState(options)
+        self.port = port
+        self._loop = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def get_environment(self) -> Dict[str, str]:
+        """Environment variables which point the Globus SDK at the stub"""
+        return {
+            "GLOBUS_SDK_SERVICE_URL_TRANSFER": f"{self.url}/transfer/",
+            "GLOBUS_SDK_SERVICE_URL_AUTH": f"{self.url}/auth/",
+        }
+
+    def start(self):
+        sockets = tornado.netutil.bind_sockets(self.port, "127.0.0.1")
+        self.port = sockets[0].getsockname()[1]
+        self._loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def serve():
+            asyncio.set_event_loop(self._loop)
+            app = make_app(self.state, log_requests=False)
+            server = tornado.httpserver.HTTPServer(app)
+            server.add_sockets(sockets)
+            self._loop.call_soon(started.set)
+            self._loop.run_forever()
+            server.stop()
+            self._loop.close()
+
+        self._thread = threading.Thread(target=serve, daemon=True)
+        self._thread.start()
+        started.wait()
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+@contextlib.contextmanager
+def serve_in_thread(
+    options: StubOptions = StubOptions(), port: int = 0
+) -> Iterator[StubGlobusService]:
+    service = StubGlobusService(options, port)
+    service.start()
+    try:
+        yield service
+    finally:
+        service.stop()
+
+
+def parse_options(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=8700)
+    for field, default in StubOptions._field_defaults.items():
+        parser.add_argument(
+            f"--{field.replace('_', '-')}",
+            type=type(default) if default is not None else int,
+            default=default,
+        )
+    return parser.parse_args(argv)
+
+
+async def serve_forever(options: StubOptions, port: int):
+    server = tornado.httpserver.HTTPServer(make_app(StubState(options)))
+    server.listen(port, "127.0.0.1")
+    log.info(f"Stub Globus service listening on http://127.0.0.1:{port}")
+    await asyncio.Event().wait()
+
+
+def main(argv: Optional[List[str]] = None):
+    logging.basicConfig()
+    logging.getLogger().setLevel(logging.INFO)
+    args = parse_options(argv)
+    options = StubOptions(
+        **{field: getattr(args, field) for field in StubOptions._fields}
+    )
+    try:
+        asyncio.run(serve_forever(options, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
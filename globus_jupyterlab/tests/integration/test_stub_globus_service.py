@@ -0,0 +1,121 @@
+import json
+
+import globus_sdk
+import pytest
+
+from globus_jupyterlab.handlers.exception_handlers import (
+    GCSv54DataAccessConsent,
+    GCSv54HighAssurance,
+    get_classifier,
+)
+from globus_jupyterlab.tests.integration import load_driver
+from globus_jupyterlab.tests.integration.stub_globus_service import (
+    CONSENT_REQUIRED_COLLECTION,
+    GRIDFTP_ERROR_COLLECTION,
+    StubOptions,
+    serve_in_thread,
+)
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    with serve_in_thread(StubOptions(task_duration=0)) as stub:
+        for name, value in stub.get_environment().items():
+            monkeypatch.setenv(name, value)
+        yield stub
+
+
+@pytest.fixture
+def tc(stub) -> globus_sdk.TransferClient:
+    return globus_sdk.TransferClient(
+        authorizer=globus_sdk.AccessTokenAuthorizer("token")
+    )
+
+
+def test_operation_ls(tc):
+    assert len(tc.operation_ls("collection", path="/~/").data["DATA"]) == 100
+    assert len(tc.operation_ls("collection", path="/~/1234/").data["DATA"]) == 1234
+
+
+@pytest.mark.parametrize(
+    "collection, exception_handler",
+    [
+        (CONSENT_REQUIRED_COLLECTION, GCSv54DataAccessConsent),
+        (GRIDFTP_ERROR_COLLECTION, GCSv54HighAssurance),
+    ],
+)
+def test_operation_ls_errors(tc, collection, exception_handler):
+    with pytest.raises(globus_sdk.TransferAPIError) as error:
+        tc.operation_ls(collection)
+    classifier = get_classifier((GCSv54HighAssurance, GCSv54DataAccessConsent))
+    assert isinstance(classifier.classify(error.value), exception_handler)
+
+
+def test_error_rates():
+    options = StubOptions(consent_required_rate=0.5, gridftp_error_rate=0.5, seed=1)
+    with serve_in_thread(options) as stub:
+        tc = globus_sdk.TransferClient(base_url=f"{stub.url}/transfer/")
+        statuses = set()
+        for _ in range(20):
+            with pytest.raises(globus_sdk.TransferAPIError) as error:
+                tc.operation_ls("collection")
+            statuses.add(error.value.http_status)
+    assert statuses == {403, 502}
+    assert stub.state.errors == 20
+
+
+def test_latency():
+    with serve_in_thread(StubOptions(latency=0.05)) as stub:
+        tc = globus_sdk.TransferClient(base_url=f"{stub.url}/transfer/")
+        response = tc.get_endpoint("collection")
+    assert response.data["id"] == "collection"
+    assert response._response.elapsed.total_seconds() >= 0.05
+
+
+def test_endpoint_search(tc):
+    response = tc.endpoint_search("my collection", limit=10)
+    assert len(response.data["DATA"]) == 10
+    assert response.data["DATA"][0]["display_name"].startswith("my collection")
+
+
+def test_submit_transfer_and_task_list(tc, stub):
+    td = globus_sdk.TransferData(tc, "source", "destination", label="Stub Transfer")
+    td.add_item("/a.txt", "/b.txt")
+    task_id = tc.submit_transfer(td).data["task_id"]
+    tasks = tc.task_list(filter=f"task_id:{task_id}").data["DATA"]
+    assert len(tasks) == 1
+    assert tasks[0]["status"] == "SUCCEEDED"
+    assert tasks[0]["files"] == 1
+    assert tasks[0]["label"] == "Stub Transfer"
+
+
+def test_token_introspect_and_revoke(stub):
+    client = globus_sdk.NativeAppAuthClient("client_id")
+    confidential = globus_sdk.ConfidentialAppAuthClient("client_id", "secret")
+    assert confidential.oauth2_token_introspect("my_token").data["active"] is True
+    client.oauth2_revoke_token("my_token")
+    assert stub.state.revoked_tokens == {"my_token"}
+    assert confidential.oauth2_token_introspect("my_token").data["active"] is False
+
+
+def test_userinfo(stub):
+    ac = globus_sdk.AuthClient(authorizer=globus_sdk.AccessTokenAuthorizer("token"))
+    assert ac.oauth2_userinfo().data["identity_set"]
+
+
+def test_load_driver(tmp_path, capsys):
+    output = tmp_path / "summary.json"
+    load_driver.main(
+        [
+            "--users=2",
+            "--duration=1",
+            "--think-time=0",
+            "--large-listing-size=100",
+            f"--output={output}",
+        ]
+    )
+    summary = json.loads(output.read_text())
+    assert summary["total"]["requests"] > 0
+    statuses = summary["total"]["statuses"]
+    assert set(statuses) <= {"200", "401"}
+    assert "request" in capsys.readouterr().out
@@ -0,0 +1,90 @@
+import pytest
+import tornado.gen
+import tornado.locks
+from globus_jupyterlab.cache import SingleFlight, TTLCache
+
+
+class MockTimer:
+    now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_get_set():
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("foo", "bar")
+    assert cache.get("foo") == "bar"
+    assert cache.get("missing") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_ttl_cache_expires():
+    timer = MockTimer()
+    cache = TTLCache(maxsize=2, ttl=10, timer=timer)
+    cache.set("foo", "bar")
+    timer.now = 10
+    assert cache.get("foo") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_lru_eviction():
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_disabled():
+    cache = TTLCache(maxsize=2, ttl=0)
+    cache.set("foo", "bar")
+    assert cache.get("foo") is None
+
+
+def test_ttl_cache_invalidate():
+    cache = TTLCache(maxsize=10, ttl=10)
+    cache.set(("ep1", "/a"), 1)
+    cache.set(("ep1", "/b"), 2)
+    cache.set(("ep2", "/a"), 3)
+    assert cache.invalidate(lambda key: key[0] == "ep1") == 2
+    assert cache.get(("ep2", "/a")) == 3
+    assert cache.pop(("ep2", "/a")) == 3
+    assert len(cache) == 0
+
+
+@pytest.mark.gen_test
+def test_single_flight_shares_calls():
+    single_flight = SingleFlight()
+    release = tornado.locks.Event()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await release.wait()
+        return "result"
+
+    first = single_flight.run("key", call)
+    second = single_flight.run("key", call)
+    waiting = tornado.gen.multi([first, second])
+    yield tornado.gen.moment
+    assert len(single_flight) == 1
+    release.set()
+    assert (yield waiting) == ["result", "result"]
+    assert len(calls) == 1
+    assert len(single_flight) == 0
+
+
+@pytest.mark.gen_test
+def test_single_flight_errors():
+    single_flight = SingleFlight()
+
+    async def call():
+        raise ValueError("oops")
+
+    with pytest.raises(ValueError):
+        yield single_flight.run("key", call)
+    assert len(single_flight) == 0
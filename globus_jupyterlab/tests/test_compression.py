@@ -0,0 +1,121 @@
+import gzip
+import zlib
+
+import pytest
+import tornado.httputil
+import tornado.web
+
+from globus_jupyterlab.handlers import compression
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip, deflate", "gzip"),
+        ("gzip;q=0, deflate", None),
+        ("GZIP;q=0.5", "gzip"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiate_encoding(monkeypatch, accept_encoding, expected):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert compression.negotiate_encoding(accept_encoding) == expected
+
+
+def test_negotiate_brotli():
+    pytest.importorskip("brotli")
+    assert compression.negotiate_encoding("gzip, deflate, br") == "br"
+    assert compression.negotiate_encoding("gzip, br;q=0") == "gzip"
+
+
+def test_negotiate_brotli_not_installed(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert compression.negotiate_encoding("br, gzip") == "gzip"
+
+
+def transform(accept_encoding, chunks, content_type="application/json"):
+    request = tornado.httputil.HTTPServerRequest(
+        uri="/",
+        headers=tornado.httputil.HTTPHeaders({"Accept-Encoding": accept_encoding}),
+    )
+    content_encoding = compression.CompressedContentEncoding(request)
+    headers = tornado.httputil.HTTPHeaders({"Content-Type": content_type})
+    _, headers, body = content_encoding.transform_first_chunk(
+        200, headers, chunks[0], len(chunks) == 1
+    )
+    for index, chunk in enumerate(chunks[1:], start=2):
+        body += content_encoding.transform_chunk(chunk, index == len(chunks))
+    return headers, body
+
+
+def test_transform_gzip(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    data = b'{"DATA": []}' * 1000
+    headers, body = transform("gzip", [data[:5000], data[5000:]])
+    assert headers["Content-Encoding"] == "gzip"
+    assert headers["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(body) == data
+
+
+def test_transform_brotli():
+    brotli = pytest.importorskip("brotli")
+    data = b'{"DATA": []}' * 1000
+    headers, body = transform("br", [data])
+    assert headers["Content-Encoding"] == "br"
+    assert brotli.decompress(body) == data
+
+
+@pytest.mark.parametrize(
+    "chunk, content_type",
+    [(b"{}", "application/json"), (b"\0" * 2048, "application/octet-stream")],
+)
+def test_transform_skips_small_or_binary_responses(chunk, content_type):
+    headers, body = transform("gzip", [chunk], content_type)
+    assert "Content-Encoding" not in headers
+    assert body == chunk
+
+
+@pytest.mark.parametrize(
+    "encoding, compress",
+    [
+        ("gzip", gzip.compress),
+        ("deflate", zlib.compress),
+        (" GZIP ", gzip.compress),
+    ],
+)
+def test_decompress_body(encoding, compress):
+    assert compression.decompress_body(compress(b"foo" * 100), encoding) == (
+        b"foo" * 100
+    )
+
+
+@pytest.mark.parametrize(
+    "body, encoding, max_size, status_code",
+    [
+        (gzip.compress(b"foo"), "br", 100, 415),
+        (b"not gzip", "gzip", 100, 400),
+        (gzip.compress(b"foo")[:-10], "gzip", 100, 400),
+        (gzip.compress(b"\0" * 1000), "gzip", 100, 413),
+    ],
+)
+def test_decompress_body_errors(body, encoding, max_size, status_code):
+    with pytest.raises(tornado.web.HTTPError) as exc_info:
+        compression.decompress_body(body, encoding, max_size)
+    assert exc_info.value.status_code == status_code
+
+
+def test_transform_only_under_path_prefix():
+    request = tornado.httputil.HTTPServerRequest(
+        uri="/api/contents",
+        headers=tornado.httputil.HTTPHeaders({"Accept-Encoding": "gzip"}),
+    )
+    transform = compression.CompressedContentEncoding.for_path_prefix(
+        "/globus-jupyterlab/"
+    )(request)
+    headers = tornado.httputil.HTTPHeaders({"Content-Type": "application/json"})
+    data = b"x" * 10000
+    _, headers, body = transform.transform_first_chunk(200, headers, data, True)
+    assert "Content-Encoding" not in headers
+    assert "Vary" not in headers
+    assert body == data
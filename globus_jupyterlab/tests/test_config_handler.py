@@ -47,3 +47,64 @@ def test_config_with_hub_environment(http_client, base_url, gcp, oauthenticator)
     data = json.loads(response.body)
     assert response.code == 200
     assert data["is_gcp"] is False
+
+
+@pytest.mark.gen_test
+def test_config_reload(http_client, base_url, monkeypatch):
+    monkeypatch.setenv("GLOBUS_COLLECTION_ID", "my_collection")
+    response = yield http_client.fetch(base_url + "/config")
+    assert json.loads(response.body)["collection_id"] == "my_collection"
+
+    monkeypatch.setenv("GLOBUS_COLLECTION_ID", "my_other_collection")
+    response = yield http_client.fetch(base_url + "/config")
+    assert json.loads(response.body)["collection_id"] == "my_collection"
+
+    response = yield http_client.fetch(
+        base_url + "/config/reload", method="POST", body=""
+    )
+    assert response.code == 200
+    response = yield http_client.fetch(base_url + "/config")
+    assert json.loads(response.body)["collection_id"] == "my_other_collection"
+
+
+@pytest.mark.gen_test
+def test_config_reload_invalid_config(http_client, base_url, monkeypatch):
+    monkeypatch.setenv("GLOBUS_TRANSFER_SUBMISSION_SCOPE", "myscope")
+    response = yield http_client.fetch(
+        base_url + "/config/reload", method="POST", body="", raise_error=False
+    )
+    assert response.code == 400
+    assert json.loads(response.body)["result"] == "failure"
+
+
+@pytest.mark.gen_test
+def test_config_reload_invalid_config_keeps_settings(
+    http_client, base_url, monkeypatch
+):
+    monkeypatch.setenv("GLOBUS_COLLECTION_ID", "my_collection")
+    yield http_client.fetch(base_url + "/config")
+
+    monkeypatch.setenv("GLOBUS_COLLECTION_ID", "my_other_collection")
+    monkeypatch.setenv("GLOBUS_TRANSFER_SUBMISSION_SCOPE", "myscope")
+    response = yield http_client.fetch(
+        base_url + "/config/reload", method="POST", body="", raise_error=False
+    )
+    assert response.code == 400
+    response = yield http_client.fetch(base_url + "/config")
+    assert response.code == 200
+    assert json.loads(response.body)["collection_id"] == "my_collection"
+
+
+@pytest.mark.gen_test
+def test_config_next_token_refresh(http_client, base_url, login_refresh, monkeypatch):
+    monkeypatch.setenv("GLOBUS_TOKEN_REFRESH_JITTER", "0")
+    for token_data in login_refresh.tokens.values():
+        token_data["expires_at_seconds"] = 10000
+    response = yield http_client.fetch(base_url + "/config")
+    assert json.loads(response.body)["next_token_refresh"] == 10000 - 300
+
+
+@pytest.mark.gen_test
+def test_config_no_token_refresh(http_client, base_url, logged_in):
+    response = yield http_client.fetch(base_url + "/config")
+    assert json.loads(response.body)["next_token_refresh"] is None
@@ -0,0 +1,112 @@
+import json
+import time
+
+import pytest
+from globus_jupyterlab.endpoint_metadata import EndpointMetadataCache
+
+COLLECTION_ID = "5d5a7c12-0b1c-4e4b-8d3d-6c3b2f9a1e01"
+
+
+@pytest.fixture
+def metadata_path(tmp_path):
+    return str(tmp_path / "endpoints.json")
+
+
+def mapped_collection(gcs_version="5.4.10"):
+    return {
+        "id": COLLECTION_ID,
+        "entity_type": "GCSv5_mapped_collection",
+        "gcs_version": gcs_version,
+        "high_assurance": False,
+    }
+
+
+@pytest.mark.parametrize(
+    "document, requires_data_access",
+    [
+        (mapped_collection(), True),
+        (mapped_collection("5.3.0"), False),
+        (mapped_collection(None), True),
+        (dict(mapped_collection(), entity_type="GCSv5_guest_collection"), False),
+        ({"id": COLLECTION_ID, "entity_type": "GCSv4_host"}, False),
+    ],
+)
+def test_is_data_access_required(document, requires_data_access):
+    assert (
+        EndpointMetadataCache.is_data_access_required(document) is requires_data_access
+    )
+
+
+def test_metadata_persisted(metadata_path):
+    EndpointMetadataCache(metadata_path, ttl=60).update_from_endpoint_document(
+        mapped_collection()
+    )
+    metadata = EndpointMetadataCache(metadata_path, ttl=60).get(COLLECTION_ID)
+    assert metadata.entity_type == "GCSv5_mapped_collection"
+    assert metadata.gcs_version == "5.4.10"
+    assert metadata.requires_data_access is True
+
+
+def test_metadata_expires(metadata_path, monkeypatch):
+    cache = EndpointMetadataCache(metadata_path, ttl=60)
+    cache.update(COLLECTION_ID, high_assurance=True)
+    updated_at = cache.get(COLLECTION_ID).updated_at
+    monkeypatch.setattr(time, "time", lambda: updated_at + 61)
+    assert cache.get(COLLECTION_ID) is None
+
+
+def test_metadata_disabled(metadata_path):
+    cache = EndpointMetadataCache(metadata_path, ttl=0)
+    cache.update(COLLECTION_ID, high_assurance=True)
+    assert cache.get(COLLECTION_ID) is None
+
+
+def test_metadata_required_domains(metadata_path):
+    EndpointMetadataCache(metadata_path, ttl=60).update(
+        COLLECTION_ID, required_domains=("globus.org",)
+    )
+    metadata = EndpointMetadataCache(metadata_path, ttl=60).get(COLLECTION_ID)
+    assert metadata.required_domains == ("globus.org",)
+
+
+def test_data_access_consents(metadata_path):
+    cache = EndpointMetadataCache(metadata_path, ttl=60)
+    cache.update_from_endpoint_document(mapped_collection())
+    cache.set_consents_from_scopes(
+        "urn:globus:auth:scope:transfer.api.globus.org:all"
+        f"[https://auth.globus.org/scopes/{COLLECTION_ID}/data_access]"
+    )
+    assert cache.get(COLLECTION_ID).data_access_consented is True
+    cache.clear_consents()
+    assert cache.get(COLLECTION_ID).data_access_consented is None
+    assert cache.get(COLLECTION_ID).requires_data_access is True
+
+
+@pytest.mark.parametrize("contents", ["not json", "[]", '{"version": 1}'])
+def test_invalid_metadata_file_ignored(metadata_path, contents):
+    with open(metadata_path, "w") as f:
+        f.write(contents)
+    cache = EndpointMetadataCache(metadata_path, ttl=60)
+    assert cache.get(COLLECTION_ID) is None
+    cache.update(COLLECTION_ID, high_assurance=True)
+    with open(metadata_path) as f:
+        assert COLLECTION_ID in json.load(f)["endpoints"]
+
+
+def test_is_data_access_consent_needed(metadata_path):
+    cache = EndpointMetadataCache(metadata_path, ttl=86400)
+    # Nothing is known yet, so a successful call should be recorded
+    assert cache.is_data_access_consent_needed(COLLECTION_ID) is True
+    cache.update_from_endpoint_document(mapped_collection())
+    assert cache.is_data_access_consent_needed(COLLECTION_ID) is True
+    cache.set_data_access_consented([COLLECTION_ID])
+    assert cache.is_data_access_consent_needed(COLLECTION_ID) is False
+    cache.update_from_endpoint_document(mapped_collection("5.3.0"))
+    cache.update(COLLECTION_ID, data_access_consented=None)
+    assert cache.is_data_access_consent_needed(COLLECTION_ID) is False
+    assert (
+        EndpointMetadataCache(metadata_path, ttl=0).is_data_access_consent_needed(
+            COLLECTION_ID
+        )
+        is False
+    )
@@ -0,0 +1,97 @@
+import pytest
+
+from globus_jupyterlab.handlers import exception_handlers
+from globus_jupyterlab.handlers.auth import GCSAuthMixin
+from globus_jupyterlab.tests.mocks import (
+    MockGlobusAPIError,
+    GRIDFTP_HA_NOT_FROM_ALLOWED_DOMAIN,
+    GRIDFTP_S3_CREDENTIALS_REQUIRED_MESSAGE,
+    GRIDFTP_UNEXPECTED_MESSAGE,
+)
+
+LOGIN_FAILED = "ExternalError.DirListingFailed.LoginFailed"
+
+
+@pytest.fixture
+def classifier():
+    return exception_handlers.get_classifier(tuple(GCSAuthMixin.login_checks))
+
+
+@pytest.mark.parametrize(
+    "error, expected",
+    [
+        (MockGlobusAPIError("No token", 401), exception_handlers.LoginRequired),
+        (
+            MockGlobusAPIError("Activate", 400, "ClientError.ActivationRequired"),
+            exception_handlers.GCSv4Endpoint,
+        ),
+        (
+            MockGlobusAPIError(GRIDFTP_HA_NOT_FROM_ALLOWED_DOMAIN, 502, LOGIN_FAILED),
+            exception_handlers.GCSv54HighAssurance,
+        ),
+        (
+            MockGlobusAPIError(
+                GRIDFTP_S3_CREDENTIALS_REQUIRED_MESSAGE, 502, LOGIN_FAILED
+            ),
+            exception_handlers.GCSv54S3Credentials,
+        ),
+        (
+            MockGlobusAPIError(GRIDFTP_UNEXPECTED_MESSAGE, 502, LOGIN_FAILED),
+            exception_handlers.GCSUnexpectedGridFTPError,
+        ),
+        (
+            MockGlobusAPIError("Consent!", 403, "ConsentRequired"),
+            exception_handlers.GCSv54DataAccessConsent,
+        ),
+    ],
+)
+def test_classify(classifier, error, expected):
+    handler = classifier.classify(error)
+    assert type(handler) is expected
+    assert handler.check() is True
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        MockGlobusAPIError("Bad request", 400),
+        MockGlobusAPIError("Forbidden", 403, "PermissionDenied"),
+        MockGlobusAPIError("Bad gateway without GridFTP details", 502),
+        MockGlobusAPIError("Server error", 500),
+    ],
+)
+def test_classify_unrelated_errors(classifier, error):
+    assert classifier.classify(error) is None
+
+
+def test_classifier_keeps_check_order():
+    # Handlers which match any status are only picked in their listed order
+    class AnyError(exception_handlers.AuthExceptionHandler):
+        pass
+
+    classifier = exception_handlers.AuthErrorClassifier(
+        [exception_handlers.LoginRequired, AnyError]
+    )
+    assert type(classifier.classify(MockGlobusAPIError("", 401))) is (
+        exception_handlers.LoginRequired
+    )
+    assert type(classifier.classify(MockGlobusAPIError("", 500))) is AnyError
+
+
+def test_error_parsed_once(classifier, monkeypatch):
+    calls = []
+    parse = exception_handlers.parse_gridftp_json_response
+    monkeypatch.setattr(
+        exception_handlers,
+        "parse_gridftp_json_response",
+        lambda message: calls.append(message) or parse(message),
+    )
+    error = MockGlobusAPIError(GRIDFTP_UNEXPECTED_MESSAGE, 502, LOGIN_FAILED)
+    handler = classifier.classify(error)
+    assert handler.metadata["parsed_gridftp_response"]["code"] == "invalid_credential"
+    assert len(calls) == 1
+
+
+def test_unparseable_gridftp_response():
+    message = "530-GridFTP-JSON-Result: {not json\\r\\n530 End"
+    assert exception_handlers.parse_gridftp_json_response(message) is None
@@ -72,6 +72,41 @@ def test_get_refresh_tokens(monkeypatch):
     assert GlobusConfig().get_refresh_tokens() is True
 
 
+def test_get_sdk_max_workers(monkeypatch):
+    assert GlobusConfig().get_sdk_max_workers() == 4
+    monkeypatch.setenv("GLOBUS_SDK_MAX_WORKERS", "8")
+    assert GlobusConfig().get_sdk_max_workers() == 8
+
+
+@pytest.mark.parametrize("env_value", ["0", "four"])
+def test_get_sdk_max_workers_invalid(monkeypatch, env_value):
+    monkeypatch.setenv("GLOBUS_SDK_MAX_WORKERS", env_value)
+    with pytest.raises(ValueError):
+        GlobusConfig().get_sdk_max_workers()
+
+
+def test_get_local_scan_max_workers(monkeypatch):
+    assert GlobusConfig().get_local_scan_max_workers() == 4
+    monkeypatch.setenv("GLOBUS_LOCAL_SCAN_MAX_WORKERS", "16")
+    assert GlobusConfig().get_local_scan_max_workers() == 16
+
+
+@pytest.mark.parametrize("env_value", ["0", "four"])
+def test_get_local_scan_max_workers_invalid(monkeypatch, env_value):
+    monkeypatch.setenv("GLOBUS_LOCAL_SCAN_MAX_WORKERS", env_value)
+    with pytest.raises(ValueError):
+        GlobusConfig().get_local_scan_max_workers()
+
+
+@pytest.mark.parametrize(
+    "env_name", ["GLOBUS_TOKEN_REFRESH_MARGIN", "GLOBUS_TOKEN_REFRESH_JITTER"]
+)
+def test_get_token_refresh_settings_invalid(monkeypatch, env_name):
+    monkeypatch.setenv(env_name, "-1")
+    with pytest.raises(ValueError):
+        GlobusConfig().build_snapshot()
+
+
 def test_transfer_is_hub_service(monkeypatch):
     monkeypatch.setenv("GLOBUS_TRANSFER_SUBMISSION_IS_HUB_SERVICE", "true")
     assert GlobusConfig().get_transfer_submission_is_hub_service() is True
@@ -123,3 +158,52 @@ def test_get_redirect_uri(mock_hub_env):
 def test_gcp_owner_is_none(gcp):
     gcp.get_owner_info.return_value = None
     assert GlobusConfig().get_collection_id_owner() is None
+
+
+def test_snapshot_is_cached(monkeypatch):
+    monkeypatch.setenv("GLOBUS_COLLECTION_ID", "my_collection")
+    gc = GlobusConfig()
+    snapshot = gc.get_snapshot()
+    assert snapshot.collection_id == "my_collection"
+    monkeypatch.setenv("GLOBUS_COLLECTION_ID", "my_other_collection")
+    assert gc.get_snapshot() is snapshot
+
+
+def test_snapshot_reload(monkeypatch):
+    monkeypatch.setenv("GLOBUS_COLLECTION_ID", "my_collection")
+    gc = GlobusConfig()
+    gc.get_snapshot()
+    monkeypatch.setenv("GLOBUS_COLLECTION_ID", "my_other_collection")
+    gc.reload()
+    assert gc.get_snapshot().collection_id == "my_other_collection"
+
+
+def test_snapshot_reload_invalid_keeps_snapshot(monkeypatch):
+    monkeypatch.setenv("GLOBUS_COLLECTION_ID", "my_collection")
+    gc = GlobusConfig()
+    snapshot = gc.get_snapshot()
+    monkeypatch.setenv("GLOBUS_SDK_MAX_WORKERS", "0")
+    with pytest.raises(ValueError):
+        gc.reload()
+    assert gc.get_snapshot() is snapshot
+
+
+def test_snapshot_is_immutable():
+    with pytest.raises(AttributeError):
+        GlobusConfig().get_snapshot().collection_id = "foo"
+
+
+def test_snapshot_rebuilt_on_gcp_change(monkeypatch, tmp_path, gcp):
+    client_id_file = tmp_path / "client-id.txt"
+    monkeypatch.setattr(
+        GlobusConfig, "get_gcp_config_files", lambda self: [str(client_id_file)]
+    )
+    gcp.endpoint_id = None
+    gc = GlobusConfig()
+    assert gc.get_snapshot().is_gcp is False
+    assert gc.get_snapshot() is gc.get_snapshot()
+
+    client_id_file.write_text("my_gcp_collection")
+    gcp.endpoint_id = "my_gcp_collection"
+    assert gc.get_snapshot().collection_id == "my_gcp_collection"
+    assert gc.get_snapshot().is_gcp is True
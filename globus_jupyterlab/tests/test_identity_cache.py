@@ -0,0 +1,87 @@
+import copy
+from unittest.mock import Mock
+
+import pytest
+
+from globus_jupyterlab.identity_cache import IdentitySetCache
+from globus_jupyterlab.tests.mocks import MOCK_IDENTITIES
+
+GLOBUS_STAFF_IDENTITY = "7d4657a1-0422-409a-a0ee-077f4a6a99a1"
+
+
+@pytest.fixture
+def identity_cache(login_manager, logged_in, auth_client):
+    return IdentitySetCache(login_manager)
+
+
+def test_build_domain_index():
+    index = IdentitySetCache.build_domain_index(
+        [
+            {"sub": "a", "username": "owl@Globus.org"},
+            {"sub": "b", "username": "owl@globusid.org"},
+            {"sub": "c", "username": "no-domain"},
+        ]
+    )
+    assert index == {"globus.org": ["a"], "globusid.org": ["b"]}
+
+
+def test_identities_fetched_once(identity_cache, auth_client):
+    for _ in range(3):
+        assert identity_cache.get_identities_for_domains(["globus.org"]) == [
+            GLOBUS_STAFF_IDENTITY
+        ]
+    assert auth_client.oauth2_userinfo.call_count == 1
+
+
+def test_identities_not_fetched_without_fetch(identity_cache, auth_client):
+    assert identity_cache.is_current() is False
+    assert identity_cache.get_identities_for_domains(["globus.org"], fetch=False) == []
+    assert not auth_client.oauth2_userinfo.called
+    identity_cache.refresh()
+    assert identity_cache.is_current() is True
+    assert identity_cache.get_identities_for_domains(["globus.org"], fetch=False) == [
+        GLOBUS_STAFF_IDENTITY
+    ]
+
+
+def test_identities_match_whole_domains(identity_cache):
+    # Previously matched by substring, which would include any "*globus.org" domain
+    assert identity_cache.get_identities_for_domains(["bus.org"]) == []
+    assert identity_cache.get_identities_for_domains(["GLOBUSID.ORG"]) == [
+        MOCK_IDENTITIES["identity_set"][0]["sub"]
+    ]
+
+
+def test_identities_refreshed_with_new_tokens(identity_cache, logged_in, auth_client):
+    identity_cache.refresh()
+    tokens = copy.deepcopy(logged_in.tokens)
+    tokens["auth.globus.org"]["access_token"] = "new_auth_access_token"
+    logged_in.tokens = tokens
+    identity_cache.get_identities_for_domains(["globus.org"])
+    assert auth_client.oauth2_userinfo.call_count == 2
+
+
+def test_identities_kept_across_access_token_refresh(
+    identity_cache, login_refresh, monkeypatch
+):
+    fetch = Mock(return_value=MOCK_IDENTITIES["identity_set"])
+    monkeypatch.setattr(identity_cache, "fetch_identity_set", fetch)
+    identity_cache.refresh()
+    tokens = copy.deepcopy(login_refresh.tokens)
+    tokens["auth.globus.org"]["access_token"] = "refreshed_auth_access_token"
+    login_refresh.tokens = tokens
+    identity_cache.get_identities_for_domains(["globus.org"])
+    assert fetch.call_count == 1
+
+
+def test_refresh_on_login_errors_logged(identity_cache, auth_client, sdk_error):
+    auth_client.oauth2_userinfo.side_effect = sdk_error("Auth is down")
+    identity_cache.refresh_on_login()
+    auth_client.oauth2_userinfo.side_effect = None
+    identity_cache.get_identities_for_domains(["globus.org"])
+    assert auth_client.oauth2_userinfo.call_count == 2
+
+
+def test_identities_require_auth_tokens(identity_cache, logged_out):
+    with pytest.raises(LookupError):
+        identity_cache.get_identities_for_domains(["globus.org"])
@@ -0,0 +1,133 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from globus_jupyterlab import local_scan
+from globus_jupyterlab.local_scan import (
+    DirectoryScan,
+    LocalPathScan,
+    scan_directory,
+    scan_selected_path,
+)
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """A directory with 3 files (10 bytes total), 2 subdirectories and a symlink"""
+    (tmp_path / "top.txt").write_bytes(b"12345")
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "a" / "a.txt").write_bytes(b"123")
+    (tmp_path / "a" / "b" / "b.txt").write_bytes(b"12")
+    os.symlink(str(tmp_path / "a"), str(tmp_path / "link"))
+    return tmp_path
+
+
+def test_scan_directory(tree):
+    result = scan_directory(str(tree), threading.Event())
+    assert result._replace(subdirectories=()) == DirectoryScan(
+        files=1, directories=1, bytes=5, symlinks=1
+    )
+    assert result.subdirectories == (str(tree / "a"),)
+
+
+def test_scan_directory_cancelled(tree):
+    cancelled = threading.Event()
+    cancelled.set()
+    assert scan_directory(str(tree), cancelled) == DirectoryScan(directories=1)
+
+
+def test_scan_selected_path(tree):
+    cancelled = threading.Event()
+    assert scan_selected_path(str(tree / "top.txt"), cancelled) == DirectoryScan(
+        files=1, bytes=5
+    )
+    assert scan_selected_path(str(tree / "missing"), cancelled) is None
+
+
+@pytest.mark.gen_test
+def test_local_path_scan(tree, executor):
+    scan = LocalPathScan([str(tree), str(tree / "a"), str(tree / "x")], executor, 2)
+    yield scan.run()
+    assert scan.totals == {
+        "files": 5,
+        "directories": 5,
+        "bytes": 15,
+        "symlinks": 1,
+        "errors": 0,
+    }
+    assert [r.to_dict() for r in scan.results] == [
+        {
+            "path": str(tree),
+            "exists": True,
+            "files": 3,
+            "directories": 3,
+            "bytes": 10,
+            "symlinks": 1,
+            "errors": 0,
+        },
+        {
+            "path": str(tree / "a"),
+            "exists": True,
+            "files": 2,
+            "directories": 2,
+            "bytes": 5,
+            "symlinks": 0,
+            "errors": 0,
+        },
+        {
+            "path": str(tree / "x"),
+            "exists": False,
+            "files": 0,
+            "directories": 0,
+            "bytes": 0,
+            "symlinks": 0,
+            "errors": 0,
+        },
+    ]
+    assert not scan.cancelled.is_set()
+
+
+@pytest.mark.gen_test
+def test_local_path_scan_concurrency(tmp_path, executor, monkeypatch):
+    for index in range(20):
+        (tmp_path / str(index)).mkdir()
+    running, most_running = [], []
+    lock = threading.Lock()
+
+    def counting_scan_directory(path, cancelled):
+        with lock:
+            running.append(path)
+            most_running.append(len(running))
+        try:
+            return scan_directory(path, cancelled)
+        finally:
+            with lock:
+                running.remove(path)
+
+    monkeypatch.setattr(local_scan, "scan_directory", counting_scan_directory)
+    scan = LocalPathScan([str(tmp_path)], executor, 1)
+    yield scan.run()
+    assert scan.totals["directories"] == 21
+    assert max(most_running) == 1
+
+
+@pytest.mark.gen_test
+def test_local_path_scan_progress_and_cancel(tree, executor):
+    scan = LocalPathScan([str(tree)], executor, 1)
+    progress = []
+
+    async def on_progress():
+        progress.append(scan.totals["directories"])
+        scan.cancel()
+
+    yield scan.run(on_progress, progress_interval=0)
+    assert scan.cancelled.is_set()
+    assert len(progress) == 1
+    assert scan.totals["directories"] < 3
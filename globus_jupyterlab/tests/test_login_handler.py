@@ -0,0 +1,150 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+import pytest
+import tornado.gen
+from globus_jupyterlab.handlers.base import BaseAPIHandler
+from globus_jupyterlab.handlers.login import PKCEFlowManager
+
+
+DATA_ACCESS_LOGIN_SCOPES = (
+    "openid urn:globus:auth:scope:transfer.api.globus.org:all"
+    "[https://auth.globus.org/scopes/5d5a7c12-0b1c-4e4b-8d3d-6c3b2f9a1e01/data_access]"
+)
+
+
+@pytest.fixture
+def last_login(monkeypatch):
+    monkeypatch.setattr(
+        BaseAPIHandler.gconfig, "_last_login", "2022-01-01T00:00:00", raising=False
+    )
+    return BaseAPIHandler.gconfig.last_login
+
+
+@pytest.fixture
+def auth_code_exchange(monkeypatch, native_client, auth_client):
+    monkeypatch.setattr(PKCEFlowManager, "get_stored_verifier", lambda self: "v")
+    monkeypatch.setattr(
+        PKCEFlowManager,
+        "get_stored_requested_scopes",
+        lambda self: DATA_ACCESS_LOGIN_SCOPES,
+    )
+    token_response = native_client.oauth2_exchange_code_for_tokens.return_value
+    token_response.http_status = 200
+    return native_client
+
+
+def login_status_url(base_url, **params):
+    return f"{base_url}/login_status?{urlencode(params)}"
+
+
+@pytest.mark.gen_test
+def test_login_status_already_changed(http_client, base_url, last_login, logged_in):
+    response = yield http_client.fetch(login_status_url(base_url, since="earlier"))
+    data = json.loads(response.body)
+    assert data == {"changed": True, "last_login": last_login, "is_logged_in": True}
+
+
+@pytest.mark.gen_test
+def test_login_status_timeout(http_client, base_url, last_login, logged_out):
+    response = yield http_client.fetch(
+        login_status_url(base_url, since=last_login, timeout=0.1)
+    )
+    data = json.loads(response.body)
+    assert data == {"changed": False, "last_login": last_login, "is_logged_in": False}
+
+
+@pytest.mark.gen_test
+def test_login_status_invalid_timeout(http_client, base_url, last_login):
+    response = yield http_client.fetch(
+        login_status_url(base_url, timeout="soon"), raise_error=False
+    )
+    assert response.code == 400
+
+
+@pytest.mark.gen_test(timeout=10)
+def test_login_status_wakes_on_login(
+    http_client, base_url, last_login, logged_in, auth_code_exchange
+):
+    waiting = http_client.fetch(
+        login_status_url(base_url, since=last_login, timeout=60)
+    )
+    yield tornado.gen.sleep(0.1)
+    assert not waiting.done()
+
+    response = yield http_client.fetch(f"{base_url}/oauth_callback_manual?code=foo")
+    assert json.loads(response.body)["result"] == "success"
+
+    response = yield waiting
+    data = json.loads(response.body)
+    assert data["changed"] is True
+    assert data["last_login"] != last_login
+
+
+@pytest.mark.gen_test(timeout=10)
+def test_login_status_without_since_waits_for_next_login(
+    http_client, base_url, last_login, logged_in, auth_code_exchange
+):
+    response = yield http_client.fetch(login_status_url(base_url, timeout=0.1))
+    data = json.loads(response.body)
+    assert data == {"changed": False, "last_login": last_login, "is_logged_in": True}
+
+    waiting = http_client.fetch(login_status_url(base_url, timeout=60))
+    yield tornado.gen.sleep(0.1)
+    assert not waiting.done()
+    yield http_client.fetch(f"{base_url}/oauth_callback_manual?code=foo")
+    data = json.loads((yield waiting).body)
+    assert data["changed"] is True
+    assert data["last_login"] != last_login
+
+
+@pytest.mark.gen_test
+def test_login_records_data_access_consent(
+    http_client, base_url, logged_in, auth_code_exchange
+):
+    BaseAPIHandler.endpoint_metadata.update(
+        "5d5a7c12-0b1c-4e4b-8d3d-6c3b2f9a1e01", requires_data_access=True
+    )
+    yield http_client.fetch(f"{base_url}/oauth_callback_manual?code=foo")
+    metadata = BaseAPIHandler.endpoint_metadata.get(
+        "5d5a7c12-0b1c-4e4b-8d3d-6c3b2f9a1e01"
+    )
+    assert metadata.data_access_consented is True
+
+
+@pytest.mark.gen_test
+def test_login_fetches_identity_set(
+    http_client, base_url, logged_in, auth_code_exchange, auth_client
+):
+    yield http_client.fetch(f"{base_url}/oauth_callback_manual?code=foo")
+    for _ in range(20):
+        if auth_client.oauth2_userinfo.called:
+            break
+        yield tornado.gen.sleep(0.05)
+    identities = BaseAPIHandler.identity_cache.get_identities_for_domains(
+        ["globus.org"]
+    )
+    assert identities == ["7d4657a1-0422-409a-a0ee-077f4a6a99a1"]
+    assert auth_client.oauth2_userinfo.call_count == 1
+
+
+@pytest.mark.gen_test(timeout=10)
+def test_logout_waits_for_revocations_off_sdk_executor(
+    http_client, base_url, native_client, logged_in, monkeypatch
+):
+    monkeypatch.setattr(
+        BaseAPIHandler, "sdk_executor", ThreadPoolExecutor(max_workers=1)
+    )
+    revoked = threading.Event()
+    native_client.oauth2_revoke_token.side_effect = lambda token: revoked.wait(5)
+    logout = http_client.fetch(base_url + "/logout")
+    while not native_client.oauth2_revoke_token.called:
+        yield tornado.gen.sleep(0.01)
+    # The only SDK worker is free while revocations are running
+    assert BaseAPIHandler.sdk_executor.submit(lambda: "free").result(1) == "free"
+    assert not logout.done()
+    revoked.set()
+    response = yield logout
+    assert json.loads(response.body)["result"] == "success"
@@ -1,8 +1,10 @@
 import pytest
 from unittest.mock import Mock
 import pathlib
+import threading
+import time
 from globus_jupyterlab.login_manager import LoginManager
-from globus_sdk.tokenstorage import SimpleJSONFileAdapter
+from globus_jupyterlab.token_storage import CachedJSONFileAdapter
 from globus_jupyterlab.exc import TokenStorageError
 import globus_sdk
 
@@ -55,9 +57,9 @@ def test_login_manager_no_tokens_file(
 
 
 def test_login_manager_store_tokens(monkeypatch, login_manager_mocked_storage_check):
-    monkeypatch.setattr(SimpleJSONFileAdapter, "store", Mock())
+    monkeypatch.setattr(CachedJSONFileAdapter, "store", Mock())
     LoginManager("client_id", pathlib.Path("/foo/bar/mytokens.json")).store({})
-    assert SimpleJSONFileAdapter.store.called
+    assert CachedJSONFileAdapter.store.called
 
 
 def test_login_manager_revoke_tokens(
@@ -78,6 +80,39 @@ def test_login_manager_logout_clears_tokens(
     assert pathlib_unlink.called
 
 
+def test_login_manager_revokes_tokens_concurrently(
+    native_client, logged_in, login_refresh, login_manager
+):
+    num_tokens = len(login_refresh.tokens) * 2
+    # Only passes if every revocation is running at the same time
+    barrier = threading.Barrier(num_tokens, timeout=5)
+    native_client.oauth2_revoke_token.side_effect = lambda token: barrier.wait()
+    assert login_manager.logout(timeout=5) is True
+    assert login_manager.revocation_outcomes == {"revoked": num_tokens}
+
+
+def test_login_manager_logout_timeout(native_client, logged_in, login_manager):
+    revoked = threading.Event()
+    native_client.oauth2_revoke_token.side_effect = lambda token: revoked.wait(5)
+    start = time.time()
+    assert login_manager.logout(timeout=0.1) is True
+    assert time.time() - start < 2
+    # Tokens are cleared without waiting for revocation
+    assert logged_in.tokens == {}
+    revoked.set()
+
+
+def test_login_manager_revocation_failures_counted(
+    native_client, logged_in, login_manager
+):
+    native_client.oauth2_revoke_token.side_effect = [
+        globus_sdk.GlobusError(),
+        None,
+    ]
+    login_manager.logout()
+    assert login_manager.revocation_outcomes == {"revoked": 1, "failed": 1}
+
+
 def test_login_manager_apply_dependent_scopes(login_manager):
     s = login_manager.apply_dependent_scopes("foo", ["bar", "baz"])
     assert s == "foo[bar baz]"
@@ -91,3 +126,44 @@ def test_login_manager_apply_dependent_scopes_twice_error(login_manager):
 def test_login_manager_invalid_path():
     with pytest.raises(TokenStorageError):
         LoginManager("client_id", pathlib.Path(""))
+
+
+def test_login_manager_client_cache_hit(transfer_client, logged_in, login_manager):
+    tc1 = login_manager.get_client("transfer.api.globus.org", globus_sdk.TransferClient)
+    tc2 = login_manager.get_client("transfer.api.globus.org", globus_sdk.TransferClient)
+    assert tc1 is tc2
+    assert globus_sdk.TransferClient.call_count == 1
+    assert login_manager.client_cache_misses == 1
+    assert login_manager.client_cache_hits == 1
+
+
+def test_login_manager_client_cache_new_tokens(
+    transfer_client, logged_in, login_manager
+):
+    login_manager.get_client("transfer.api.globus.org", globus_sdk.TransferClient)
+    logged_in.tokens["transfer.api.globus.org"]["access_token"] = "new_token"
+    login_manager.get_client("transfer.api.globus.org", globus_sdk.TransferClient)
+    assert globus_sdk.TransferClient.call_count == 2
+    assert login_manager.client_cache_misses == 2
+    assert len(login_manager._clients) == 1
+
+
+def test_login_manager_client_cache_cleared(transfer_client, logged_in, login_manager):
+    login_manager.get_client("transfer.api.globus.org", globus_sdk.TransferClient)
+    login_manager.clear_tokens()
+    assert login_manager._clients == {}
+
+
+def test_login_manager_client_cache_on_refresh(
+    transfer_client, auth_client, logged_in, login_manager
+):
+    login_manager.get_client("transfer.api.globus.org", globus_sdk.TransferClient)
+    login_manager.get_client("auth.globus.org", globus_sdk.AuthClient)
+    login_manager.on_refresh(Mock(by_resource_server={"transfer.api.globus.org": {}}))
+    assert login_manager.storage.on_refresh.called
+    assert [k[1] for k in login_manager._clients] == ["auth.globus.org"]
+
+
+def test_login_manager_native_client_cached(native_client, login_manager):
+    assert login_manager.get_native_client() is login_manager.get_native_client()
+    assert globus_sdk.NativeAppAuthClient.call_count == 1
@@ -0,0 +1,180 @@
+import pytest
+from unittest.mock import Mock
+
+from jupyter_server.base.handlers import APIHandler
+from globus_jupyterlab import metrics
+from globus_jupyterlab.globus_config import GlobusConfig
+from globus_jupyterlab.tests.mocks import SDKResponse
+
+
+def get_sample(name: str, **labels) -> float:
+    return metrics.REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.gen_test
+def test_metrics_handler(http_client, base_url, logged_in):
+    yield http_client.fetch(base_url + "/config")
+    response = yield http_client.fetch(base_url + "/metrics")
+    assert response.code == 200
+    assert response.headers["Content-Type"].startswith("text/plain")
+    body = response.body.decode("utf-8")
+    assert "globus_jupyterlab_request_duration_seconds_count" in body
+    assert 'handler="Config"' in body
+
+
+@pytest.mark.gen_test
+def test_request_duration_keeps_parent_on_finish(
+    http_client, base_url, logged_in, monkeypatch
+):
+    parent_on_finish = Mock()
+    monkeypatch.setattr(APIHandler, "on_finish", parent_on_finish, raising=False)
+    yield http_client.fetch(base_url + "/config")
+    assert parent_on_finish.called
+
+
+@pytest.mark.gen_test
+def test_request_and_globus_call_durations(
+    http_client, base_url, transfer_client, logged_in
+):
+    transfer_client.operation_ls.return_value = SDKResponse(data={"DATA": []})
+    request_labels = dict(handler="OperationLS", method="GET", status_code="200")
+    call_labels = dict(service="transfer", method="operation_ls")
+    serialize_labels = dict(handler="OperationLS")
+    requests_before = get_sample(
+        "globus_jupyterlab_request_duration_seconds_count", **request_labels
+    )
+    calls_before = get_sample(
+        "globus_jupyterlab_globus_call_duration_seconds_count", **call_labels
+    )
+    serialized_before = get_sample(
+        "globus_jupyterlab_json_serialization_duration_seconds_count",
+        **serialize_labels,
+    )
+
+    response = yield http_client.fetch(base_url + "/operation_ls?endpoint=mypath")
+    assert response.code == 200
+
+    assert (
+        get_sample("globus_jupyterlab_request_duration_seconds_count", **request_labels)
+        == requests_before + 1
+    )
+    assert (
+        get_sample(
+            "globus_jupyterlab_globus_call_duration_seconds_count", **call_labels
+        )
+        == calls_before + 1
+    )
+    assert (
+        get_sample(
+            "globus_jupyterlab_json_serialization_duration_seconds_count",
+            **serialize_labels,
+        )
+        == serialized_before + 1
+    )
+
+
+@pytest.mark.gen_test
+def test_globus_api_errors_counted_by_exception_handler(
+    http_client, base_url, transfer_client, sdk_error, logged_in
+):
+    transfer_client.operation_ls.side_effect = sdk_error(
+        "", code="ConsentRequired", http_status=403
+    )
+    labels = dict(
+        handler="OperationLS",
+        exception_handler="GCSv54DataAccessConsent",
+        http_status="403",
+    )
+    before = get_sample("globus_jupyterlab_globus_api_errors_total", **labels)
+    response = yield http_client.fetch(
+        base_url + "/operation_ls?endpoint=mypath", raise_error=False
+    )
+    assert response.code == 401
+    assert (
+        get_sample("globus_jupyterlab_globus_api_errors_total", **labels) == before + 1
+    )
+
+
+@pytest.mark.gen_test
+def test_unclassified_globus_api_errors_counted(
+    http_client, base_url, transfer_client, sdk_error, logged_in
+):
+    transfer_client.operation_ls.side_effect = sdk_error(
+        "Not found", code="ClientError.NotFound", http_status=404
+    )
+    labels = dict(
+        handler="OperationLS", exception_handler="unclassified", http_status="404"
+    )
+    before = get_sample("globus_jupyterlab_globus_api_errors_total", **labels)
+    response = yield http_client.fetch(
+        base_url + "/operation_ls?endpoint=mypath", raise_error=False
+    )
+    assert response.code == 404
+    assert (
+        get_sample("globus_jupyterlab_globus_api_errors_total", **labels) == before + 1
+    )
+    assert (
+        get_sample(
+            "globus_jupyterlab_globus_api_errors_total",
+            handler="OperationLS",
+            exception_handler="NoneType",
+            http_status="404",
+        )
+        == 0
+    )
+
+
+def test_config_resolution_duration():
+    gconfig = GlobusConfig()
+    resolved = get_sample(
+        "globus_jupyterlab_config_resolution_duration_seconds_count", result="resolved"
+    )
+    cached = get_sample(
+        "globus_jupyterlab_config_resolution_duration_seconds_count", result="cached"
+    )
+    gconfig.get_snapshot()
+    gconfig.get_snapshot()
+    assert (
+        get_sample(
+            "globus_jupyterlab_config_resolution_duration_seconds_count",
+            result="resolved",
+        )
+        == resolved + 1
+    )
+    assert (
+        get_sample(
+            "globus_jupyterlab_config_resolution_duration_seconds_count",
+            result="cached",
+        )
+        >= cached + 1
+    )
+
+
+def test_token_operation_duration(login_manager, logged_in):
+    labels = dict(operation="churn")
+    before = get_sample(
+        "globus_jupyterlab_token_operation_duration_seconds_count", **labels
+    )
+    login_manager.churn_tokens()
+    assert (
+        get_sample("globus_jupyterlab_token_operation_duration_seconds_count", **labels)
+        == before + 1
+    )
+
+
+def test_timed_globus_call():
+    func = Mock(return_value="result")
+    labels = dict(service="test", method="func")
+    before = get_sample(
+        "globus_jupyterlab_globus_call_duration_seconds_count", **labels
+    )
+    assert metrics.timed_globus_call("test", "func", func)(1, a=2) == "result"
+    func.assert_called_once_with(1, a=2)
+
+    func.side_effect = ValueError()
+    with pytest.raises(ValueError):
+        metrics.timed_globus_call("test", "func", func)()
+    assert (
+        get_sample("globus_jupyterlab_globus_call_duration_seconds_count", **labels)
+        == before + 2
+    )
@@ -0,0 +1,62 @@
+import pytest
+from globus_jupyterlab.exc import TransferSubmission
+from globus_jupyterlab.path_translation import PathTranslator, find_missing_paths
+
+
+@pytest.mark.parametrize(
+    "posix_basepath, collection_basepath, path, expected",
+    [
+        ("", "", "foo.txt", "foo.txt"),
+        ("/home/jovyan/", "", "/home/jovyan/foo.txt", "foo.txt"),
+        ("/home/jovyan", "", "/home/jovyan/dir/foo.txt", "dir/foo.txt"),
+        ("", "/shared", "foo.txt", "/shared/foo.txt"),
+        ("", "shared", "foo.txt", "shared/foo.txt"),
+        ("/home/jovyan/", "/shared/", "/home/jovyan/foo.txt", "/shared/foo.txt"),
+    ],
+)
+def test_path_translator(posix_basepath, collection_basepath, path, expected):
+    translator = PathTranslator(posix_basepath, collection_basepath)
+    assert translator.translate(path) == expected
+
+
+def test_path_translator_outside_posix_basepath():
+    translator = PathTranslator("/home/jovyan", "")
+    with pytest.raises(TransferSubmission):
+        translator.translate("/some/other/path/foo.txt")
+
+
+def test_find_missing_paths(tmp_path):
+    (tmp_path / "exists.txt").touch()
+    paths = [str(tmp_path / name) for name in ("exists.txt", "a.txt", "b.txt")]
+    assert find_missing_paths(paths) == paths[1:]
+    assert find_missing_paths(paths, limit=1) == paths[1:2]
+
+
+@pytest.mark.parametrize("posix_basepath", ["", "/", "/home/jovyan", "/home/jovyan/"])
+@pytest.mark.parametrize("collection_basepath", ["", "/", ".", "/shared/", "shared"])
+@pytest.mark.parametrize(
+    "path",
+    [
+        "foo.txt",
+        "/home/jovyan",
+        "/home/jovyan/",
+        "/home/jovyan/foo.txt",
+        "/home/jovyan//foo.txt",
+        "/home/jovyan/./dir/",
+        "/home/jovyan/../foo.txt",
+        "/home/jovyanfoo.txt",
+        "./foo.txt",
+        "/other/foo.txt",
+    ],
+)
+def test_path_translator_fast_path_matches_pathlib(
+    posix_basepath, collection_basepath, path
+):
+    translator = PathTranslator(posix_basepath, collection_basepath)
+    try:
+        expected = translator._translate_pathlib(path)
+    except TransferSubmission:
+        with pytest.raises(TransferSubmission):
+            translator.translate(path)
+    else:
+        assert translator.translate(path) == expected
@@ -0,0 +1,114 @@
+import http.server
+import json
+import socket
+import threading
+
+import pytest
+import requests
+
+from globus_jupyterlab.globus_config import GlobusConfig
+from globus_jupyterlab.submission_client import TransferSubmissionClient
+
+
+class StubSubmissionService(http.server.BaseHTTPRequestHandler):
+    """Fails the first ``failures`` submissions with a 503, then submits each
+    Idempotency-Key only once."""
+
+    failures = 0
+    requests_seen = []
+    submitted = {}
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        key = self.headers["Idempotency-Key"]
+        type(self).requests_seen.append((key, body))
+        if len(self.requests_seen) <= self.failures:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        task_id = self.submitted.setdefault(key, f"task{len(self.submitted)}")
+        response = json.dumps({"task_id": task_id}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def submission_service(monkeypatch):
+    monkeypatch.setattr(StubSubmissionService, "requests_seen", [])
+    monkeypatch.setattr(StubSubmissionService, "submitted", {})
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubSubmissionService)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/transfer"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def submission_client(monkeypatch):
+    monkeypatch.setattr(TransferSubmissionClient, "backoff_factor", 0)
+    client = TransferSubmissionClient(GlobusConfig())
+    yield client
+    client.close()
+
+
+def test_submit(submission_client, submission_service):
+    response = submission_client.submit(submission_service, "token", {"foo": "bar"})
+    assert response.json() == {"task_id": "task0"}
+    key, body = StubSubmissionService.requests_seen[0]
+    assert body == {"foo": "bar"}
+    assert key
+
+
+def test_submit_retries_with_same_idempotency_key(
+    submission_client, submission_service, monkeypatch
+):
+    monkeypatch.setattr(StubSubmissionService, "failures", 2)
+    response = submission_client.submit(submission_service, "token", {})
+    assert response.status_code == 200
+    keys = [key for key, _ in StubSubmissionService.requests_seen]
+    assert len(keys) == 3
+    assert len(set(keys)) == 1
+
+
+def test_submit_gives_up_after_retries(
+    submission_client, submission_service, monkeypatch
+):
+    monkeypatch.setenv("GLOBUS_TRANSFER_SUBMISSION_RETRIES", "1")
+    monkeypatch.setattr(StubSubmissionService, "failures", 5)
+    response = submission_client.submit(submission_service, "token", {})
+    assert response.status_code == 503
+    assert len(StubSubmissionService.requests_seen) == 2
+
+
+def test_resubmitting_a_key_is_not_submitted_twice(
+    submission_client, submission_service
+):
+    first = submission_client.submit(submission_service, "token", {}, "key")
+    second = submission_client.submit(submission_service, "token", {}, "key")
+    assert first.json() == second.json()
+    assert len(StubSubmissionService.submitted) == 1
+
+
+def test_submit_reuses_connections(submission_client, submission_service):
+    submission_client.submit(submission_service, "token", {})
+    session = submission_client.get_session()
+    submission_client.submit(submission_service, "token", {})
+    assert submission_client.get_session() is session
+
+
+def test_submit_connection_error(submission_client, monkeypatch):
+    monkeypatch.setenv("GLOBUS_TRANSFER_SUBMISSION_RETRIES", "0")
+    # Find a port with nothing listening on it
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    with pytest.raises(requests.exceptions.ConnectionError):
+        submission_client.submit(f"http://127.0.0.1:{port}/transfer", "token", {})
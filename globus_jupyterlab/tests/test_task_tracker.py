@@ -0,0 +1,101 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from globus_jupyterlab.globus_config import GlobusConfig
+from globus_jupyterlab.task_tracker import TaskTracker
+from globus_jupyterlab.tests.mocks import SDKResponse
+
+
+@pytest.fixture
+def tracker(login_manager, logged_in):
+    return TaskTracker(login_manager, GlobusConfig(), ThreadPoolExecutor(max_workers=1))
+
+
+def task_list_response(*tasks):
+    return SDKResponse(
+        data={"DATA": [{"task_id": task_id, "status": s} for task_id, s in tasks]}
+    )
+
+
+@pytest.mark.parametrize("age, interval", [(0, 2), (100, 10), (100000, 60)])
+def test_poll_interval(tracker, age, interval):
+    assert tracker.get_poll_interval(age) == interval
+
+
+def test_track(tracker, monkeypatch):
+    monkeypatch.setattr(tracker, "start", lambda: None)
+    tracker.track(["task1", "task2", None], label="my transfer")
+    tasks = tracker.get_tasks()
+    assert [t["task_id"] for t in tasks] == ["task2", "task1"]
+    assert tasks[0]["status"] == "ACTIVE"
+    assert tasks[0]["label"] == "my transfer"
+    assert "next_check" not in tasks[0]
+    assert tracker.version == 1
+
+
+def test_get_due_tasks(tracker, monkeypatch):
+    monkeypatch.setattr(tracker, "start", lambda: None)
+    tracker.track(["due", "not_due", "done"])
+    tracker._tasks["due"]["next_check"] = 0
+    tracker._tasks["done"].update({"next_check": 0, "status": "SUCCEEDED"})
+    assert tracker.get_due_tasks(time.time()) == ["due"]
+
+
+@pytest.mark.gen_test
+def test_check_tasks_batched(tracker, transfer_client, monkeypatch):
+    monkeypatch.setattr(tracker, "start", lambda: None)
+    transfer_client.task_list.return_value = task_list_response(
+        ("task1", "SUCCEEDED"), ("task2", "ACTIVE")
+    )
+    tracker.track(["task1", "task2"])
+    version = tracker.version
+    yield tracker.check_tasks(["task1", "task2"])
+    transfer_client.task_list.assert_called_once_with(
+        filter="task_id:task1,task2", limit=2
+    )
+    assert tracker.version == version + 1
+    assert tracker.get_tasks(since=version) == [
+        dict(tracker.serialize(tracker._tasks["task1"]))
+    ]
+    assert tracker._tasks["task1"]["status"] == "SUCCEEDED"
+    assert tracker.get_next_check() == tracker._tasks["task2"]["next_check"]
+
+
+@pytest.mark.gen_test
+def test_check_tasks_error(tracker, transfer_client, sdk_error, monkeypatch):
+    monkeypatch.setattr(tracker, "start", lambda: None)
+    transfer_client.task_list.side_effect = sdk_error("oops", http_status=502)
+    tracker.track(["task1"])
+    tracker._tasks["task1"]["next_check"] = 0
+    version = tracker.version
+    yield tracker.check_tasks(["task1"])
+    assert tracker.version == version
+    assert tracker._tasks["task1"]["next_check"] > time.time()
+
+
+def test_drop_old_tasks_prefers_finished(tracker, monkeypatch):
+    monkeypatch.setattr(tracker, "start", lambda: None)
+    monkeypatch.setattr(tracker, "max_tasks", 2)
+    tracker.track(["active", "finished"])
+    tracker._tasks["finished"]["status"] = "FAILED"
+    tracker.track(["new"])
+    assert list(tracker._tasks) == ["active", "new"]
+
+
+@pytest.mark.gen_test
+def test_poller(tracker, transfer_client):
+    transfer_client.task_list.return_value = task_list_response(("task1", "FAILED"))
+    tracker.track(["task1"])
+    version = tracker.version
+    tracker._tasks["task1"]["next_check"] = 0
+    tracker._wake_poller.set()
+    assert (yield tracker.wait_for_update(version, timeout=5)) is True
+    assert tracker._tasks["task1"]["status"] == "FAILED"
+    assert tracker.get_next_check() is None
+    tracker.stop()
+
+
+@pytest.mark.gen_test
+def test_wait_for_update_timeout(tracker):
+    assert (yield tracker.wait_for_update(tracker.version, timeout=0.05)) is False
@@ -0,0 +1,82 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import globus_sdk
+import pytest
+from globus_jupyterlab.globus_config import GlobusConfig
+from globus_jupyterlab.token_refresh import TokenRefresher
+
+
+@pytest.fixture
+def token_refresher(login_manager, monkeypatch):
+    monkeypatch.setenv("GLOBUS_TOKEN_REFRESH_MARGIN", "300")
+    monkeypatch.setenv("GLOBUS_TOKEN_REFRESH_JITTER", "0")
+    refresher = TokenRefresher(
+        login_manager, GlobusConfig(), ThreadPoolExecutor(max_workers=1)
+    )
+    yield refresher
+    refresher.stop()
+
+
+@pytest.fixture
+def refresh_authorizer(monkeypatch):
+    monkeypatch.setattr(globus_sdk, "RefreshTokenAuthorizer", Mock())
+    return globus_sdk.RefreshTokenAuthorizer
+
+
+def set_expiry(token_storage, expires_at):
+    for token_data in token_storage.tokens.values():
+        token_data["expires_at_seconds"] = expires_at
+
+
+def test_next_refresh_without_refresh_tokens(logged_in, token_refresher):
+    assert token_refresher.get_next_refresh() is None
+
+
+def test_next_refresh(login_refresh, token_refresher):
+    set_expiry(login_refresh, 10000)
+    assert token_refresher.get_next_refresh() == 10000 - 300
+
+
+def test_next_refresh_jitter(login_refresh, token_refresher, monkeypatch):
+    monkeypatch.setenv("GLOBUS_TOKEN_REFRESH_JITTER", "60")
+    set_expiry(login_refresh, 10000)
+    next_refresh = token_refresher.get_next_refresh()
+    assert 10000 - 360 <= next_refresh <= 10000 - 300
+    # Jitter is only chosen again after a refresh
+    assert token_refresher.get_next_refresh() == next_refresh
+
+
+@pytest.mark.gen_test
+def test_check_tokens_not_due(login_refresh, token_refresher, refresh_authorizer):
+    set_expiry(login_refresh, int(time.time()) + 3600)
+    yield token_refresher.check_tokens()
+    assert not refresh_authorizer.called
+
+
+@pytest.mark.gen_test
+def test_check_tokens_due(login_refresh, token_refresher, refresh_authorizer):
+    set_expiry(login_refresh, int(time.time()) + 60)
+    yield token_refresher.check_tokens()
+    assert refresh_authorizer.call_count == len(login_refresh.tokens)
+    assert refresh_authorizer.return_value.ensure_valid_token.called
+    assert token_refresher._refreshing is False
+
+
+@pytest.mark.gen_test
+def test_check_tokens_failed_refresh(
+    login_refresh, token_refresher, refresh_authorizer, monkeypatch
+):
+    monkeypatch.setattr(globus_sdk, "AuthAPIError", Exception)
+    refresh_authorizer.return_value.ensure_valid_token.side_effect = Exception
+    set_expiry(login_refresh, int(time.time()) + 60)
+    yield token_refresher.check_tokens()
+    assert login_refresh.tokens == {}
+
+
+def test_is_logged_in_does_not_refresh(
+    login_expired, login_refresh, login_manager, refresh_authorizer
+):
+    assert login_manager.is_logged_in() is True
+    assert not refresh_authorizer.called
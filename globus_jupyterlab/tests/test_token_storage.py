@@ -0,0 +1,73 @@
+import json
+import os
+import stat
+import copy
+from unittest.mock import Mock
+import pytest
+from globus_sdk.tokenstorage import SimpleJSONFileAdapter
+from globus_jupyterlab.token_storage import CachedJSONFileAdapter
+from globus_jupyterlab.tests.mocks import MOCK_TOKENS
+
+
+@pytest.fixture
+def token_file(tmp_path):
+    return tmp_path / "tokens.json"
+
+
+@pytest.fixture
+def storage(token_file) -> CachedJSONFileAdapter:
+    adapter = CachedJSONFileAdapter(str(token_file))
+    adapter.store(Mock(by_resource_server=copy.deepcopy(MOCK_TOKENS)))
+    return adapter
+
+
+def test_cached_storage_compatible_format(storage, token_file):
+    simple_adapter = SimpleJSONFileAdapter(str(token_file))
+    assert simple_adapter.get_by_resource_server() == MOCK_TOKENS
+
+
+def test_cached_storage_reads_file_once(storage, monkeypatch):
+    raw_load = Mock(wraps=storage._raw_load)
+    monkeypatch.setattr(storage, "_raw_load", raw_load)
+    storage._data = None
+    for _ in range(5):
+        assert storage.get_by_resource_server() == MOCK_TOKENS
+        assert storage.get_token_data("auth.globus.org")
+    assert raw_load.call_count == 1
+
+
+def test_cached_storage_detects_outside_changes(storage, token_file):
+    data = json.loads(token_file.read_text())
+    data["by_rs"].pop("auth.globus.org")
+    # Write through a rename, the way other token writers would
+    new_file = token_file.with_name("new_tokens.json")
+    new_file.write_text(json.dumps(data))
+    os.replace(new_file, token_file)
+    assert list(storage.get_by_resource_server()) == ["transfer.api.globus.org"]
+
+
+def test_cached_storage_file_removed(storage, token_file):
+    os.unlink(token_file)
+    assert storage.get_by_resource_server() == {}
+
+
+def test_cached_storage_write_through(storage, token_file):
+    new_tokens = {"my_tokens": {"access_token": "my_access_token"}}
+    storage.on_refresh(Mock(by_resource_server=new_tokens))
+    on_disk = json.loads(token_file.read_text())["by_rs"]
+    assert on_disk["my_tokens"] == {"access_token": "my_access_token"}
+    assert storage.get_token_data("my_tokens") == {"access_token": "my_access_token"}
+    assert "transfer.api.globus.org" in on_disk
+
+
+def test_cached_storage_user_only_permissions(storage, token_file):
+    assert stat.S_IMODE(os.stat(token_file).st_mode) == 0o600
+    assert os.listdir(token_file.parent) == ["tokens.json"]
+
+
+def test_cached_storage_returns_copies(storage, token_file):
+    storage.get_by_resource_server()["transfer.api.globus.org"]["access_token"] = "x"
+    storage.get_token_data("auth.globus.org")["access_token"] = "y"
+    assert storage.get_by_resource_server() == MOCK_TOKENS
+    storage.on_refresh(Mock(by_resource_server={}))
+    assert json.loads(token_file.read_text())["by_rs"] == MOCK_TOKENS
@@ -0,0 +1,141 @@
+import asyncio
+import json
+import pytest
+
+from globus_jupyterlab.globus_config import GlobusConfig
+from globus_jupyterlab.tests.mocks import SDKResponse
+from globus_jupyterlab.tracing import Tracer
+
+
+@pytest.fixture
+def trace_path(monkeypatch, tmp_path):
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setenv("GLOBUS_TRACING", "true")
+    monkeypatch.setenv("GLOBUS_TRACE_PATH", str(path))
+    return path
+
+
+def read_spans(path) -> dict:
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    return {span["name"]: span for span in spans}
+
+
+def test_tracing_disabled_by_default(tmp_path, monkeypatch):
+    monkeypatch.setenv("GLOBUS_TRACE_PATH", str(tmp_path / "traces.jsonl"))
+    tracer = Tracer(GlobusConfig())
+    with tracer.trace("root") as root:
+        with tracer.span("child") as child:
+            assert tracer.get_trace_headers() == {}
+    assert root is None and child is None
+    assert not (tmp_path / "traces.jsonl").exists()
+
+
+def test_spans_nest_and_export(trace_path):
+    tracer = Tracer(GlobusConfig())
+    with tracer.trace("root", kind="test") as root:
+        with tracer.span("child") as child:
+            with tracer.span("grandchild"):
+                pass
+            headers = tracer.get_trace_headers()
+    assert headers == {"traceparent": f"00-{root.trace_id}-{child.span_id}-01"}
+    spans = read_spans(trace_path)
+    assert set(spans) == {"root", "child", "grandchild"}
+    assert {span["trace_id"] for span in spans.values()} == {root.trace_id}
+    assert spans["root"]["parent_id"] is None
+    assert spans["root"]["attributes"] == {"kind": "test"}
+    assert spans["child"]["parent_id"] == spans["root"]["span_id"]
+    assert spans["grandchild"]["parent_id"] == spans["child"]["span_id"]
+    assert spans["root"]["duration"] >= spans["child"]["duration"]
+
+
+def test_span_outside_trace_is_not_recorded(trace_path):
+    tracer = Tracer(GlobusConfig())
+    with tracer.span("orphan") as span:
+        assert span is None
+    assert not trace_path.exists()
+
+
+def test_span_records_errors(trace_path):
+    tracer = Tracer(GlobusConfig())
+    with pytest.raises(ValueError):
+        with tracer.trace("root"):
+            with tracer.span("child"):
+                raise ValueError()
+    spans = read_spans(trace_path)
+    assert spans["child"]["error"] == "ValueError"
+    assert spans["root"]["error"] == "ValueError"
+
+
+def test_trace_continues_traceparent(trace_path):
+    tracer = Tracer(GlobusConfig())
+    trace_id, parent_id = "a" * 32, "b" * 16
+    with tracer.trace("root", traceparent=f"00-{trace_id}-{parent_id}-01") as root:
+        pass
+    assert (root.trace_id, root.parent_id) == (trace_id, parent_id)
+
+
+@pytest.mark.parametrize(
+    "traceparent", [None, "", "garbage", f"00-{'0' * 32}-{'b' * 16}-01"]
+)
+def test_invalid_traceparent_starts_new_trace(traceparent):
+    assert Tracer.parse_traceparent(traceparent) is None
+
+
+def test_spans_nest_across_tasks(trace_path):
+    tracer = Tracer(GlobusConfig())
+
+    async def child(name):
+        with tracer.span(name):
+            await asyncio.sleep(0)
+
+    async def run():
+        with tracer.trace("root"):
+            await asyncio.gather(child("a"), child("b"))
+
+    asyncio.run(run())
+    spans = read_spans(trace_path)
+    assert spans["a"]["parent_id"] == spans["root"]["span_id"]
+    assert spans["b"]["parent_id"] == spans["root"]["span_id"]
+
+
+@pytest.mark.gen_test
+def test_operation_ls_traced(
+    http_client, base_url, transfer_client, trace_path, logged_in
+):
+    transfer_client.operation_ls.return_value = SDKResponse(data={"DATA": []})
+    trace_id = "c" * 32
+    response = yield http_client.fetch(
+        base_url + "/operation_ls?endpoint=mypath",
+        headers={"traceparent": f"00-{trace_id}-{'d' * 16}-01"},
+    )
+    assert response.code == 200
+    spans = read_spans(trace_path)
+    root = spans["OperationLS.sdk_wrapper_call"]
+    assert root["trace_id"] == trace_id
+    assert root["attributes"]["status_code"] == 200
+    for name in ["is_logged_in", "transfer_client_call", "dumps"]:
+        assert spans[name]["parent_id"] == root["span_id"]
+    assert (
+        spans["transfer.operation_ls"]["parent_id"]
+        == spans["transfer_client_call"]["span_id"]
+    )
+
+
+@pytest.mark.gen_test
+def test_login_url_phases_traced(
+    http_client, base_url, transfer_client, sdk_error, trace_path, logged_in
+):
+    transfer_client.operation_ls.side_effect = sdk_error(
+        "", code="ConsentRequired", http_status=403
+    )
+    response = yield http_client.fetch(
+        base_url + "/operation_ls?endpoint=mypath", raise_error=False
+    )
+    assert response.code == 401
+    spans = read_spans(trace_path)
+    root = spans["OperationLS.sdk_wrapper_call"]
+    assert root["attributes"]["status_code"] == 401
+    assert spans["get_login_exception_handler"]["attributes"] == {
+        "exception_handler": "GCSv54DataAccessConsent"
+    }
+    assert spans["get_globus_login_url"]["parent_id"] == root["span_id"]
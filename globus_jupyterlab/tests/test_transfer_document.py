@@ -0,0 +1,126 @@
+import json
+import tracemalloc
+
+import pytest
+from globus_jupyterlab.exc import InvalidTransferDocument
+from globus_jupyterlab.models import TransferModel
+from globus_jupyterlab.transfer_document import TransferDocument, TransferItem
+
+
+def transfer_doc(items):
+    return {
+        "source_endpoint": "mysource",
+        "destination_endpoint": "mydest",
+        "label": "my label",
+        "DATA": items,
+    }
+
+
+def test_transfer_document_items():
+    body = json.dumps(
+        transfer_doc(
+            [
+                {"source_path": "foo", "destination_path": "bar", "recursive": True},
+                {"source_path": "baz", "destination_path": "qux", "recursive": 0},
+            ]
+        )
+    )
+    document = TransferDocument.from_json(body)
+    assert document.source_endpoint == "mysource"
+    assert document.destination_endpoint == "mydest"
+    assert document.label == "my label"
+    assert len(document) == 2
+    assert list(document.iter_items()) == [
+        TransferItem("foo", "bar", True),
+        TransferItem("baz", "qux", False),
+    ]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        "not json",
+        "[]",
+        json.dumps({"destination_endpoint": "mydest", "DATA": []}),
+        json.dumps({"source_endpoint": 1, "destination_endpoint": "d", "DATA": []}),
+        json.dumps(dict(transfer_doc([]), label=["not a string"])),
+        json.dumps(dict(transfer_doc([]), DATA={})),
+    ],
+)
+def test_transfer_document_invalid(body):
+    with pytest.raises(InvalidTransferDocument):
+        TransferDocument.from_json(body)
+
+
+@pytest.mark.parametrize(
+    "item",
+    [
+        "foo",
+        {"destination_path": "bar", "recursive": False},
+        {"source_path": "foo", "destination_path": None, "recursive": False},
+        {"source_path": "foo", "destination_path": "bar"},
+        {"source_path": "foo", "destination_path": "bar", "recursive": "yes"},
+    ],
+)
+def test_transfer_document_invalid_item(item):
+    valid = {"source_path": "foo", "destination_path": "bar", "recursive": False}
+    document = TransferDocument.from_json(json.dumps(transfer_doc([valid, item])))
+    items = document.iter_items()
+    assert next(items) == TransferItem("foo", "bar", False)
+    with pytest.raises(InvalidTransferDocument, match=r"DATA\[1\]"):
+        next(items)
+
+
+def test_transfer_document_items_consumed_once():
+    document = TransferDocument.from_json(json.dumps(transfer_doc([])))
+    assert list(document.iter_items()) == []
+    with pytest.raises(RuntimeError):
+        list(document.iter_items())
+
+
+def test_transfer_document_releases_raw_items():
+    raw_items = [
+        {"source_path": f"f{n}", "destination_path": f"f{n}", "recursive": False}
+        for n in range(3)
+    ]
+    document = TransferDocument("mysource", "mydest", None, raw_items)
+    items = document.iter_items()
+    next(items)
+    assert raw_items[0] is None and raw_items[1] is not None
+    list(items)
+    assert raw_items == [None, None, None]
+
+
+def test_transfer_document_peak_memory():
+    """Consuming items one at a time should use much less memory than validating
+    the whole document up front with pydantic."""
+    body = json.dumps(
+        transfer_doc(
+            [
+                {
+                    "source_path": f"/home/jovyan/file{n}.txt",
+                    "destination_path": f"/home/jovyan/file{n}.txt",
+                    "recursive": False,
+                }
+                for n in range(20000)
+            ]
+        )
+    )
+
+    def measure_peak(func):
+        tracemalloc.start()
+        try:
+            func()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def consume_model():
+        for item in TransferModel(**json.loads(body)).DATA:
+            pass
+
+    def consume_document():
+        for item in TransferDocument.from_json(body).iter_items():
+            pass
+
+    assert measure_peak(consume_document) < measure_peak(consume_model) * 0.75
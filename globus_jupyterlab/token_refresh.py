@@ -0,0 +1,88 @@
+import logging
+import random
+import time
+from concurrent.futures import Executor
+from typing import Optional
+
+import tornado.ioloop
+
+from globus_jupyterlab.globus_config import GlobusConfig
+from globus_jupyterlab.login_manager import LoginManager
+
+log = logging.getLogger(__name__)
+
+
+class TokenRefresher:
+    """
+    Refresh access tokens on the IOLoop in the background, shortly before they expire,
+    instead of inline on whichever request arrives after they have expired. Tokens
+    are refreshed GLOBUS_TOKEN_REFRESH_MARGIN seconds before expiry, plus a random
+    jitter of up to GLOBUS_TOKEN_REFRESH_JITTER seconds which is chosen again after
+    each refresh. Refreshing calls Globus Auth, so it is run in the given executor.
+    """
+
+    # How often, in seconds, stored tokens are checked
+    check_interval = 30
+
+    def __init__(
+        self, login_manager: LoginManager, gconfig: GlobusConfig, executor: Executor
+    ):
+        self.login_manager = login_manager
+        self.gconfig = gconfig
+        self.executor = executor
+        self._jitter = None
+        self._refreshing = False
+        self._periodic_callback = None
+
+    def start(self):
+        if self._periodic_callback is not None:
+            return
+        self._periodic_callback = tornado.ioloop.PeriodicCallback(
+            self.schedule_check, self.check_interval * 1000
+        )
+        self._periodic_callback.start()
+        self.schedule_check()
+
+    def stop(self):
+        if self._periodic_callback is not None:
+            self._periodic_callback.stop()
+            self._periodic_callback = None
+
+    def schedule_check(self):
+        tornado.ioloop.IOLoop.current().spawn_callback(self.check_tokens)
+
+    def get_refresh_window(self) -> float:
+        """The number of seconds before expiry tokens will next be refreshed"""
+        config = self.gconfig.get_snapshot()
+        if self._jitter is None:
+            self._jitter = random.uniform(0, config.token_refresh_jitter)
+        return config.token_refresh_margin + self._jitter
+
+    def get_next_refresh(self) -> Optional[int]:
+        """Fetch the time tokens will next be refreshed, in seconds since the epoch.
+        Returns None if there are no tokens which can be refreshed."""
+        expiry = self.login_manager.get_next_token_expiry()
+        if expiry is None:
+            return None
+        return int(expiry - self.get_refresh_window())
+
+    async def check_tokens(self):
+        """Refresh tokens if they are due. Only one refresh runs at a time."""
+        if self._refreshing:
+            return
+        next_refresh = self.get_next_refresh()
+        if next_refresh is None or time.time() < next_refresh:
+            return
+        self._refreshing = True
+        try:
+            refreshed = await tornado.ioloop.IOLoop.current().run_in_executor(
+                self.executor,
+                self.login_manager.refresh_tokens,
+                self.get_refresh_window(),
+            )
+            log.info(f"Refreshed tokens for {refreshed} resource servers")
+        except Exception:
+            log.error("Unexpected error while refreshing tokens", exc_info=True)
+        finally:
+            self._refreshing = False
+            self._jitter = None
@@ -0,0 +1,81 @@
+import copy
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Optional, Tuple
+
+import globus_sdk
+from globus_sdk.tokenstorage import SimpleJSONFileAdapter
+
+log = logging.getLogger(__name__)
+
+
+def write_json_atomically(filename: str, data: dict, prefix: str):
+    """Write JSON to a temporary file, and rename it over filename, so readers never
+    see a partial write. The file is readable and writable only by the current user."""
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_filename = tempfile.mkstemp(dir=directory, prefix=prefix, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(temp_filename, filename)
+    except BaseException:
+        try:
+            os.unlink(temp_filename)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class CachedJSONFileAdapter(SimpleJSONFileAdapter):
+    """
+    A JSON token storage adapter which keeps the parsed token file in memory.
+
+    The SimpleJSONFileAdapter re-reads and re-parses the token file on every
+    lookup. This adapter only reads the file again if it changed on disk, which
+    is checked by comparing the inode, mtime and size of the file. Tokens are
+    written through to disk on ``store`` and ``on_refresh`` by writing a temporary
+    file and renaming it over the token file, so readers never see a partial write.
+    The file format is the same as SimpleJSONFileAdapter.
+    """
+
+    def __init__(self, filename: str):
+        super().__init__(filename)
+        self._data = None
+        self._file_signature = None
+        self._lock = threading.RLock()
+
+    def _get_file_signature(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _load(self) -> dict:
+        with self._lock:
+            # Check the file signature before reading, so a change made while
+            # reading is picked up on the next lookup.
+            signature = self._get_file_signature()
+            if self._data is None or signature != self._file_signature:
+                log.debug(f"Loading tokens from {self.filename}")
+                self._data = super()._load()
+                self._file_signature = signature
+            return self._data
+
+    def _write(self, data: dict):
+        write_json_atomically(self.filename, data, prefix=".globus-tokens-")
+        self._data = data
+        self._file_signature = self._get_file_signature()
+
+    def store(self, token_response: globus_sdk.OAuthTokenResponse) -> None:
+        with self._lock:
+            data = copy.deepcopy(self._load())
+            data["by_rs"].update(token_response.by_resource_server)
+            self._write(data)
+
+    def get_by_resource_server(self) -> dict:
+        # Callers get copies, so they can't change the cached tokens
+        return copy.deepcopy(self._load()["by_rs"])
@@ -0,0 +1,182 @@
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import re
+import secrets
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+from globus_jupyterlab.globus_config import GlobusConfig
+
+log = logging.getLogger(__name__)
+
+TRACEPARENT_HEADER = "traceparent"
+# W3C Trace Context: version-trace_id-parent_id-flags
+TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+current_span = contextvars.ContextVar("globus_jupyterlab_span", default=None)
+
+
+class Span:
+    """A timed phase of a request. Spans are nested by the span they were started
+    within, and all spans started under one root share its trace."""
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str] = None,
+        trace: Optional[List["Span"]] = None,
+        attributes: Optional[dict] = None,
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = dict(attributes or {})
+        self.error = None
+        self.start_time = time.time()
+        self.duration = None
+        self._start = time.perf_counter()
+        # Every span in the trace, shared with the root span
+        self.trace = trace if trace is not None else []
+        self.trace.append(self)
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def end(self):
+        self.duration = time.perf_counter() - self._start
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time": self.start_time,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class JSONLinesExporter:
+    """Append finished traces to a local file, one JSON span per line"""
+
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]):
+        lines = "".join(json.dumps(span.to_dict()) + "\n" for span in spans)
+        try:
+            with self._lock:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(lines)
+        except OSError:
+            log.warning(f"Unable to write traces to {self.path}", exc_info=True)
+
+
+class Tracer:
+    """
+    Opt-in tracing for requests, enabled with GLOBUS_TRACING. A trace is started
+    with ``trace()``, and each phase within it is timed with ``span()``. Spans are
+    tracked with a context variable, so they nest across awaits and asyncio tasks.
+    Work run in an executor thread is timed by a span around awaiting it instead.
+
+    Traces are only kept locally, and each is appended to GLOBUS_TRACE_PATH when its
+    root span finishes. Trace IDs follow W3C Trace Context, so a trace continues one
+    started by the client with a ``traceparent`` header, and can be passed on to
+    other services with ``get_trace_headers()``.
+    """
+
+    def __init__(self, gconfig: GlobusConfig):
+        self.gconfig = gconfig
+        self._exporter = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.gconfig.get_snapshot().tracing
+
+    def get_exporter(self) -> JSONLinesExporter:
+        path = self.gconfig.get_snapshot().trace_path
+        if self._exporter is None or self._exporter.path != os.path.expanduser(path):
+            self._exporter = JSONLinesExporter(path)
+        return self._exporter
+
+    @staticmethod
+    def parse_traceparent(traceparent: Optional[str]) -> Optional[tuple]:
+        """Fetch the (trace_id, parent_id) from a traceparent header, or None if the
+        header is missing or invalid"""
+        match = TRACEPARENT_PATTERN.match((traceparent or "").strip().lower())
+        if match is None or set(match.group(1)) == {"0"}:
+            return None
+        return match.groups()
+
+    @contextlib.contextmanager
+    def _run_span(self, span: Span) -> Iterator[Span]:
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span.end()
+            current_span.reset(token)
+
+    @contextlib.contextmanager
+    def trace(
+        self, name: str, traceparent: Optional[str] = None, **attributes
+    ) -> Iterator[Optional[Span]]:
+        """Start a new trace, if tracing is enabled and no trace is running. Yields
+        the root span, or None if nothing is traced."""
+        if current_span.get() is not None:
+            with self.span(name, **attributes) as span:
+                yield span
+            return
+        if not self.enabled:
+            yield None
+            return
+        trace_id, parent_id = self.parse_traceparent(traceparent) or (
+            secrets.token_hex(16),
+            None,
+        )
+        root = Span(name, trace_id, parent_id=parent_id, attributes=attributes)
+        try:
+            with self._run_span(root):
+                yield root
+        finally:
+            self.get_exporter().export(root.trace)
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Optional[Span]]:
+        """Time a phase of the current trace. Yields None if nothing is traced."""
+        parent = current_span.get()
+        if parent is None:
+            yield None
+            return
+        span = Span(
+            name,
+            parent.trace_id,
+            parent_id=parent.span_id,
+            trace=parent.trace,
+            attributes=attributes,
+        )
+        with self._run_span(span):
+            yield span
+
+    def get_trace_headers(self) -> Dict[str, str]:
+        """Fetch headers which continue the current trace in another service"""
+        span = current_span.get()
+        if span is None:
+            return {}
+        return {TRACEPARENT_HEADER: span.traceparent}
@@ -0,0 +1,96 @@
+import json
+import logging
+from typing import Iterator, List, NamedTuple, Optional, Union
+
+from globus_jupyterlab.exc import InvalidTransferDocument
+
+log = logging.getLogger(__name__)
+
+
+class TransferItem(NamedTuple):
+    source_path: str
+    destination_path: str
+    recursive: bool
+
+
+class TransferDocument:
+    """
+    A transfer submission from the JupyterLab frontend, in the format described by
+    models.TransferModel. Top level fields are validated when the document is loaded,
+    but items in DATA are only validated as they are consumed with ``iter_items()``.
+    Each raw item is released as soon as it is validated, so very large transfers are
+    never held in memory as both raw JSON data and validated items at the same time.
+    """
+
+    def __init__(
+        self,
+        source_endpoint: str,
+        destination_endpoint: str,
+        label: Optional[str],
+        raw_items: List[dict],
+    ):
+        self.source_endpoint = source_endpoint
+        self.destination_endpoint = destination_endpoint
+        self.label = label
+        self._raw_items = raw_items
+        self._num_items = len(raw_items)
+        self._consumed = False
+
+    @classmethod
+    def from_json(cls, body: Union[str, bytes]) -> "TransferDocument":
+        try:
+            document = json.loads(body)
+        except ValueError as ve:
+            raise InvalidTransferDocument(f"Transfer document is not JSON: {ve}")
+        if not isinstance(document, dict):
+            raise InvalidTransferDocument("Transfer document must be a JSON object")
+        for field in ("source_endpoint", "destination_endpoint"):
+            if not isinstance(document.get(field), str):
+                raise InvalidTransferDocument(f"{field}: must be a string")
+        label = document.get("label")
+        if label is not None and not isinstance(label, str):
+            raise InvalidTransferDocument("label: must be a string")
+        raw_items = document.get("DATA")
+        if not isinstance(raw_items, list):
+            raise InvalidTransferDocument("DATA: must be a list of transfer items")
+        return cls(
+            document["source_endpoint"],
+            document["destination_endpoint"],
+            label,
+            raw_items,
+        )
+
+    def __len__(self) -> int:
+        return self._num_items
+
+    @staticmethod
+    def validate_item(index: int, raw_item: dict) -> TransferItem:
+        if not isinstance(raw_item, dict):
+            raise InvalidTransferDocument(f"DATA[{index}]: must be an object")
+        for field in ("source_path", "destination_path"):
+            if not isinstance(raw_item.get(field), str):
+                raise InvalidTransferDocument(
+                    f"DATA[{index}].{field}: must be a string"
+                )
+        recursive = raw_item.get("recursive")
+        if not isinstance(recursive, bool):
+            if recursive not in (0, 1):
+                raise InvalidTransferDocument(
+                    f"DATA[{index}].recursive: must be a boolean"
+                )
+            recursive = bool(recursive)
+        return TransferItem(
+            raw_item["source_path"], raw_item["destination_path"], recursive
+        )
+
+    def iter_items(self) -> Iterator[TransferItem]:
+        """Validate and yield each item in DATA. Items can only be iterated once."""
+        if self._consumed:
+            raise RuntimeError("Transfer document items have already been consumed")
+        self._consumed = True
+        raw_items = self._raw_items
+        for index in range(self._num_items):
+            item = self.validate_item(index, raw_items[index])
+            raw_items[index] = None
+            yield item
+        self._raw_items = []
@@ -72,6 +72,7 @@ setup_args = dict(
     long_description_content_type="text/x-rst",
     packages=setuptools.find_packages(),
     install_requires=install_requires,
+    extras_require={"brotli": ["brotli"]},
     zip_safe=False,
     include_package_data=True,
     python_requires=">=3.6",
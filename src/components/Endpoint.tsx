@@ -1,11 +1,17 @@
 import { Link, useLocation } from "react-router-dom";
 import React, { useEffect, useState } from "react";
-import { requestAPI } from "../handler";
+import {
+  expandCompactListing,
+  requestAPI,
+  scanLocalPaths,
+  waitForLogin,
+} from "../handler";
 import { useHistory, useParams } from "react-router-dom";
 import { useRecoilValue } from "recoil";
 
 import { ConfigAtom } from "./GlobusObjects";
 import { HubLogin } from "./HubLoginWidget";
+import { formatBytes } from "../utilities";
 
 import * as path from "path";
 var _path = path;
@@ -26,6 +32,7 @@ const Endpoint = (props) => {
   const [loading, setLoading] = useState(false);
   const [selectedEndpointItems, setSelectedEndpointItems] = useState([]);
   const [transfer, setTransfer] = useState(null);
+  const [localScan, setLocalScan] = useState(null);
 
   const itemsRef = React.useRef([]);
   const [lastChecked, setLastChecked] = useState(null);
@@ -74,6 +81,28 @@ const Endpoint = (props) => {
     };
   }, [endpointID, path]);
 
+  // Count what is selected in JupyterLab, so the size is known before transferring
+  useEffect(() => {
+    setLocalScan(null);
+    if (!props.selectedJupyterItems) {
+      return;
+    }
+    const paths = [
+      ...props.selectedJupyterItems.directories,
+      ...props.selectedJupyterItems.files,
+    ].map((item) => _path.posix.resolve(config.collection_base_path, item.path));
+    if (paths.length === 0) {
+      return;
+    }
+    const controller = new AbortController();
+    scanLocalPaths(paths, setLocalScan, controller.signal).catch((error) => {
+      if (!controller.signal.aborted) {
+        console.log(`Unable to scan selected paths: ${error}`);
+      }
+    });
+    return () => controller.abort();
+  }, [props.selectedJupyterItems, config.collection_base_path]);
+
   // @ts-ignore
   const getSelectedFiles = () => {
     const selectedFiles = props.factory.tracker.currentWidget.selectedItems();
@@ -110,11 +139,11 @@ const Endpoint = (props) => {
 
     try {
       var fullPath = query.get("full-path");
-      var url = `operation_ls?endpoint=${endpointID}`;
+      var url = `operation_ls?endpoint=${endpointID}&format=compact`;
       if (fullPath) {
         url = `${url}&path=${fullPath}`;
       }
-      const listItems = await requestAPI<any>(url);
+      const listItems = expandCompactListing(await requestAPI<any>(url));
       setLoading(false);
       setEndpointList(listItems);
     } catch (error) {
@@ -126,20 +155,12 @@ const Endpoint = (props) => {
         does demonstrate the base functionality for picking endpoints
       */
       if ("login_url" in error_response) {
-        // Poll for successful authentication.
+        // Wait for successful authentication.
         var lastConfig = await requestAPI<any>("config");
-        var lastLogin = new Date(lastConfig.last_login).getTime();
-
-        let authInterval = window.setInterval(async () => {
-          const updatedConfig = await requestAPI<any>("config");
-          var newLogin = new Date(updatedConfig.last_login).getTime();
-
-          if (newLogin !== lastLogin) {
-            history.push("/");
-            history.replace(`/endpoints/${endpointID}`);
-            clearInterval(authInterval);
-          }
-        }, 1000);
+        waitForLogin(lastConfig.last_login).then(() => {
+          history.push("/");
+          history.replace(`/endpoints/${endpointID}`);
+        });
 
         if (config.is_hub) {
           setAPIError(null);
@@ -531,6 +552,13 @@ const Endpoint = (props) => {
                 JupyterLab
               </button>
             </div>
+            {localScan && localScan.type !== "start" && (
+              <p className="text-muted small mt-2">
+                Selected in JupyterLab: {localScan.files} files,{" "}
+                {formatBytes(localScan.bytes)}
+                {localScan.type === "progress" && " (counting...)"}
+              </p>
+            )}
           </div>
         </div>
       ) : (
@@ -9,6 +9,62 @@ export function normalizeURL(endPoint = "") {
   return requestUrl;
 }
 
+// Request bodies smaller than this aren't worth compressing
+const COMPRESS_BODY_MIN_LENGTH = 64 * 1024;
+
+/**
+ * Gzip large string request bodies, such as transfer submissions with many items,
+ * if the browser supports CompressionStream. The server extension decompresses
+ * bodies sent with a Content-Encoding header.
+ *
+ * @param init Initial values for the request
+ * @returns The initial values, with the body compressed if it is large enough
+ */
+async function compressRequestBody(init: RequestInit): Promise<RequestInit> {
+  // String bodies sent by this extension are always JSON
+  const CompressionStream = (window as any).CompressionStream;
+  if (
+    typeof init.body !== "string" ||
+    init.body.length < COMPRESS_BODY_MIN_LENGTH ||
+    CompressionStream === undefined
+  ) {
+    return init;
+  }
+  const stream = (new Blob([init.body]) as any)
+    .stream()
+    .pipeThrough(new CompressionStream("gzip"));
+  const headers = new Headers(init.headers);
+  headers.set("Content-Encoding", "gzip");
+  headers.set("Content-Type", "application/json");
+  return {
+    ...init,
+    body: await new Response(stream).arrayBuffer(),
+    headers: headers,
+  };
+}
+
+/**
+ * Expand a listing fetched with format=compact, where DATA holds a list of values
+ * for each field, back into a list of entries.
+ *
+ * @param listing A compact listing from operation_ls
+ * @returns The listing with one object per entry in DATA
+ */
+export function expandCompactListing(listing: any): any {
+  const columns = listing.DATA;
+  const fields = Object.keys(columns);
+  const length = fields.length ? columns[fields[0]].length : 0;
+  const entries = [];
+  for (let index = 0; index < length; index++) {
+    const entry = {};
+    for (const field of fields) {
+      entry[field] = columns[field][index];
+    }
+    entries.push(entry);
+  }
+  return { ...listing, DATA: entries };
+}
+
 /**
  * Call the API extension
  *
@@ -31,6 +87,7 @@ export async function requestAPI<T>(
   let response: Response;
   try {
     console.log("making request to: " + requestUrl);
+    init = await compressRequestBody(init);
     response = await ServerConnection.makeRequest(requestUrl, init, settings);
   } catch (error) {
     throw new ServerConnection.NetworkError(error);
@@ -42,3 +99,102 @@ export async function requestAPI<T>(
 
   return await response.json();
 }
+
+// How long to wait before polling login_status again after a failed request
+const LOGIN_STATUS_RETRY_DELAYS = [1000, 2000, 5000, 10000];
+
+/**
+ * Wait for the user to complete a login
+ *
+ * Each poll sends the last_login seen so far, so a login which completes between
+ * two polls is still reported. Failed requests, such as while the server is
+ * restarting, are retried after a short delay.
+ *
+ * @param since The last_login time already known, from the config endpoint
+ * @returns The login status once last_login has changed
+ */
+export async function waitForLogin(since: string | null = null): Promise<any> {
+  let failures = 0;
+  while (true) {
+    const query = since ? `?since=${encodeURIComponent(since)}` : "";
+    let status: any;
+    try {
+      status = await requestAPI<any>(`login_status${query}`);
+    } catch (error) {
+      const delay =
+        LOGIN_STATUS_RETRY_DELAYS[
+          Math.min(failures, LOGIN_STATUS_RETRY_DELAYS.length - 1)
+        ];
+      failures++;
+      console.log(`login_status failed, retrying in ${delay}ms`, error);
+      await new Promise((resolve) => setTimeout(resolve, delay));
+      continue;
+    }
+    failures = 0;
+    if (status.changed) {
+      return status;
+    }
+    since = status.last_login;
+  }
+}
+
+/**
+ * Count the files, directories and bytes under local paths selected for transfer.
+ * The server streams progress as newline delimited JSON, and each update is passed
+ * to onProgress as it arrives. Aborting the signal cancels the scan on the server.
+ *
+ * @param paths Local paths, as sent for source_path in a transfer
+ * @param onProgress Called with each update from the server
+ * @param signal Aborts the scan
+ * @returns The final "complete" or "cancelled" update, with totals for each path
+ */
+export async function scanLocalPaths(
+  paths: string[],
+  onProgress: (update: any) => void = () => {},
+  signal?: AbortSignal
+): Promise<any> {
+  const settings = ServerConnection.makeSettings();
+  const requestUrl = URLExt.join(
+    settings.baseUrl,
+    "globus-jupyterlab",
+    "local_scan"
+  );
+
+  let response: Response;
+  try {
+    response = await ServerConnection.makeRequest(
+      requestUrl,
+      {
+        method: "POST",
+        body: JSON.stringify({ paths: paths }),
+        signal: signal,
+      },
+      settings
+    );
+  } catch (error) {
+    throw new ServerConnection.NetworkError(error);
+  }
+
+  if (!response.ok) {
+    throw new ServerConnection.ResponseError(response);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffered = "";
+  let update = null;
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) {
+      return update;
+    }
+    buffered += decoder.decode(value, { stream: true });
+    const lines = buffered.split("\n");
+    // The last line is incomplete until a newline arrives
+    buffered = lines.pop();
+    for (const line of lines.filter((line) => line)) {
+      update = JSON.parse(line);
+      onProgress(update);
+    }
+  }
+}
@@ -9,7 +9,7 @@ import { PageConfig } from "@jupyterlab/coreutils";
 import { GlobusIcon } from "./utilities";
 import { GlobusWidget } from "./widget";
 import { HubLoginWidget } from "./components/HubLoginWidget";
-import { normalizeURL, requestAPI } from "./handler";
+import { normalizeURL, requestAPI, waitForLogin } from "./handler";
 
 import "../style/index.css";
 
@@ -105,14 +105,10 @@ async function activateGlobus(
                 .focus();
             }
 
-            // Poll for successful authentication.
-            let authInterval = window.setInterval(async () => {
-              const config = await requestAPI<any>("config");
-              if (config.is_logged_in) {
-                app.shell.add(widget, "main");
-                clearInterval(authInterval);
-              }
-            }, 1000);
+            // Wait for successful authentication.
+            waitForLogin(config.last_login).then(() => {
+              app.shell.add(widget, "main");
+            });
           }
         },
       },